@@ -6,6 +6,7 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from flask_socketio import SocketIO
+from flask_compress import Compress
 import redis
 
 from config.config import config_by_name
@@ -13,8 +14,52 @@ from config.config import config_by_name
 # Initialize extensions
 db = SQLAlchemy()
 migrate = Migrate()
+compress = Compress()
 socketio = SocketIO(cors_allowed_origins="*")
 redis_client = None
+_redis_pools = {}
+
+
+def _get_redis_pool(url):
+    """
+    Get the process-wide Redis connection pool for a URL.
+
+    Reusing the pool across create_app() calls keeps connections warm
+    instead of opening a new pool per app instance.
+    """
+    if url not in _redis_pools:
+        _redis_pools[url] = redis.ConnectionPool.from_url(
+            url,
+            max_connections=50,
+            socket_keepalive=True,
+            decode_responses=True
+        )
+    return _redis_pools[url]
+
+
+def _warmup(app):
+    """
+    Pay one-off startup costs before the first request: import the
+    service modules, compile the Numba kernels and open one Redis and
+    one database connection.
+    """
+    from app.services import technical_analysis, news_analysis, prediction_service  # noqa: F401
+    from app.services import streaming_indicators, ta_kernels
+
+    ta_kernels.warmup()
+    streaming_indicators.warmup()
+
+    try:
+        redis_client.ping()
+    except Exception as e:
+        app.logger.warning(f"Redis warmup failed: {str(e)}")
+
+    try:
+        with app.app_context():
+            with db.engine.connect():
+                pass
+    except Exception as e:
+        app.logger.warning(f"Database warmup failed: {str(e)}")
 
 
 def create_app(config_name='default'):
@@ -29,6 +74,10 @@ def create_app(config_name='default'):
     """
     app = Flask(__name__)
 
+    # Serialize JSON responses with orjson
+    from app.utils.json_provider import OrjsonProvider
+    app.json = OrjsonProvider(app)
+
     # Load configuration
     app.config.from_object(config_by_name[config_name])
 
@@ -36,14 +85,12 @@ def create_app(config_name='default'):
     db.init_app(app)
     migrate.init_app(app, db)
     CORS(app)
-    socketio.init_app(app)
+    compress.init_app(app)
+    socketio.init_app(app, message_queue=app.config.get('SOCKETIO_MESSAGE_QUEUE'))
 
     # Initialize Redis
     global redis_client
-    redis_client = redis.from_url(
-        app.config['REDIS_URL'],
-        decode_responses=True
-    )
+    redis_client = redis.Redis(connection_pool=_get_redis_pool(app.config['REDIS_URL']))
 
     # Register blueprints
     from app.routes import main, portfolio, analysis, websocket
@@ -51,8 +98,23 @@ def create_app(config_name='default'):
     app.register_blueprint(portfolio.bp)
     app.register_blueprint(analysis.bp)
 
-    # Create database tables
-    with app.app_context():
+    if app.config.get('WARMUP', True):
+        _warmup(app)
+
+    # Dedicated worker forwarding Kafka prices to WebSocket rooms
+    if app.config.get('KAFKA_BRIDGE_WORKER', False):
+        with app.app_context():
+            websocket.start_kafka_to_websocket_bridge()
+
+    # Create database tables (production relies on migrations or `flask init-db`)
+    if app.config.get('AUTO_CREATE_TABLES', False):
+        with app.app_context():
+            db.create_all()
+
+    @app.cli.command('init-db')
+    def init_db():
+        """Create all database tables."""
         db.create_all()
+        print('Database tables created')
 
     return app
@@ -3,9 +3,25 @@ Portfolio models for positions and favorite assets.
 Includes AES-256 encryption for sensitive data.
 """
 from datetime import datetime
+from typing import Dict, List, Optional
 from app import db
-from cryptography.fernet import Fernet
-from flask import current_app
+from app.utils.serialization import opt_float, opt_iso
+from app.utils.encryption import get_fernet
+
+
+def _decrypt_notes(encrypted: str, f=None):
+    """
+    Decrypt stored position notes, or None when absent or no key is set.
+
+    Callers decrypting many rows pass the cipher from get_fernet() once.
+    """
+    if not encrypted:
+        return None
+    if f is None:
+        f = get_fernet()
+    if f is None:
+        return None
+    return f.decrypt(encrypted.encode()).decode()
 
 
 class Position(db.Model):
@@ -41,19 +57,23 @@ class Position(db.Model):
     realized_pnl = db.Column(db.Numeric(15, 4))
     unrealized_pnl = db.Column(db.Numeric(15, 4))
 
+    __table_args__ = (
+        # Open-position lookups per user (summary, positions?is_open=true)
+        db.Index('ix_positions_user_open', user_id, postgresql_where=(is_open == db.true())),
+        # Covers summary_totals so the aggregate runs as an index-only scan
+        db.Index(
+            'ix_positions_user_open_pnl', user_id, is_open,
+            postgresql_include=['position_type', 'quantity', 'entry_price', 'current_price']
+        ),
+    )
+
     def __repr__(self):
         return f'<Position {self.symbol} - {self.position_type}>'
 
     @property
     def notes(self):
         """Decrypt notes."""
-        if not self._encrypted_notes:
-            return None
-        key = current_app.config['DB_ENCRYPTION_KEY']
-        if not key:
-            return None
-        f = Fernet(key.encode())
-        return f.decrypt(self._encrypted_notes.encode()).decode()
+        return _decrypt_notes(self._encrypted_notes)
 
     @notes.setter
     def notes(self, value):
@@ -61,11 +81,10 @@ class Position(db.Model):
         if not value:
             self._encrypted_notes = None
             return
-        key = current_app.config['DB_ENCRYPTION_KEY']
-        if not key:
+        f = get_fernet()
+        if f is None:
             self._encrypted_notes = value
             return
-        f = Fernet(key.encode())
         self._encrypted_notes = f.encrypt(value.encode()).decode()
 
     def calculate_pnl(self):
@@ -85,6 +104,91 @@ class Position(db.Model):
 
         return float(pnl)
 
+    @classmethod
+    def summary_totals(cls, session, user_id: int) -> Dict[str, float]:
+        """
+        Aggregate a user's position counts and P&L in a single SQL query.
+
+        P&L is computed from current and entry prices, as in calculate_pnl;
+        positions without a current price contribute nothing.
+
+        Args:
+            session: SQLAlchemy session
+            user_id: Owner of the positions
+
+        Returns:
+            Dictionary with total, open and closed counts plus
+            realized and unrealized P&L totals
+        """
+        pnl = db.case(
+            (cls.position_type == 'BUY', (cls.current_price - cls.entry_price) * cls.quantity),
+            else_=(cls.entry_price - cls.current_price) * cls.quantity
+        )
+        open_ = cls.is_open == db.true()
+
+        total, open_count, unrealized, realized = session.execute(
+            db.select(
+                db.func.count(cls.id),
+                db.func.sum(db.case((open_, 1), else_=0)),
+                db.func.sum(db.case((open_, pnl), else_=None)),
+                db.func.sum(db.case((open_, None), else_=pnl))
+            ).where(cls.user_id == user_id)
+        ).one()
+
+        open_count = int(open_count or 0)
+        return {
+            'total_positions': total,
+            'open_positions': open_count,
+            'closed_positions': total - open_count,
+            'total_realized_pnl': float(realized or 0),
+            'total_unrealized_pnl': float(unrealized or 0)
+        }
+
+    @classmethod
+    def list_dicts(cls, session, user_id: int, is_open: Optional[bool] = None) -> List[Dict]:
+        """
+        Fetch a user's positions as serialized dictionaries.
+
+        Reads plain rows with a Core select and builds the same shape as
+        to_dict, so no Position objects are hydrated.
+
+        Args:
+            session: SQLAlchemy session
+            user_id: Owner of the positions
+            is_open: Only include open (True) or closed (False) positions
+
+        Returns:
+            List of position dictionaries, newest first
+        """
+        stmt = db.select(
+            cls.id, cls.symbol, cls.asset_name, cls.position_type, cls.quantity,
+            cls.entry_price, cls.current_price, cls.unrealized_pnl, cls.realized_pnl,
+            cls.opened_at, cls.closed_at, cls.is_open, cls._encrypted_notes
+        ).where(cls.user_id == user_id)
+        if is_open is not None:
+            stmt = stmt.where(cls.is_open == is_open)
+        stmt = stmt.order_by(cls.opened_at.desc())
+        f = get_fernet()
+
+        return [
+            {
+                'id': row.id,
+                'symbol': row.symbol,
+                'asset_name': row.asset_name,
+                'position_type': row.position_type,
+                'quantity': float(row.quantity),
+                'entry_price': float(row.entry_price),
+                'current_price': opt_float(row.current_price),
+                'unrealized_pnl': opt_float(row.unrealized_pnl),
+                'realized_pnl': opt_float(row.realized_pnl),
+                'opened_at': row.opened_at.isoformat(),
+                'closed_at': opt_iso(row.closed_at),
+                'is_open': row.is_open,
+                'notes': _decrypt_notes(row._encrypted_notes, f)
+            }
+            for row in session.execute(stmt)
+        ]
+
     def to_dict(self):
         """Convert position to dictionary."""
         return {
@@ -94,11 +198,11 @@ class Position(db.Model):
             'position_type': self.position_type,
             'quantity': float(self.quantity),
             'entry_price': float(self.entry_price),
-            'current_price': float(self.current_price) if self.current_price else None,
-            'unrealized_pnl': float(self.unrealized_pnl) if self.unrealized_pnl else None,
-            'realized_pnl': float(self.realized_pnl) if self.realized_pnl else None,
+            'current_price': opt_float(self.current_price),
+            'unrealized_pnl': opt_float(self.unrealized_pnl),
+            'realized_pnl': opt_float(self.realized_pnl),
             'opened_at': self.opened_at.isoformat(),
-            'closed_at': self.closed_at.isoformat() if self.closed_at else None,
+            'closed_at': opt_iso(self.closed_at),
             'is_open': self.is_open,
             'notes': self.notes
         }
@@ -135,6 +239,34 @@ class FavoriteAsset(db.Model):
     def __repr__(self):
         return f'<FavoriteAsset {self.symbol}>'
 
+    @classmethod
+    def bulk_add(cls, session, rows: List[Dict]) -> int:
+        """
+        Insert many favorites in one statement, skipping existing ones.
+
+        Duplicates are resolved by the (user_id, symbol) unique constraint
+        with ON CONFLICT DO NOTHING instead of a SELECT per row.
+
+        Args:
+            session: SQLAlchemy session
+            rows: Column values for each favorite
+
+        Returns:
+            Number of favorites inserted
+        """
+        if not rows:
+            return 0
+
+        if session.get_bind().dialect.name == 'postgresql':
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        stmt = insert(cls).values(rows).on_conflict_do_nothing(
+            index_elements=['user_id', 'symbol']
+        )
+        return session.execute(stmt).rowcount
+
     def to_dict(self):
         """Convert favorite asset to dictionary."""
         return {
@@ -146,6 +278,6 @@ class FavoriteAsset(db.Model):
             'risk_tolerance': self.risk_tolerance,
             'investment_horizon': self.investment_horizon,
             'added_at': self.added_at.isoformat(),
-            'last_viewed_at': self.last_viewed_at.isoformat() if self.last_viewed_at else None,
+            'last_viewed_at': opt_iso(self.last_viewed_at),
             'view_count': self.view_count
         }
@@ -4,6 +4,7 @@ Stores all predictions for backtesting and model improvement.
 """
 from datetime import datetime
 from app import db
+from app.utils.serialization import opt_float, opt_iso
 
 
 class Prediction(db.Model):
@@ -20,7 +21,7 @@ class Prediction(db.Model):
 
     # Prediction details
     prediction_type = db.Column(db.String(20), nullable=False, index=True)  # 'BUY', 'SELL', 'HOLD'
-    confidence_score = db.Column(db.Numeric(5, 4), nullable=False)  # 0.0000 to 1.0000
+    confidence_score = db.Column(db.Float, nullable=False)  # 0.0 to 1.0
     target_price = db.Column(db.Numeric(15, 4))
     stop_loss = db.Column(db.Numeric(15, 4))
     time_horizon = db.Column(db.String(20))  # short, medium, long
@@ -32,7 +33,7 @@ class Prediction(db.Model):
     # Market context at prediction time
     price_at_prediction = db.Column(db.Numeric(15, 4), nullable=False)
     market_condition = db.Column(db.String(50))  # bullish, bearish, sideways
-    volatility_index = db.Column(db.Numeric(10, 4))
+    volatility_index = db.Column(db.Float)
 
     # Timestamps
     created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
@@ -42,14 +43,26 @@ class Prediction(db.Model):
     actual_outcome = db.Column(db.String(20))  # 'correct', 'incorrect', 'pending'
     outcome_verified_at = db.Column(db.DateTime)
     price_at_verification = db.Column(db.Numeric(15, 4))
-    accuracy_score = db.Column(db.Numeric(5, 4))  # How accurate was the prediction
+    accuracy_score = db.Column(db.Float)  # How accurate was the prediction
 
     # User interaction
     user_executed = db.Column(db.Boolean, default=False)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), index=True)
 
     # Relationships
-    factors = db.relationship('PredictionFactor', backref='prediction', lazy='dynamic', cascade='all, delete-orphan')
+    factors = db.relationship('PredictionFactor', backref='prediction', lazy='select', cascade='all, delete-orphan')
+
+    __table_args__ = (
+        # History lookups filtered by user/symbol, newest first
+        db.Index('ix_predictions_user_sym_created', user_id, symbol, created_at.desc(), id.desc()),
+        # Verification scans only unverified pending predictions past expiry
+        db.Index(
+            'ix_predictions_pending', expires_at,
+            postgresql_where=db.and_(actual_outcome == 'pending', outcome_verified_at.is_(None))
+        ),
+        # Accuracy stats per symbol count resolved outcomes from the index alone
+        db.Index('ix_predictions_symbol_outcome', symbol, actual_outcome),
+    )
 
     def __repr__(self):
         return f'<Prediction {self.symbol} - {self.prediction_type} ({self.confidence_score})>'
@@ -61,18 +74,18 @@ class Prediction(db.Model):
             'symbol': self.symbol,
             'asset_name': self.asset_name,
             'prediction_type': self.prediction_type,
-            'confidence_score': float(self.confidence_score),
-            'target_price': float(self.target_price) if self.target_price else None,
-            'stop_loss': float(self.stop_loss) if self.stop_loss else None,
+            'confidence_score': self.confidence_score,
+            'target_price': opt_float(self.target_price),
+            'stop_loss': opt_float(self.stop_loss),
             'time_horizon': self.time_horizon,
             'analysis_type': self.analysis_type,
             'model_version': self.model_version,
             'price_at_prediction': float(self.price_at_prediction),
             'market_condition': self.market_condition,
             'created_at': self.created_at.isoformat(),
-            'expires_at': self.expires_at.isoformat() if self.expires_at else None,
+            'expires_at': opt_iso(self.expires_at),
             'actual_outcome': self.actual_outcome,
-            'accuracy_score': float(self.accuracy_score) if self.accuracy_score else None,
+            'accuracy_score': self.accuracy_score,
             'user_executed': self.user_executed
         }
 
@@ -97,7 +110,7 @@ class PredictionFactor(db.Model):
     factor_type = db.Column(db.String(50), nullable=False)  # 'pattern', 'indicator', 'news', 'fundamental'
     factor_name = db.Column(db.String(100), nullable=False)  # e.g., 'RSI', 'Head and Shoulders', 'P/E Ratio'
     factor_value = db.Column(db.String(200))  # The actual value that triggered the factor
-    weight = db.Column(db.Numeric(5, 4))  # How much this factor influenced the prediction (0-1)
+    weight = db.Column(db.Float)  # How much this factor influenced the prediction (0-1)
     description = db.Column(db.Text)  # Human-readable explanation
 
     # Technical indicator specifics
@@ -116,8 +129,8 @@ class PredictionFactor(db.Model):
             'factor_type': self.factor_type,
             'factor_name': self.factor_name,
             'factor_value': self.factor_value,
-            'weight': float(self.weight) if self.weight else None,
+            'weight': self.weight,
             'description': self.description,
             'indicator_period': self.indicator_period,
-            'indicator_threshold': float(self.indicator_threshold) if self.indicator_threshold else None
+            'indicator_threshold': opt_float(self.indicator_threshold)
         }
@@ -1,44 +1,53 @@
 """
 Analysis API endpoints for technical/fundamental analysis and predictions.
 """
-from flask import Blueprint, request, jsonify
-import pandas as pd
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 from datetime import datetime
+from sqlalchemy.orm import joinedload
 
 from app import db
+from app.models.prediction import Prediction
+from app.utils.json_provider import dumps_bytes
+from app.utils.price_parse import price_payload_to_arrays, validate_price_payload
 from app.services.technical_analysis import TechnicalAnalysisService
 from app.services.news_analysis import NewsAnalysisService
 from app.services.prediction_service import PredictionService
 
 bp = Blueprint('analysis', __name__, url_prefix='/api/analysis')
 
+ANALYSIS_TYPES = frozenset(('technical', 'fundamental', 'hybrid'))
+
 
 @bp.route('/technical/<symbol>', methods=['POST'])
 def analyze_technical(symbol):
     """
     Perform technical analysis on an asset.
-    Body: {price_data: [{timestamp, open, high, low, close, volume}, ...]}
+    Body: {price_data: {timestamp: [...], open: [...], high: [...], low: [...], close: [...], volume: [...]}}
+    (a list of {timestamp, open, high, low, close, volume} rows is still accepted but deprecated)
     """
-    data = request.get_json()
+    symbol = symbol.upper()
+    data = request.get_json(silent=True) or {}
     price_data = data.get('price_data')
 
     if not price_data:
         return jsonify({'error': 'price_data required'}), 400
 
-    try:
-        # Convert to DataFrame
-        df = pd.DataFrame(price_data)
-        required_cols = ['open', 'high', 'low', 'close', 'volume']
+    ok, missing = validate_price_payload(price_data)
+    if not ok:
+        return jsonify({'error': f'Missing required columns: {missing}', 'missing': missing}), 400
 
-        if not all(col in df.columns for col in required_cols):
-            return jsonify({'error': f'Missing required columns: {required_cols}'}), 400
+    try:
+        prices = price_payload_to_arrays(price_data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
+    try:
         # Perform analysis
         service = TechnicalAnalysisService()
-        result = service.analyze_asset(symbol.upper(), df)
+        result = service.analyze_asset(symbol, prices)
 
         return jsonify({
-            'symbol': symbol.upper(),
+            'symbol': symbol,
             'analysis': result,
             'timestamp': datetime.utcnow().isoformat()
         })
@@ -53,14 +62,15 @@ def analyze_news(symbol):
     Analyze news sentiment for an asset.
     Query params: limit (default 10)
     """
+    symbol = symbol.upper()
     limit = request.args.get('limit', 10, type=int)
 
     try:
         service = NewsAnalysisService()
-        result = service.analyze_news_for_asset(symbol.upper(), limit)
+        result = service.analyze_news_for_asset(symbol, limit)
 
         return jsonify({
-            'symbol': symbol.upper(),
+            'symbol': symbol,
             'analysis': result,
             'timestamp': datetime.utcnow().isoformat()
         })
@@ -74,12 +84,14 @@ def generate_prediction(symbol):
     """
     Generate AI prediction for an asset.
     Body: {
-        price_data: [{timestamp, open, high, low, close, volume}, ...],
+        price_data: {timestamp: [...], open: [...], high: [...], low: [...], close: [...], volume: [...]}
+            (or the deprecated list of OHLCV rows),
         analysis_type: 'technical' | 'fundamental' | 'hybrid',
         user_id: (optional)
     }
     """
-    data = request.get_json()
+    symbol = symbol.upper()
+    data = request.get_json(silent=True) or {}
     price_data = data.get('price_data')
     analysis_type = data.get('analysis_type', 'hybrid')
     user_id = data.get('user_id')
@@ -87,18 +99,24 @@ def generate_prediction(symbol):
     if not price_data:
         return jsonify({'error': 'price_data required'}), 400
 
-    if analysis_type not in ['technical', 'fundamental', 'hybrid']:
+    if analysis_type not in ANALYSIS_TYPES:
         return jsonify({'error': 'Invalid analysis_type'}), 400
 
+    ok, missing = validate_price_payload(price_data)
+    if not ok:
+        return jsonify({'error': f'Missing required columns: {missing}', 'missing': missing}), 400
+
     try:
-        # Convert to DataFrame
-        df = pd.DataFrame(price_data)
+        prices = price_payload_to_arrays(price_data)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
+    try:
         # Generate prediction
         service = PredictionService()
         prediction = service.generate_prediction(
-            symbol.upper(),
-            df,
+            symbol,
+            prices,
             analysis_type,
             user_id
         )
@@ -116,35 +134,75 @@ def generate_prediction(symbol):
 def get_predictions():
     """
     Get prediction history.
-    Query params: symbol (optional), user_id (optional), limit (default 50)
+    Query params: symbol (optional), user_id (optional), limit (default 50),
+        before and before_id (optional keyset cursor; pass back next_before
+        and next_before_id from the previous page)
     """
     symbol = request.args.get('symbol')
     user_id = request.args.get('user_id', type=int)
     limit = request.args.get('limit', 50, type=int)
+    before = request.args.get('before', type=datetime.fromisoformat)
+    before_id = request.args.get('before_id', type=int)
 
     try:
         service = PredictionService()
         predictions = service.get_prediction_history(
             symbol=symbol.upper() if symbol else None,
             user_id=user_id,
-            limit=limit
+            limit=limit,
+            before=before,
+            before_id=before_id
         )
 
         return jsonify({
             'predictions': [pred.to_dict() for pred in predictions],
-            'count': len(predictions)
+            'count': len(predictions),
+            # Pass back as `before` and `before_id` to fetch the next page
+            'next_before': predictions[-1].created_at.isoformat() if predictions else None,
+            'next_before_id': predictions[-1].id if predictions else None
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@bp.route('/predictions.ndjson', methods=['GET'])
+def stream_predictions():
+    """
+    Stream prediction history as newline-delimited JSON (one prediction per line).
+    Query params: symbol (optional), user_id (optional), limit (default 50),
+        before and before_id (optional keyset cursor; pass back next_before
+        and next_before_id from the previous page)
+    """
+    symbol = request.args.get('symbol')
+    user_id = request.args.get('user_id', type=int)
+    limit = request.args.get('limit', 50, type=int)
+    before = request.args.get('before', type=datetime.fromisoformat)
+    before_id = request.args.get('before_id', type=int)
+
+    service = PredictionService()
+    predictions = service.iter_prediction_history(
+        symbol=symbol.upper() if symbol else None,
+        user_id=user_id,
+        limit=limit,
+        before=before,
+        before_id=before_id
+    )
+
+    def generate():
+        for pred in predictions:
+            yield dumps_bytes(pred.to_dict(include_factors=False)) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+
 @bp.route('/predictions/<int:prediction_id>', methods=['GET'])
 def get_prediction(prediction_id):
     """Get specific prediction with full details."""
-    from app.models.prediction import Prediction
-
-    prediction = Prediction.query.get_or_404(prediction_id)
+    # Factors are always serialized here, so fetch them in the same query
+    prediction = Prediction.query.options(
+        joinedload(Prediction.factors)
+    ).get_or_404(prediction_id)
 
     return jsonify({
         'prediction': prediction.to_dict(include_factors=True)
@@ -157,10 +215,8 @@ def mark_prediction_executed(prediction_id):
     Mark prediction as executed by user.
     Body: {user_id}
     """
-    from app.models.prediction import Prediction
-
     prediction = Prediction.query.get_or_404(prediction_id)
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
 
     user_id = data.get('user_id')
     if not user_id:
@@ -183,16 +239,17 @@ def verify_predictions():
     Trigger prediction verification for backtesting.
     Body: {symbols: ['AAPL', 'GOOGL']} (optional)
     """
-    data = request.get_json() or {}
+    data = request.get_json(silent=True) or {}
     symbols = data.get('symbols')
 
     try:
         service = PredictionService()
-        service.verify_predictions(symbols)
+        verified = service.verify_predictions(symbols)
 
         return jsonify({
             'message': 'Predictions verified',
-            'symbols': symbols
+            'symbols': symbols,
+            'verified': verified
         })
 
     except Exception as e:
@@ -226,31 +283,53 @@ def scan_assets():
     Body: {
         symbols: ['AAPL', 'GOOGL', ...],
         price_data: {
-            'AAPL': [{timestamp, open, high, low, close, volume}, ...],
-            'GOOGL': [...]
+            'AAPL': {timestamp: [...], open: [...], high: [...], low: [...], close: [...], volume: [...]},
+            'GOOGL': {...}
         }
     }
+    (per-symbol lists of OHLCV rows are still accepted but deprecated)
     """
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     symbols = data.get('symbols', [])
     price_data_dict = data.get('price_data', {})
 
     if not symbols or not price_data_dict:
         return jsonify({'error': 'symbols and price_data required'}), 400
 
+    # Only parse payloads for symbols that will actually be scanned
+    scan_symbols = symbols[:current_app.config['MAX_ASSETS_SCAN']]
+
     try:
-        # Convert price data to DataFrames
-        df_dict = {}
-        for symbol, prices in price_data_dict.items():
-            df_dict[symbol] = pd.DataFrame(prices)
+        arrays_dict = {
+            symbol: price_payload_to_arrays(price_data_dict[symbol])
+            for symbol in scan_symbols
+            if symbol in price_data_dict
+        }
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
+    try:
         # Scan assets
         service = TechnicalAnalysisService()
-        opportunities = service.scan_multiple_assets(symbols, df_dict)
+        analyses = service.analyze_many(scan_symbols, arrays_dict)
+        opportunities = service.opportunities_from(analyses)
+
+        # Record a technical prediction per flagged asset for backtesting,
+        # reusing the scan's analysis instead of analyzing again
+        prediction_service = PredictionService()
+        flagged = dict.fromkeys(opp['symbol'] for opp in opportunities)
+        entries = [
+            prediction_service.build_prediction(
+                symbol, arrays_dict[symbol], 'technical', tech_analysis=analyses[symbol]
+            )
+            for symbol in flagged
+        ]
+        recorded = prediction_service.bulk_persist(entries)
 
         return jsonify({
             'opportunities': opportunities,
             'count': len(opportunities),
+            'predictions_recorded': recorded,
             'timestamp': datetime.utcnow().isoformat()
         })
 
@@ -264,7 +343,7 @@ def screen_fundamentals():
     Screen assets by fundamental criteria.
     Body: {symbols: ['AAPL', 'GOOGL', ...]}
     """
-    data = request.get_json()
+    data = request.get_json(silent=True) or {}
     symbols = data.get('symbols', [])
 
     if not symbols:
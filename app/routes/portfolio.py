@@ -3,9 +3,13 @@ Portfolio management API endpoints.
 """
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+from sqlalchemy.orm import load_only
 
 from app import db
 from app.models.portfolio import Position, FavoriteAsset
+from app.utils.cache import (
+    cache_get, cache_set, get_portfolio_cache_key, invalidate_portfolio_cache
+)
 
 bp = Blueprint('portfolio', __name__, url_prefix='/api/portfolio')
 
@@ -20,18 +24,29 @@ def get_positions():
     if not user_id:
         return jsonify({'error': 'user_id required'}), 400
 
-    query = Position.query.filter_by(user_id=user_id)
+    open_filter = None
+    variant = 'all'
 
     is_open = request.args.get('is_open')
     if is_open is not None:
-        query = query.filter_by(is_open=is_open.lower() == 'true')
+        open_filter = is_open.lower() == 'true'
+        variant = 'open' if open_filter else 'closed'
 
-    positions = query.order_by(Position.opened_at.desc()).all()
+    cache_key = get_portfolio_cache_key('positions', user_id, variant)
+    cached = cache_get(cache_key)
+    if cached:
+        return jsonify(cached)
 
-    return jsonify({
-        'positions': [pos.to_dict() for pos in positions],
+    # Plain rows serialized directly, without hydrating Position objects
+    positions = Position.list_dicts(db.session, user_id, open_filter)
+
+    result = {
+        'positions': positions,
         'count': len(positions)
-    })
+    }
+    cache_set(cache_key, result, ttl=10)
+
+    return jsonify(result)
 
 
 @bp.route('/positions', methods=['POST'])
@@ -60,12 +75,61 @@ def create_position():
         notes=data.get('notes')
     )
 
+    # Serialize before commit so the response does not reload the row
+    # in a new transaction that stays open until request teardown
     db.session.add(position)
+    db.session.flush()
+    result = position.to_dict()
     db.session.commit()
+    invalidate_portfolio_cache(data['user_id'])
 
     return jsonify({
         'message': 'Position created',
-        'position': position.to_dict()
+        'position': result
+    }), 201
+
+
+@bp.route('/positions/bulk', methods=['POST'])
+def create_positions_bulk():
+    """
+    Create many positions in one transaction.
+    Body: {user_id, positions: [{symbol, asset_name, position_type, quantity, entry_price, notes}]}
+    """
+    data = request.get_json()
+
+    user_id = data.get('user_id')
+    items = data.get('positions')
+    if not user_id or not isinstance(items, list):
+        return jsonify({'error': 'user_id and positions list required'}), 400
+
+    required = ['symbol', 'position_type', 'quantity', 'entry_price']
+    for index, item in enumerate(items):
+        if not all(field in item for field in required):
+            return jsonify({'error': f'Missing required fields in position {index}'}), 400
+        if item['position_type'] not in ['BUY', 'SELL']:
+            return jsonify({'error': f'position_type must be BUY or SELL in position {index}'}), 400
+
+    positions = [
+        Position(
+            user_id=user_id,
+            symbol=item['symbol'].upper(),
+            asset_name=item.get('asset_name'),
+            position_type=item['position_type'],
+            quantity=item['quantity'],
+            entry_price=item['entry_price'],
+            current_price=item['entry_price'],  # Initialize with entry price
+            notes=item.get('notes')
+        )
+        for item in items
+    ]
+
+    db.session.add_all(positions)
+    db.session.commit()
+    invalidate_portfolio_cache(user_id)
+
+    return jsonify({
+        'message': 'Positions created',
+        'count': len(positions)
     }), 201
 
 
@@ -91,11 +155,15 @@ def update_position(position_id):
     if 'notes' in data:
         position.notes = data['notes']
 
+    db.session.flush()
+    result = position.to_dict()
+    user_id = position.user_id
     db.session.commit()
+    invalidate_portfolio_cache(user_id)
 
     return jsonify({
         'message': 'Position updated',
-        'position': position.to_dict()
+        'position': result
     })
 
 
@@ -104,8 +172,10 @@ def delete_position(position_id):
     """Delete a position."""
     position = Position.query.get_or_404(position_id)
 
+    user_id = position.user_id
     db.session.delete(position)
     db.session.commit()
+    invalidate_portfolio_cache(user_id)
 
     return jsonify({'message': 'Position deleted'}), 200
 
@@ -120,14 +190,22 @@ def get_favorites():
     if not user_id:
         return jsonify({'error': 'user_id required'}), 400
 
+    cache_key = get_portfolio_cache_key('favorites', user_id)
+    cached = cache_get(cache_key)
+    if cached:
+        return jsonify(cached)
+
     favorites = FavoriteAsset.query.filter_by(user_id=user_id).order_by(
         FavoriteAsset.added_at.desc()
     ).all()
 
-    return jsonify({
+    result = {
         'favorites': [fav.to_dict() for fav in favorites],
         'count': len(favorites)
-    })
+    }
+    cache_set(cache_key, result, ttl=60)
+
+    return jsonify(result)
 
 
 @bp.route('/favorites', methods=['POST'])
@@ -162,11 +240,54 @@ def add_favorite():
     )
 
     db.session.add(favorite)
+    db.session.flush()
+    result = favorite.to_dict()
     db.session.commit()
+    invalidate_portfolio_cache(data['user_id'])
 
     return jsonify({
         'message': 'Favorite added',
-        'favorite': favorite.to_dict()
+        'favorite': result
+    }), 201
+
+
+@bp.route('/favorites/bulk', methods=['POST'])
+def add_favorites_bulk():
+    """
+    Add many assets to favorites, skipping ones already present.
+    Body: {user_id, favorites: [{symbol, asset_name, asset_type, interest_reason, risk_tolerance, investment_horizon}]}
+    """
+    data = request.get_json()
+
+    user_id = data.get('user_id')
+    items = data.get('favorites')
+    if not user_id or not isinstance(items, list):
+        return jsonify({'error': 'user_id and favorites list required'}), 400
+
+    if not all('symbol' in item for item in items):
+        return jsonify({'error': 'Missing required fields'}), 400
+
+    rows = [
+        {
+            'user_id': user_id,
+            'symbol': item['symbol'].upper(),
+            'asset_name': item.get('asset_name'),
+            'asset_type': item.get('asset_type'),
+            'interest_reason': item.get('interest_reason'),
+            'risk_tolerance': item.get('risk_tolerance'),
+            'investment_horizon': item.get('investment_horizon')
+        }
+        for item in items
+    ]
+
+    added = FavoriteAsset.bulk_add(db.session, rows)
+    db.session.commit()
+    invalidate_portfolio_cache(user_id)
+
+    return jsonify({
+        'message': 'Favorites added',
+        'added': added,
+        'skipped': len(rows) - added
     }), 201
 
 
@@ -192,11 +313,15 @@ def update_favorite(favorite_id):
     if 'investment_horizon' in data:
         favorite.investment_horizon = data['investment_horizon']
 
+    db.session.flush()
+    result = favorite.to_dict()
+    user_id = favorite.user_id
     db.session.commit()
+    invalidate_portfolio_cache(user_id)
 
     return jsonify({
         'message': 'Favorite updated',
-        'favorite': favorite.to_dict()
+        'favorite': result
     })
 
 
@@ -205,8 +330,10 @@ def delete_favorite(favorite_id):
     """Remove asset from favorites."""
     favorite = FavoriteAsset.query.get_or_404(favorite_id)
 
+    user_id = favorite.user_id
     db.session.delete(favorite)
     db.session.commit()
+    invalidate_portfolio_cache(user_id)
 
     return jsonify({'message': 'Favorite removed'}), 200
 
@@ -221,28 +348,39 @@ def get_portfolio_summary():
     if not user_id:
         return jsonify({'error': 'user_id required'}), 400
 
-    positions = Position.query.filter_by(user_id=user_id).all()
+    cache_key = get_portfolio_cache_key('summary', user_id)
+    cached = cache_get(cache_key)
+    if cached:
+        return jsonify(cached)
 
-    total_realized = sum(
-        float(pos.realized_pnl or 0) for pos in positions if not pos.is_open
-    )
-    total_unrealized = sum(
-        float(pos.unrealized_pnl or 0) for pos in positions if pos.is_open
+    # Counts and P&L totals are aggregated in SQL; only displayed rows are loaded
+    totals = Position.summary_totals(db.session, user_id)
+
+    columns = load_only(
+        Position.id, Position.symbol, Position.asset_name, Position.position_type,
+        Position.quantity, Position.entry_price, Position.current_price,
+        Position.unrealized_pnl, Position.realized_pnl, Position.opened_at,
+        Position.closed_at, Position.is_open, Position._encrypted_notes
     )
+    open_positions = Position.query.options(columns).filter_by(
+        user_id=user_id, is_open=True
+    ).order_by(Position.opened_at.desc()).limit(10).all()
+    recent_closed = Position.query.options(columns).filter_by(
+        user_id=user_id, is_open=False
+    ).order_by(Position.closed_at.desc()).limit(10).all()
 
-    open_positions = [pos for pos in positions if pos.is_open]
-    closed_positions = [pos for pos in positions if not pos.is_open]
+    total_realized = totals['total_realized_pnl']
+    total_unrealized = totals['total_unrealized_pnl']
 
-    return jsonify({
+    result = {
         'user_id': user_id,
         'summary': {
-            'total_positions': len(positions),
-            'open_positions': len(open_positions),
-            'closed_positions': len(closed_positions),
-            'total_realized_pnl': total_realized,
-            'total_unrealized_pnl': total_unrealized,
+            **totals,
             'total_pnl': total_realized + total_unrealized
         },
-        'open_positions': [pos.to_dict() for pos in open_positions[:10]],
-        'recent_closed': [pos.to_dict() for pos in closed_positions[:10]]
-    })
+        'open_positions': [pos.to_dict() for pos in open_positions],
+        'recent_closed': [pos.to_dict() for pos in recent_closed]
+    }
+    cache_set(cache_key, result, ttl=15)
+
+    return jsonify(result)
@@ -2,14 +2,24 @@
 WebSocket routes for real-time price updates.
 Integrates Kafka stream with WebSocket for browser distribution.
 """
+from collections import defaultdict
+from typing import List
 from flask_socketio import emit, join_room, leave_room
 from flask import request
 from app import socketio
 from app.services.kafka_service import get_kafka_service
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Price updates are coalesced per symbol and flushed on a short interval
+FLUSH_INTERVAL_SECONDS = 0.02
+
+_pending = defaultdict(list)
+_pending_lock = threading.Lock()
+_flush_task = None
+
 
 @socketio.on('connect')
 def handle_connect():
@@ -81,25 +91,50 @@ def handle_subscribe_portfolio(data):
     emit('portfolio_subscribed', {'symbols': symbols, 'status': 'success'})
 
 
-def broadcast_price_update(price_data: dict):
+def broadcast_price_update(price_batch: List[dict]):
     """
-    Broadcast price update to subscribed clients.
-    Called by Kafka consumer callback.
+    Queue a batch of price updates for subscribed clients.
+    Called by Kafka consumer callback; the flush loop emits queued
+    updates as one 'price_updates' batch per symbol room.
 
     Args:
-        price_data: Price data from Kafka
+        price_batch: Price data messages from one Kafka poll
     """
-    symbol = price_data.get('symbol')
-    if not symbol:
-        return
+    grouped = defaultdict(list)
+    for price_data in price_batch:
+        symbol = price_data.get('symbol')
+        if symbol:
+            grouped[symbol].append(price_data)
 
-    # Emit to all clients in this symbol's room
-    socketio.emit(
-        'price_update',
-        price_data,
-        room=f"symbol_{symbol}",
-        namespace='/'
-    )
+    with _pending_lock:
+        for symbol, updates in grouped.items():
+            _pending[symbol].extend(updates)
+
+
+def _flush_pending():
+    """Emit all queued price updates, one batch per symbol room."""
+    global _pending
+
+    with _pending_lock:
+        batches, _pending = _pending, defaultdict(list)
+
+    for symbol, batch in batches.items():
+        socketio.emit(
+            'price_updates',
+            batch,
+            room=f"symbol_{symbol}",
+            namespace='/'
+        )
+
+
+def _flush_loop():
+    """Background task flushing coalesced price updates."""
+    while True:
+        socketio.sleep(FLUSH_INTERVAL_SECONDS)
+        try:
+            _flush_pending()
+        except Exception as e:
+            logger.error(f"Price update flush error: {str(e)}")
 
 
 def start_kafka_to_websocket_bridge():
@@ -107,6 +142,11 @@ def start_kafka_to_websocket_bridge():
     Start bridge that forwards Kafka messages to WebSocket clients.
     Should be called on application startup.
     """
+    global _flush_task
+
+    if _flush_task is None:
+        _flush_task = socketio.start_background_task(_flush_loop)
+
     kafka_service = get_kafka_service()
 
     # Subscribe to all price updates and forward to WebSocket
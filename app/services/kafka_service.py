@@ -2,13 +2,21 @@
 Kafka Service for real-time data streaming.
 Handles high-throughput, low-latency price data distribution.
 """
-import json
+import logging
+import queue
 import threading
-from typing import Callable, Dict, Optional
-from kafka import KafkaProducer, KafkaConsumer
-from kafka.errors import KafkaError
+from typing import Any, Callable, Dict, List, Optional
+from kafka import KafkaConsumer, KafkaProducer
+import orjson
 from flask import current_app
 
+from app import socketio
+from app.utils.json_provider import dumps_bytes
+
+# Publishes are queued and sent by one producer thread in batches
+SEND_QUEUE_SIZE = 10000
+SEND_BATCH_SIZE = 500
+
 
 class KafkaService:
     """
@@ -19,7 +27,17 @@ class KafkaService:
     def __init__(self):
         self.producer: Optional[KafkaProducer] = None
         self.consumers: Dict[str, KafkaConsumer] = {}
-        self.consumer_threads: Dict[str, threading.Thread] = {}
+        self.consumer_tasks: Dict[str, Any] = {}
+        self._stop = threading.Event()
+        self._send_q: queue.Queue = queue.Queue(maxsize=SEND_QUEUE_SIZE)
+        self._send_thread: Optional[threading.Thread] = None
+
+        # Resolved once; publishes are hot and should not go through the
+        # app-context proxy on every call
+        self._log = current_app.logger
+        self._price_topic = current_app.config['KAFKA_TOPIC_PRICES']
+        self._news_topic = current_app.config['KAFKA_TOPIC_NEWS']
+
         self._init_producer()
 
     def _init_producer(self):
@@ -28,16 +46,66 @@ class KafkaService:
             bootstrap_servers = current_app.config['KAFKA_BOOTSTRAP_SERVERS']
             self.producer = KafkaProducer(
                 bootstrap_servers=bootstrap_servers.split(','),
-                value_serializer=lambda v: json.dumps(v).encode('utf-8'),
+                value_serializer=dumps_bytes,
                 key_serializer=lambda k: k.encode('utf-8') if k else None,
                 acks='all',  # Wait for all replicas
                 retries=3,
-                max_in_flight_requests_per_connection=1  # Ensure ordering
+                # kafka-python has no idempotent producer, so keep a single
+                # in-flight request for ordering and get throughput from batching
+                max_in_flight_requests_per_connection=1,
+                linger_ms=10,
+                batch_size=65536,
+                compression_type='lz4'
             )
             current_app.logger.info("Kafka producer initialized")
         except Exception as e:
             current_app.logger.error(f"Failed to initialize Kafka producer: {str(e)}")
             self.producer = None
+            return
+
+        self._send_thread = threading.Thread(target=self._producer_worker, daemon=True)
+        self._send_thread.start()
+
+    def _producer_worker(self):
+        """
+        Send queued messages in batches of up to SEND_BATCH_SIZE.
+
+        Blocks for the first message, drains whatever else is queued, sends
+        the batch and flushes once, so bursts share a single round-trip.
+        """
+        logger = self._log
+
+        while True:
+            batch = [self._send_q.get()]
+            while len(batch) < SEND_BATCH_SIZE:
+                try:
+                    batch.append(self._send_q.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                for topic, key, value in batch:
+                    future = self.producer.send(topic, key=key, value=value)
+                    future.add_errback(
+                        lambda exc, key=key: logger.error("Kafka publish error for %s: %s", key, exc)
+                    )
+                self.producer.flush(timeout=1.0)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Sent batch of %d Kafka messages", len(batch))
+            except Exception as e:
+                logger.error(f"Kafka producer worker error: {str(e)}")
+            finally:
+                for _ in batch:
+                    self._send_q.task_done()
+
+    def _enqueue(self, topic: str, key: str, message: Dict) -> bool:
+        """Queue a message for the producer thread without blocking."""
+        try:
+            self._send_q.put_nowait((topic, key, message))
+            return True
+        except queue.Full:
+            self._log.warning("Kafka send queue full, dropping message for %s", key)
+            return False
 
     def publish_price_update(self, symbol: str, price_data: Dict) -> bool:
         """
@@ -48,45 +116,27 @@ class KafkaService:
             price_data: Price data dictionary (OHLCV + timestamp)
 
         Returns:
-            True if successful, False otherwise
+            True if queued for sending, False otherwise
         """
         if not self.producer:
-            current_app.logger.warning("Kafka producer not available")
+            self._log.warning("Kafka producer not available")
             return False
 
-        try:
-            topic = current_app.config['KAFKA_TOPIC_PRICES']
-
-            # Add metadata
-            message = {
-                'symbol': symbol,
-                'timestamp': price_data.get('timestamp'),
-                'open': price_data.get('open'),
-                'high': price_data.get('high'),
-                'low': price_data.get('low'),
-                'close': price_data.get('close'),
-                'volume': price_data.get('volume')
-            }
-
-            future = self.producer.send(
-                topic,
-                key=symbol,
-                value=message
-            )
+        topic = self._price_topic
 
-            # Block for 'synchronous' send
-            record_metadata = future.get(timeout=10)
+        # Add metadata
+        message = {
+            'symbol': symbol,
+            'timestamp': price_data.get('timestamp'),
+            'open': price_data.get('open'),
+            'high': price_data.get('high'),
+            'low': price_data.get('low'),
+            'close': price_data.get('close'),
+            'volume': price_data.get('volume')
+        }
 
-            current_app.logger.debug(
-                f"Published price for {symbol} to partition {record_metadata.partition} "
-                f"at offset {record_metadata.offset}"
-            )
-
-            return True
-
-        except KafkaError as e:
-            current_app.logger.error(f"Kafka publish error for {symbol}: {str(e)}")
-            return False
+        # Fire-and-forget: the producer thread batches sends and logs failures
+        return self._enqueue(topic, symbol, message)
 
     def publish_news_event(self, symbol: str, news_data: Dict) -> bool:
         """
@@ -97,84 +147,88 @@ class KafkaService:
             news_data: News data dictionary
 
         Returns:
-            True if successful, False otherwise
+            True if queued for sending, False otherwise
         """
         if not self.producer:
             return False
 
-        try:
-            topic = current_app.config['KAFKA_TOPIC_NEWS']
-
-            message = {
-                'symbol': symbol,
-                'timestamp': news_data.get('timestamp'),
-                'title': news_data.get('title'),
-                'sentiment': news_data.get('sentiment'),
-                'source': news_data.get('source')
-            }
-
-            future = self.producer.send(
-                topic,
-                key=symbol,
-                value=message
-            )
+        topic = self._news_topic
 
-            future.get(timeout=10)
-            return True
+        message = {
+            'symbol': symbol,
+            'timestamp': news_data.get('timestamp'),
+            'title': news_data.get('title'),
+            'sentiment': news_data.get('sentiment'),
+            'source': news_data.get('source')
+        }
 
-        except KafkaError as e:
-            current_app.logger.error(f"Kafka news publish error: {str(e)}")
-            return False
+        return self._enqueue(topic, symbol, message)
 
-    def subscribe_to_prices(self, callback: Callable[[Dict], None], symbols: Optional[list] = None):
+    def subscribe_to_prices(self, callback: Callable[[List[Dict]], None], symbols: Optional[list] = None):
         """
         Subscribe to price updates from Kafka.
 
+        Runs a kafka-python consumer in a Socket.IO background task. In
+        eventlet mode the process must be monkey-patched (gunicorn's
+        eventlet workers, bridge.py) so the poll's socket I/O is green;
+        the loop also yields after every poll so the flush task can emit.
+        Messages are polled in batches (up to 500 records or 10 ms) and
+        handed to the callback as a list.
+
         Args:
-            callback: Function to call when message received
+            callback: Function to call with each non-empty batch of messages
             symbols: Optional list of symbols to filter (None for all)
         """
         consumer_id = f"prices_{id(callback)}"
 
-        if consumer_id in self.consumers:
+        if consumer_id in self.consumer_tasks:
             current_app.logger.warning(f"Consumer {consumer_id} already exists")
             return
 
         try:
             bootstrap_servers = current_app.config['KAFKA_BOOTSTRAP_SERVERS']
             topic = current_app.config['KAFKA_TOPIC_PRICES']
+            logger = current_app.logger
+            wanted = set(symbols) if symbols else None
 
-            consumer = KafkaConsumer(
-                topic,
-                bootstrap_servers=bootstrap_servers.split(','),
-                value_deserializer=lambda m: json.loads(m.decode('utf-8')),
-                key_deserializer=lambda k: k.decode('utf-8') if k else None,
-                group_id='brokerassistant-price-consumers',
-                auto_offset_reset='latest',
-                enable_auto_commit=True
-            )
-
-            self.consumers[consumer_id] = consumer
-
-            # Start consumer thread
             def consume():
+                consumer = None
                 try:
-                    for message in consumer:
-                        price_data = message.value
+                    consumer = KafkaConsumer(
+                        topic,
+                        bootstrap_servers=bootstrap_servers.split(','),
+                        value_deserializer=orjson.loads,
+                        key_deserializer=lambda k: k.decode('utf-8') if k else None,
+                        group_id='brokerassistant-price-consumers',
+                        auto_offset_reset='latest',
+                        enable_auto_commit=True
+                    )
+                    self.consumers[consumer_id] = consumer
+
+                    while not self._stop.is_set():
+                        records = consumer.poll(timeout_ms=10, max_records=500)
+                        batch = [
+                            message.value
+                            for messages in records.values()
+                            for message in messages
+                        ]
 
                         # Filter by symbols if specified
-                        if symbols and price_data.get('symbol') not in symbols:
-                            continue
+                        if wanted:
+                            batch = [m for m in batch if m.get('symbol') in wanted]
+
+                        if batch:
+                            callback(batch)
 
-                        callback(price_data)
+                        socketio.sleep(0)
                 except Exception as e:
-                    current_app.logger.error(f"Consumer error: {str(e)}")
+                    logger.error(f"Consumer error: {str(e)}")
                 finally:
-                    consumer.close()
+                    if consumer is not None:
+                        consumer.close()
+                    self.consumers.pop(consumer_id, None)
 
-            thread = threading.Thread(target=consume, daemon=True)
-            thread.start()
-            self.consumer_threads[consumer_id] = thread
+            self.consumer_tasks[consumer_id] = socketio.start_background_task(consume)
 
             current_app.logger.info(f"Started Kafka consumer {consumer_id}")
 
@@ -184,14 +238,19 @@ class KafkaService:
     def close(self):
         """Close all Kafka connections."""
         if self.producer:
+            # Let the producer thread send everything already queued
+            if self._send_thread is not None:
+                self._send_q.join()
             self.producer.close()
 
-        for consumer_id, consumer in self.consumers.items():
-            consumer.close()
+        # Consumers stop after the current poll
+        self._stop.set()
+        for consumer_id, task in self.consumer_tasks.items():
+            if hasattr(task, 'join'):
+                task.join(timeout=5)
             current_app.logger.info(f"Closed Kafka consumer {consumer_id}")
 
-        self.consumers.clear()
-        self.consumer_threads.clear()
+        self.consumer_tasks.clear()
 
 
 # Global Kafka service instance
@@ -2,13 +2,89 @@
 News Analysis Service using NLP and AI models.
 Implements quantitative fundamental analysis based on market news.
 """
-import requests
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
+import ahocorasick
+import httpx
 import anthropic
+import numpy as np
+import orjson
 from flask import current_app
 
-from app.utils.cache import cache_get, cache_set, get_analysis_cache_key
+from app.utils.cache import cache_get, cache_set, get_analysis_cache_key, get_news_ai_cache_key
+
+
+POSITIVE_WORDS = (
+    'growth', 'profit', 'surge', 'rise', 'gain', 'up', 'high',
+    'strong', 'beat', 'exceed', 'positive', 'bullish', 'buy'
+)
+NEGATIVE_WORDS = (
+    'loss', 'decline', 'fall', 'drop', 'down', 'low', 'weak',
+    'miss', 'negative', 'bearish', 'sell', 'risk', 'concern'
+)
+
+
+def _build_sentiment_automaton() -> ahocorasick.Automaton:
+    """Build an Aho-Corasick automaton mapping sentiment keywords to +1/-1."""
+    automaton = ahocorasick.Automaton()
+    for word in POSITIVE_WORDS:
+        automaton.add_word(word, 1)
+    for word in NEGATIVE_WORDS:
+        automaton.add_word(word, -1)
+    automaton.make_automaton()
+    return automaton
+
+
+_SENTIMENT_AUTOMATON = _build_sentiment_automaton()
+
+# Models often wrap JSON answers in ```json fences
+_FENCE_RE = re.compile(r'```(?:json)?\s*(\{.*?\})\s*```', re.S)
+
+
+def _parse_model_json(text: str) -> Dict:
+    """
+    Parse a JSON object from a model response, unwrapping code fences.
+
+    Args:
+        text: Raw model response text
+
+    Returns:
+        Parsed JSON object
+    """
+    match = _FENCE_RE.search(text)
+    return orjson.loads(match.group(1) if match else text)
+
+
+# Screening fans out fundamental lookups across this many threads
+SCREEN_MAX_WORKERS = 16
+
+# Shared HTTP/2 client so keep-alive connections survive across service instances
+_http_client: Optional[httpx.Client] = None
+
+
+def get_http_client() -> httpx.Client:
+    """Get or create the shared HTTP client for news and fundamentals APIs."""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.Client(
+            http2=True,
+            timeout=10,
+            limits=httpx.Limits(max_keepalive_connections=32)
+        )
+    return _http_client
+
+
+def _article_text_lc(article: Dict) -> str:
+    """Lowercased title and description used for keyword scoring."""
+    return f"{article.get('title') or ''} {article.get('description') or ''}".lower()
+
+
+def _public_articles(articles: List[Dict]) -> List[Dict]:
+    """Drop precomputed private fields (prefixed with _) from articles."""
+    return [{k: v for k, v in a.items() if not k.startswith('_')} for a in articles]
 
 
 class NewsAnalysisService:
@@ -18,12 +94,18 @@ class NewsAnalysisService:
     """
 
     def __init__(self):
+        config = current_app.config
         self.anthropic_client = None
-        self._init_ai_clients()
+        self._http = get_http_client()
 
-    def _init_ai_clients(self):
+        # Snapshot API keys so per-symbol fetches skip the app-context proxy
+        self.news_api_key = config.get('NEWS_API_KEY')
+        self.finnhub_key = config.get('FINNHUB_API_KEY')
+
+        self._init_ai_clients(config.get('ANTHROPIC_API_KEY'))
+
+    def _init_ai_clients(self, api_key: Optional[str]):
         """Initialize AI API clients."""
-        api_key = current_app.config.get('ANTHROPIC_API_KEY')
         if api_key:
             self.anthropic_client = anthropic.Anthropic(api_key=api_key)
 
@@ -76,22 +158,26 @@ class NewsAnalysisService:
             List of news articles
         """
         articles = []
-
-        # Try News API
-        news_api_key = current_app.config.get('NEWS_API_KEY')
-        if news_api_key:
-            try:
-                articles.extend(self._fetch_from_newsapi(symbol, news_api_key, limit))
-            except Exception as e:
-                current_app.logger.error(f"News API error: {str(e)}")
-
-        # Try Finnhub
-        finnhub_key = current_app.config.get('FINNHUB_API_KEY')
-        if finnhub_key and len(articles) < limit:
-            try:
-                articles.extend(self._fetch_from_finnhub(symbol, finnhub_key, limit - len(articles)))
-            except Exception as e:
-                current_app.logger.error(f"Finnhub API error: {str(e)}")
+        news_api_key = self.news_api_key
+        finnhub_key = self.finnhub_key
+
+        # Query both sources concurrently; NewsAPI articles come first
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            sources = []
+            if news_api_key:
+                sources.append(('News API', executor.submit(
+                    self._fetch_from_newsapi, symbol, news_api_key, limit
+                )))
+            if finnhub_key:
+                sources.append(('Finnhub API', executor.submit(
+                    self._fetch_from_finnhub, symbol, finnhub_key, limit
+                )))
+
+            for name, future in sources:
+                try:
+                    articles.extend(future.result())
+                except Exception as e:
+                    current_app.logger.error(f"{name} error: {str(e)}")
 
         return articles[:limit]
 
@@ -106,20 +192,22 @@ class NewsAnalysisService:
             'pageSize': limit
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = self._http.get(url, params=params)
         response.raise_for_status()
 
         data = response.json()
         articles = []
 
         for article in data.get('articles', []):
-            articles.append({
+            entry = {
                 'title': article.get('title'),
                 'description': article.get('description'),
                 'source': article.get('source', {}).get('name'),
                 'published_at': article.get('publishedAt'),
                 'url': article.get('url')
-            })
+            }
+            entry['_text_lc'] = _article_text_lc(entry)
+            articles.append(entry)
 
         return articles
 
@@ -137,20 +225,22 @@ class NewsAnalysisService:
             'token': api_key
         }
 
-        response = requests.get(url, params=params, timeout=10)
+        response = self._http.get(url, params=params)
         response.raise_for_status()
 
         data = response.json()
         articles = []
 
         for item in data[:limit]:
-            articles.append({
+            entry = {
                 'title': item.get('headline'),
                 'description': item.get('summary'),
                 'source': item.get('source'),
                 'published_at': datetime.fromtimestamp(item.get('datetime')).isoformat(),
                 'url': item.get('url')
-            })
+            }
+            entry['_text_lc'] = _article_text_lc(entry)
+            articles.append(entry)
 
         return articles
 
@@ -168,11 +258,26 @@ class NewsAnalysisService:
         if not self.anthropic_client:
             return self._basic_sentiment_analysis(symbol, articles)
 
-        # Prepare prompt for Claude
-        articles_text = "\n\n".join([
-            f"Title: {a['title']}\nDescription: {a['description']}\nSource: {a['source']}"
-            for a in articles if a.get('title')
-        ])
+        # Skip the model call if this exact article set was already scored
+        ai_cache_key = get_news_ai_cache_key(symbol, articles)
+        result = cache_get(ai_cache_key)
+        if result:
+            return self._ai_sentiment_response(symbol, articles, result)
+
+        # Prepare prompt for Claude in a single buffer, skipping untitled articles
+        buf = io.StringIO()
+        for a in articles:
+            title = a.get('title')
+            if not title:
+                continue
+            buf.write('Title: ')
+            buf.write(title)
+            buf.write('\nDescription: ')
+            buf.write(a.get('description') or '')
+            buf.write('\nSource: ')
+            buf.write(a.get('source') or '')
+            buf.write('\n\n')
+        articles_text = buf.getvalue()
 
         prompt = f"""Analyze the following news articles about {symbol} and provide:
 1. Overall sentiment (bullish, bearish, or neutral)
@@ -196,24 +301,29 @@ Respond in JSON format with keys: sentiment, score, factors (list), summary"""
 
             response_text = message.content[0].text
 
-            # Parse JSON response
-            import json
-            result = json.loads(response_text)
+            result = _parse_model_json(response_text)
 
-            return {
-                'symbol': symbol,
-                'sentiment': result.get('sentiment', 'neutral'),
-                'score': result.get('score', 0.5),
-                'factors': result.get('factors', []),
-                'summary': result.get('summary', ''),
-                'articles_analyzed': len(articles),
-                'articles': articles[:5]  # Include top 5 articles
-            }
+            # Content-addressed key, so a long TTL cannot serve stale articles
+            cache_set(ai_cache_key, result, ttl=86400)  # 24 hours
+
+            return self._ai_sentiment_response(symbol, articles, result)
 
         except Exception as e:
             current_app.logger.error(f"AI sentiment analysis error: {str(e)}")
             return self._basic_sentiment_analysis(symbol, articles)
 
+    def _ai_sentiment_response(self, symbol: str, articles: List[Dict], result: Dict) -> Dict:
+        """Build the sentiment response from a parsed model result."""
+        return {
+            'symbol': symbol,
+            'sentiment': result.get('sentiment', 'neutral'),
+            'score': result.get('score', 0.5),
+            'factors': result.get('factors', []),
+            'summary': result.get('summary', ''),
+            'articles_analyzed': len(articles),
+            'articles': _public_articles(articles[:5])  # Include top 5 articles
+        }
+
     def _basic_sentiment_analysis(self, symbol: str, articles: List[Dict]) -> Dict:
         """
         Basic keyword-based sentiment analysis (fallback).
@@ -225,25 +335,21 @@ Respond in JSON format with keys: sentiment, score, factors (list), summary"""
         Returns:
             Basic sentiment analysis
         """
-        positive_words = [
-            'growth', 'profit', 'surge', 'rise', 'gain', 'up', 'high',
-            'strong', 'beat', 'exceed', 'positive', 'bullish', 'buy'
-        ]
-        negative_words = [
-            'loss', 'decline', 'fall', 'drop', 'down', 'low', 'weak',
-            'miss', 'negative', 'bearish', 'sell', 'risk', 'concern'
-        ]
-
         positive_count = 0
         negative_count = 0
 
+        # One automaton pass per article counts every keyword occurrence,
+        # same as summing str.count over each word
         for article in articles:
-            text = f"{article.get('title', '')} {article.get('description', '')}".lower()
+            text = article.get('_text_lc')
+            if text is None:
+                text = _article_text_lc(article)
 
-            for word in positive_words:
-                positive_count += text.count(word)
-            for word in negative_words:
-                negative_count += text.count(word)
+            for _, sign in _SENTIMENT_AUTOMATON.iter(text):
+                if sign > 0:
+                    positive_count += 1
+                else:
+                    negative_count += 1
 
         total = positive_count + negative_count
         if total == 0:
@@ -264,7 +370,7 @@ Respond in JSON format with keys: sentiment, score, factors (list), summary"""
             'score': score,
             'articles_analyzed': len(articles),
             'summary': f'Based on keyword analysis of {len(articles)} articles',
-            'articles': articles[:5]
+            'articles': _public_articles(articles[:5])
         }
 
     def screen_assets_by_fundamentals(self, symbols: List[str]) -> List[Dict]:
@@ -277,22 +383,34 @@ Respond in JSON format with keys: sentiment, score, factors (list), summary"""
         Returns:
             List of assets that pass fundamental screening
         """
+        app = current_app._get_current_object()
+
+        def fetch(symbol: str) -> Optional[Dict]:
+            with app.app_context():
+                try:
+                    return self._get_fundamental_data(symbol)
+                except Exception as e:
+                    current_app.logger.error(f"Fundamental screening error for {symbol}: {str(e)}")
+                    return None
+
+        # Lookups are I/O bound, so fetch concurrently; map keeps input order
+        with ThreadPoolExecutor(max_workers=SCREEN_MAX_WORKERS) as executor:
+            all_fundamentals = list(executor.map(fetch, symbols))
+
+        fetched = [(symbol, f) for symbol, f in zip(symbols, all_fundamentals) if f]
+        mask = self._fundamental_criteria_mask([f for _, f in fetched])
+
         results = []
 
-        for symbol in symbols:
-            try:
-                fundamentals = self._get_fundamental_data(symbol)
-
-                if fundamentals and self._passes_fundamental_criteria(fundamentals):
-                    results.append({
-                        'symbol': symbol,
-                        'pe_ratio': fundamentals.get('pe_ratio'),
-                        'pb_ratio': fundamentals.get('pb_ratio'),
-                        'dividend_yield': fundamentals.get('dividend_yield'),
-                        'market_cap': fundamentals.get('market_cap')
-                    })
-            except Exception as e:
-                current_app.logger.error(f"Fundamental screening error for {symbol}: {str(e)}")
+        for i in np.flatnonzero(mask):
+            symbol, fundamentals = fetched[i]
+            results.append({
+                'symbol': symbol,
+                'pe_ratio': fundamentals.get('pe_ratio'),
+                'pb_ratio': fundamentals.get('pb_ratio'),
+                'dividend_yield': fundamentals.get('dividend_yield'),
+                'market_cap': fundamentals.get('market_cap')
+            })
 
         return results
 
@@ -316,37 +434,38 @@ Respond in JSON format with keys: sentiment, score, factors (list), summary"""
             'market_cap': None
         }
 
-    def _passes_fundamental_criteria(self, fundamentals: Dict) -> bool:
+    def _fundamental_criteria_mask(self, fundamentals_list: List[Dict]) -> np.ndarray:
         """
-        Check if asset passes fundamental screening criteria.
+        Evaluate the fundamental screening criteria for many assets at once.
 
         Criteria from spec:
         - Low P/E ratio
         - Price below book value (P/B < 1)
         - Above-average dividend yield (but not excessive)
 
+        Missing (or zero) values become NaN, which compares False, so an
+        absent metric never fails its criterion.
+
         Args:
-            fundamentals: Fundamental data
+            fundamentals_list: Fundamental data per asset
 
         Returns:
-            True if passes criteria
+            Boolean array, True where the asset passes all criteria
         """
-        pe = fundamentals.get('pe_ratio')
-        pb = fundamentals.get('pb_ratio')
-        div_yield = fundamentals.get('dividend_yield')
+        def column(key: str) -> np.ndarray:
+            return np.array(
+                [f.get(key) or np.nan for f in fundamentals_list], dtype=np.float64
+            )
 
-        passes = True
+        pe = column('pe_ratio')
+        pb = column('pb_ratio')
+        div_yield = column('dividend_yield')
 
         # Low P/E (below 15 is considered good)
-        if pe and pe > 20:
-            passes = False
-
+        fails = pe > 20
         # P/B below 1 (price below book value)
-        if pb and pb > 1.5:
-            passes = False
-
+        fails |= pb > 1.5
         # Dividend yield between 2% and 8% (above average but not excessive)
-        if div_yield and (div_yield < 2 or div_yield > 8):
-            passes = False
+        fails |= (div_yield < 2) | (div_yield > 8)
 
-        return passes
+        return ~fails
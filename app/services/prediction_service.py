@@ -2,15 +2,32 @@
 Prediction Service for generating and storing AI predictions.
 Implements continuous learning through prediction history tracking.
 """
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
-import pandas as pd
+from typing import Dict, Iterator, List, Optional, Tuple
+import numpy as np
 from flask import current_app
+from sqlalchemy.orm import make_transient_to_detached, selectinload
 
 from app import db
 from app.models.prediction import Prediction, PredictionFactor
 from app.services.technical_analysis import TechnicalAnalysisService
 from app.services.news_analysis import NewsAnalysisService
+from app.utils.bulk import copy_rows
+
+# Expired predictions verified per UPDATE/commit
+VERIFY_BATCH_SIZE = 500
+
+# Market condition by code + 1 (bearish -1, sideways 0, bullish 1)
+MARKET_CONDITIONS = ('bearish', 'sideways', 'bullish')
+
+# Accumulator slot per signal type in _combine_analyses
+_SIGNAL_SLOTS = {'BUY': 0, 'SELL': 1}
+
+FACTOR_FIELDS = (
+    'factor_type', 'factor_name', 'factor_value', 'weight',
+    'description', 'indicator_period', 'indicator_threshold'
+)
 
 
 class PredictionService:
@@ -22,11 +39,14 @@ class PredictionService:
     def __init__(self):
         self.technical_service = TechnicalAnalysisService()
         self.news_service = NewsAnalysisService()
+        config = current_app.config
+        self.confidence_threshold = config.get('PATTERN_CONFIDENCE_THRESHOLD', 0.8)
+        self.bulk_insert_threshold = config.get('BULK_INSERT_THRESHOLD', 100)
 
     def generate_prediction(
         self,
         symbol: str,
-        price_data: pd.DataFrame,
+        price_data: Dict[str, np.ndarray],
         analysis_type: str = 'hybrid',
         user_id: Optional[int] = None
     ) -> Prediction:
@@ -35,24 +55,106 @@ class PredictionService:
 
         Args:
             symbol: Asset symbol
-            price_data: Historical price data
+            price_data: Historical OHLCV arrays keyed by column
+            analysis_type: 'technical', 'fundamental', or 'hybrid'
+            user_id: Optional user ID if prediction is for specific user
+
+        Returns:
+            Prediction object (already saved to database, detached from the
+            session with its factors loaded)
+        """
+        prediction, factors = self.build_prediction(symbol, price_data, analysis_type, user_id)
+
+        now = datetime.utcnow()
+        prediction.created_at = now
+        prediction.user_executed = False
+
+        # Core INSERT ... RETURNING skips the unit-of-work flush for one row
+        table = Prediction.__table__
+        values = {c.name: getattr(prediction, c.name) for c in table.columns if c.name != 'id'}
+        prediction.id = db.session.execute(
+            db.insert(table).values(values).returning(table.c.id)
+        ).scalar_one()
+        for name, value in values.items():
+            setattr(prediction, name, value)
+
+        # Add explainability factors (XAI)
+        rows = self._factor_rows([(prediction.id, factors)])
+        for row in rows:
+            row['created_at'] = now
+        factor_ids = db.session.execute(
+            db.insert(PredictionFactor.__table__).returning(
+                PredictionFactor.__table__.c.id, sort_by_parameter_order=True
+            ),
+            rows
+        ).scalars().all() if rows else []
+
+        # The objects were never added to the session; mark them as loaded
+        # rows so callers can serialize them without further queries
+        prediction.factors = [
+            PredictionFactor(id=factor_id, **row) for factor_id, row in zip(factor_ids, rows)
+        ]
+        for factor in prediction.factors:
+            make_transient_to_detached(factor)
+        make_transient_to_detached(prediction)
+
+        current_app.logger.info(
+            f"Generated {prediction.prediction_type} prediction for {symbol} "
+            f"with confidence {prediction.confidence_score}"
+        )
+
+        db.session.commit()
+
+        return prediction
+
+    def build_prediction(
+        self,
+        symbol: str,
+        price_data: Dict[str, np.ndarray],
+        analysis_type: str = 'hybrid',
+        user_id: Optional[int] = None,
+        tech_analysis: Optional[Dict] = None
+    ) -> Tuple[Prediction, List[Dict]]:
+        """
+        Build a prediction and its XAI factors without persisting them.
+
+        Args:
+            symbol: Asset symbol
+            price_data: Historical OHLCV arrays keyed by column
             analysis_type: 'technical', 'fundamental', or 'hybrid'
             user_id: Optional user ID if prediction is for specific user
+            tech_analysis: Technical analysis already computed for price_data
+                (e.g. by a scan); computed here when not given
 
         Returns:
-            Prediction object (already saved to database)
+            Tuple of (unsaved Prediction, list of factor dictionaries)
         """
-        current_price = float(price_data['close'].iloc[-1])
+        current_price = float(price_data['close'][-1])
 
         # Perform analysis based on type
-        if analysis_type in ['technical', 'hybrid']:
-            tech_analysis = self.technical_service.analyze_asset(symbol, price_data)
-        else:
+        if analysis_type == 'hybrid':
+            # News lookups are network bound, so overlap them with the
+            # technical analysis running on this thread
+            app = current_app._get_current_object()
+
+            def fetch_news() -> Dict:
+                with app.app_context():
+                    return self.news_service.analyze_news_for_asset(symbol)
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                news_future = executor.submit(fetch_news)
+                if tech_analysis is None:
+                    tech_analysis = self.technical_service.analyze_asset(symbol, price_data)
+                news_analysis = news_future.result()
+        elif analysis_type == 'technical':
+            if tech_analysis is None:
+                tech_analysis = self.technical_service.analyze_asset(symbol, price_data)
+            news_analysis = None
+        elif analysis_type == 'fundamental':
             tech_analysis = None
-
-        if analysis_type in ['fundamental', 'hybrid']:
             news_analysis = self.news_service.analyze_news_for_asset(symbol)
         else:
+            tech_analysis = None
             news_analysis = None
 
         # Generate prediction
@@ -88,26 +190,112 @@ class PredictionService:
         else:  # medium
             prediction.expires_at = datetime.utcnow() + timedelta(days=30)
 
-        db.session.add(prediction)
-        db.session.flush()  # Get prediction ID
-
-        # Add explainability factors (XAI)
         factors = self._extract_factors(tech_analysis, news_analysis, prediction_result)
-        for factor_data in factors:
-            factor = PredictionFactor(
-                prediction_id=prediction.id,
-                **factor_data
-            )
-            db.session.add(factor)
+
+        return prediction, factors
+
+    def bulk_persist(self, entries: List[Tuple[Prediction, List[Dict]]]) -> int:
+        """
+        Persist many predictions with their factors in one go.
+
+        Batches at or above BULK_INSERT_THRESHOLD on PostgreSQL are streamed
+        with COPY; smaller batches (and other databases) use the ORM.
+
+        Args:
+            entries: List of (Prediction, factor dictionaries) tuples
+
+        Returns:
+            Number of predictions persisted
+        """
+        if not entries:
+            return 0
+
+        if len(entries) >= self.bulk_insert_threshold and db.engine.dialect.name == 'postgresql':
+            self._copy_persist(entries)
+        else:
+            for prediction, _ in entries:
+                db.session.add(prediction)
+            db.session.flush()  # Get prediction IDs
+
+            self._insert_factors([(prediction.id, factors) for prediction, factors in entries])
 
         db.session.commit()
 
-        current_app.logger.info(
-            f"Generated {prediction.prediction_type} prediction for {symbol} "
-            f"with confidence {prediction.confidence_score}"
-        )
+        current_app.logger.info(f"Persisted {len(entries)} predictions")
 
-        return prediction
+        return len(entries)
+
+    def _insert_factors(self, factor_sets: List[Tuple[int, List[Dict]]]):
+        """
+        Insert factor rows with a single executemany INSERT.
+
+        Every row carries the same keys so the statement compiles once and
+        psycopg2 can batch it into multi-row VALUES.
+
+        Args:
+            factor_sets: List of (prediction ID, factor dictionaries) tuples
+        """
+        rows = self._factor_rows(factor_sets)
+        if rows:
+            db.session.execute(db.insert(PredictionFactor.__table__), rows)
+
+    @staticmethod
+    def _factor_rows(factor_sets: List[Tuple[int, List[Dict]]]) -> List[Dict]:
+        """
+        Build uniform factor row dictionaries for insertion.
+
+        Args:
+            factor_sets: List of (prediction ID, factor dictionaries) tuples
+
+        Returns:
+            List of row dictionaries keyed by PredictionFactor column
+        """
+        return [
+            {'prediction_id': prediction_id, **{field: factor_data.get(field) for field in FACTOR_FIELDS}}
+            for prediction_id, factors in factor_sets
+            for factor_data in factors
+        ]
+
+    def _copy_persist(self, entries: List[Tuple[Prediction, List[Dict]]]):
+        """
+        Write predictions and factors with PostgreSQL COPY.
+
+        Prediction IDs are reserved from the sequence up front so factor rows
+        can reference them without a round-trip per prediction.
+
+        Args:
+            entries: List of (Prediction, factor dictionaries) tuples
+        """
+        connection = db.session.connection()
+        ids = connection.execute(
+            db.text("SELECT nextval('predictions_id_seq') FROM generate_series(1, :n)"),
+            {'n': len(entries)}
+        ).scalars().all()
+
+        now = datetime.utcnow()
+        prediction_columns = [c.name for c in Prediction.__table__.columns]
+        factor_columns = [c.name for c in PredictionFactor.__table__.columns if c.name != 'id']
+
+        prediction_rows = []
+        factor_rows = []
+        for prediction_id, (prediction, factors) in zip(ids, entries):
+            prediction.id = prediction_id
+            if prediction.created_at is None:
+                prediction.created_at = now
+            if prediction.user_executed is None:
+                prediction.user_executed = False
+            prediction_rows.append([getattr(prediction, name) for name in prediction_columns])
+
+            for factor_data in factors:
+                factor_data = dict(factor_data, prediction_id=prediction_id, created_at=now)
+                factor_rows.append([factor_data.get(name) for name in factor_columns])
+
+        cursor = connection.connection.cursor()
+        try:
+            copy_rows(cursor, 'predictions', prediction_columns, prediction_rows)
+            copy_rows(cursor, 'prediction_factors', factor_columns, factor_rows)
+        finally:
+            cursor.close()
 
     def _combine_analyses(
         self,
@@ -130,20 +318,14 @@ class PredictionService:
         Returns:
             Combined prediction dictionary
         """
-        buy_score = 0
-        sell_score = 0
-        total_weight = 0
-
-        # Technical signals
+        # Technical signals, accumulated per type without branching
+        scores = [0.0, 0.0, 0.0]  # BUY, SELL, other
         if tech_analysis and tech_analysis.get('signals'):
             for signal in tech_analysis['signals']:
-                weight = signal['confidence']
-                total_weight += weight
+                scores[_SIGNAL_SLOTS.get(signal['type'], 2)] += signal['confidence']
 
-                if signal['type'] == 'BUY':
-                    buy_score += weight
-                elif signal['type'] == 'SELL':
-                    sell_score += weight
+        buy_score, sell_score = scores[0], scores[1]
+        total_weight = scores[0] + scores[1] + scores[2]
 
         # Fundamental signals (news sentiment)
         if news_analysis:
@@ -168,7 +350,7 @@ class PredictionService:
         buy_confidence = buy_score / total_weight if total_weight > 0 else 0
         sell_confidence = sell_score / total_weight if total_weight > 0 else 0
 
-        threshold = current_app.config.get('PATTERN_CONFIDENCE_THRESHOLD', 0.8)
+        threshold = self.confidence_threshold
 
         if buy_confidence >= threshold:
             prediction_type = 'BUY'
@@ -211,6 +393,11 @@ class PredictionService:
         if not tech_analysis or not tech_analysis.get('indicators'):
             return 'neutral'
 
+        # Computed alongside the indicator kernels by TechnicalAnalysisService
+        code = tech_analysis.get('market_condition_code')
+        if code is not None:
+            return MARKET_CONDITIONS[code + 1]
+
         indicators = tech_analysis['indicators']
         bullish_count = 0
         bearish_count = 0
@@ -315,41 +502,65 @@ class PredictionService:
 
         return factors
 
-    def verify_predictions(self, symbols: Optional[List[str]] = None):
+    def verify_predictions(self, symbols: Optional[List[str]] = None) -> int:
         """
         Verify past predictions for backtesting and continuous learning.
 
         Args:
             symbols: Optional list of symbols to verify (all if None)
+
+        Returns:
+            Number of predictions verified
         """
-        # Get pending predictions that have expired
-        query = Prediction.query.filter(
+        now = datetime.utcnow()
+
+        # Get pending predictions that have expired and not been verified;
+        # this matches the ix_predictions_pending partial index
+        stmt = db.select(Prediction.id).where(
             Prediction.actual_outcome == 'pending',
-            Prediction.expires_at <= datetime.utcnow()
+            Prediction.outcome_verified_at.is_(None),
+            Prediction.expires_at <= now
         )
 
         if symbols:
-            query = query.filter(Prediction.symbol.in_(symbols))
+            stmt = stmt.where(Prediction.symbol.in_(symbols))
 
-        predictions = query.all()
+        # Walk the backlog in id-ordered batches so each UPDATE and commit
+        # stays small however many predictions have expired. No price source
+        # is wired in, so outcomes are only stamped as verified, not scored.
+        verified = 0
+        last_id = 0
 
-        for prediction in predictions:
-            # Here you would fetch current price and verify prediction
-            # For now, just mark as verified
-            prediction.outcome_verified_at = datetime.utcnow()
-            # Would calculate accuracy_score based on actual outcome
-            # prediction.accuracy_score = ...
-            # prediction.actual_outcome = 'correct' or 'incorrect'
+        while True:
+            ids = db.session.scalars(
+                stmt.where(Prediction.id > last_id)
+                .order_by(Prediction.id)
+                .limit(VERIFY_BATCH_SIZE)
+            ).all()
+            if not ids:
+                break
 
-        db.session.commit()
+            verified += db.session.execute(
+                db.update(Prediction)
+                .where(Prediction.id.in_(ids))
+                .values(outcome_verified_at=now)
+                .execution_options(synchronize_session=False)
+            ).rowcount
+            db.session.commit()
+
+            last_id = ids[-1]
 
-        current_app.logger.info(f"Verified {len(predictions)} predictions")
+        current_app.logger.info(f"Verified {verified} predictions")
+
+        return verified
 
     def get_prediction_history(
         self,
         symbol: Optional[str] = None,
         user_id: Optional[int] = None,
-        limit: int = 50
+        limit: int = 50,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None
     ) -> List[Prediction]:
         """
         Retrieve prediction history for analysis.
@@ -358,18 +569,88 @@ class PredictionService:
             symbol: Optional symbol filter
             user_id: Optional user filter
             limit: Maximum predictions to return
+            before: created_at of the last prediction already seen (keyset cursor)
+            before_id: id of that prediction; breaks ties between predictions
+                stored with the same created_at
 
         Returns:
             List of predictions
         """
-        query = Prediction.query.order_by(Prediction.created_at.desc())
+        query = Prediction.query.options(
+            selectinload(Prediction.factors)
+        ).filter(
+            *self._history_conditions(symbol, user_id, before, before_id)
+        ).order_by(Prediction.created_at.desc(), Prediction.id.desc())
+
+        return query.limit(limit).all()
 
+    def iter_prediction_history(
+        self,
+        symbol: Optional[str] = None,
+        user_id: Optional[int] = None,
+        limit: int = 50,
+        before: Optional[datetime] = None,
+        before_id: Optional[int] = None,
+        batch_size: int = 200
+    ) -> Iterator[Prediction]:
+        """
+        Iterate prediction history without materializing the full result.
+
+        Rows are fetched from the database in batches of batch_size.
+
+        Args:
+            symbol: Optional symbol filter
+            user_id: Optional user filter
+            limit: Maximum predictions to return
+            before: created_at of the last prediction already seen (keyset cursor)
+            before_id: id of that prediction, as in get_prediction_history
+            batch_size: Rows fetched per round-trip
+
+        Yields:
+            Predictions, newest first
+        """
+        stmt = db.select(Prediction).where(
+            *self._history_conditions(symbol, user_id, before, before_id)
+        ).order_by(Prediction.created_at.desc(), Prediction.id.desc())
+
+        stmt = stmt.limit(limit).execution_options(stream_results=True, yield_per=batch_size)
+
+        yield from db.session.execute(stmt).scalars()
+
+    @staticmethod
+    def _history_conditions(
+        symbol: Optional[str],
+        user_id: Optional[int],
+        before: Optional[datetime],
+        before_id: Optional[int]
+    ) -> List:
+        """
+        Build the WHERE conditions shared by the prediction history queries.
+
+        Args:
+            symbol: Optional symbol filter
+            user_id: Optional user filter
+            before: Keyset cursor timestamp
+            before_id: Keyset cursor id
+
+        Returns:
+            List of SQL conditions
+        """
+        conditions = []
         if symbol:
-            query = query.filter(Prediction.symbol == symbol)
+            conditions.append(Prediction.symbol == symbol)
         if user_id:
-            query = query.filter(Prediction.user_id == user_id)
-
-        return query.limit(limit).all()
+            conditions.append(Prediction.user_id == user_id)
+        if before and before_id is not None:
+            # Keyset pagination: an index range scan instead of OFFSET. Batch
+            # inserts share one created_at, so the id keeps a page boundary
+            # inside a tie from skipping the rest of it
+            conditions.append(
+                db.tuple_(Prediction.created_at, Prediction.id) < db.tuple_(before, before_id)
+            )
+        elif before:
+            conditions.append(Prediction.created_at < before)
+        return conditions
 
     def get_accuracy_stats(self, symbol: Optional[str] = None) -> Dict:
         """
@@ -381,13 +662,18 @@ class PredictionService:
         Returns:
             Dictionary with accuracy statistics
         """
-        query = Prediction.query.filter(Prediction.actual_outcome != 'pending')
+        # Total and correct counts in one pass over the resolved predictions
+        stmt = db.select(
+            db.func.count(),
+            db.func.coalesce(
+                db.func.sum(db.case((Prediction.actual_outcome == 'correct', 1), else_=0)), 0
+            )
+        ).where(Prediction.actual_outcome != 'pending')
 
         if symbol:
-            query = query.filter(Prediction.symbol == symbol)
+            stmt = stmt.where(Prediction.symbol == symbol)
 
-        total = query.count()
-        correct = query.filter(Prediction.actual_outcome == 'correct').count()
+        total, correct = db.session.execute(stmt).one()
 
         accuracy = (correct / total * 100) if total > 0 else 0
 
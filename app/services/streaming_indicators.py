@@ -0,0 +1,172 @@
+"""
+Incremental RSI and MACD for symbols re-analyzed as new bars arrive.
+Wilder/EMA recurrences are resumed from the state saved at the previous
+bar count, so a request with one new bar costs O(1) instead of a full
+pass over the history. Bollinger Bands and the Stochastic Oscillator
+already read only their trailing window and need no state.
+"""
+import hashlib
+import threading
+from typing import Tuple
+import numpy as np
+from cachetools import TTLCache
+
+from app.utils.jit import njit
+
+# Saved recurrence state per (symbol, timeframe, periods); idle series age out
+STATE_CACHE_SIZE = 4096
+STATE_TTL_SECONDS = 3600
+
+_states = TTLCache(maxsize=STATE_CACHE_SIZE, ttl=STATE_TTL_SECONDS)
+_states_lock = threading.Lock()
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def rsi_advance(close, start, avg_up, avg_down, period):
+    """
+    Advance Wilder-smoothed gains and losses over close[start:].
+
+    Args:
+        close: float64 close prices
+        start: First bar to fold in (>= 1)
+        avg_up: Smoothed gain after bar start - 1 (0.0 to bootstrap)
+        avg_down: Smoothed loss after bar start - 1 (0.0 to bootstrap)
+        period: RSI period
+
+    Returns:
+        Tuple of (avg_up, avg_down) after the last bar
+    """
+    alpha = 1.0 / period
+    for i in range(start, close.shape[0]):
+        diff = close[i] - close[i - 1]
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        avg_up = (1.0 - alpha) * avg_up + alpha * up
+        avg_down = (1.0 - alpha) * avg_down + alpha * down
+    return avg_up, avg_down
+
+
+@njit(cache=True, nogil=True, error_model='numpy')
+def macd_advance(close, start, ema_fast, ema_slow, line, signal_avg, signal_count, fast, slow, signal):
+    """
+    Advance the MACD EMA recurrences over close[start:].
+
+    Matches ta_kernels.macd_last when bootstrapped with start=0 and both
+    EMAs seeded from close[0].
+
+    Args:
+        close: float64 close prices
+        start: First bar to fold in
+        ema_fast: Fast EMA after bar start - 1
+        ema_slow: Slow EMA after bar start - 1
+        line: MACD line after bar start - 1 (NaN before warmup)
+        signal_avg: Signal EMA after bar start - 1
+        signal_count: MACD values folded into the signal EMA so far
+        fast: Fast EMA span
+        slow: Slow EMA span
+        signal: Signal line EMA span
+
+    Returns:
+        Tuple of (ema_fast, ema_slow, line, signal_avg, signal_count)
+    """
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+
+    for i in range(start, close.shape[0]):
+        if i > 0:
+            ema_fast = (1.0 - alpha_fast) * ema_fast + alpha_fast * close[i]
+            ema_slow = (1.0 - alpha_slow) * ema_slow + alpha_slow * close[i]
+        if i >= fast - 1 and i >= slow - 1:
+            line = ema_fast - ema_slow
+            if signal_count == 0:
+                signal_avg = line
+            else:
+                signal_avg = (1.0 - alpha_signal) * signal_avg + alpha_signal * line
+            signal_count += 1
+
+    return ema_fast, ema_slow, line, signal_avg, signal_count
+
+
+def rsi_macd_last(
+    symbol: str,
+    close: np.ndarray,
+    rsi_period: int,
+    fast: int,
+    slow: int,
+    signal: int,
+    timeframe: str = '1d'
+) -> Tuple[float, float, float, float]:
+    """
+    Last RSI and MACD values, resumed from the series' saved state.
+
+    The saved state is reused only when the new series is longer than the
+    one it was computed from and starts with exactly the same bars (checked
+    by a hash of that prefix); a revised bar, a shifted window or a series
+    of the same length is recomputed from the first bar. Results equal
+    ta_kernels.rsi_last and macd_last.
+
+    Args:
+        symbol: Asset symbol the series belongs to
+        close: float64 close prices (at least one bar)
+        rsi_period: RSI period
+        fast: MACD fast EMA span
+        slow: MACD slow EMA span
+        signal: MACD signal EMA span
+        timeframe: Bar interval of the series (1m, 1h, 1d, ...), kept apart
+            so series of different intervals never share state
+
+    Returns:
+        Tuple of (rsi, macd, signal, histogram); MACD parts are NaN
+        where there is not enough history
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    n = close.shape[0]
+    key = (symbol, timeframe, rsi_period, fast, slow, signal)
+
+    with _states_lock:
+        state = _states.get(key)
+
+    # One pass over the bytes: the saved prefix is verified, then the hash
+    # is extended to the full series for the next call
+    fingerprint = hashlib.blake2b(digest_size=16)
+    start = 0
+    if state is not None and state[0] < n:
+        fingerprint.update(close[:state[0]].data)
+        if fingerprint.digest() == state[1]:
+            start = state[0]
+        else:
+            fingerprint = hashlib.blake2b(digest_size=16)
+
+    if start:
+        _, _, rsi_state, macd_state = state
+        fingerprint.update(close[start:].data)
+    else:
+        rsi_state = (0.0, 0.0)
+        macd_state = (close[0], close[0], np.nan, 0.0, 0)
+        fingerprint.update(close.data)
+
+    avg_up, avg_down = rsi_advance(close, max(start, 1), rsi_state[0], rsi_state[1], rsi_period)
+    macd_state = macd_advance(close, start, *macd_state, fast, slow, signal)
+
+    with _states_lock:
+        _states[key] = (n, fingerprint.digest(), (avg_up, avg_down), macd_state)
+
+    rsi_value = 100.0 if avg_down == 0 else 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+
+    _, _, line, signal_avg, signal_count = macd_state
+    signal_value = signal_avg if signal_count >= signal else np.nan
+    return rsi_value, line, signal_value, line - signal_value
+
+
+def reset():
+    """Drop all saved state."""
+    with _states_lock:
+        _states.clear()
+
+
+def warmup():
+    """Compile (or load from cache) the recurrence kernels on a dummy series."""
+    dummy = np.linspace(100.0, 110.0, 64)
+    rsi_advance(dummy, 1, 0.0, 0.0, 14)
+    macd_advance(dummy, 0, dummy[0], dummy[0], np.nan, 0.0, 0, 12, 26, 9)
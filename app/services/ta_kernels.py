@@ -0,0 +1,259 @@
+"""
+Numba kernels for technical indicators.
+Single-pass implementations over raw float64 arrays, matching the
+semantics of the ta library (pandas rolling/ewm with adjust=False).
+Kernels release the GIL so multi-asset scans can run them on threads.
+The per-request *_last kernels are compiled eagerly for contiguous
+float64 input, so the on-disk cache is loaded at import.
+"""
+import numpy as np
+
+from app.utils.jit import njit, prange
+
+# Columns of the batch_last output, one row per series
+BATCH_FIELDS = (
+    'upper', 'middle', 'lower', 'rsi', 'k', 'd', 'macd', 'signal', 'histogram', 'condition'
+)
+
+
+@njit('UniTuple(f8, 3)(f8[::1], i8, f8)', cache=True, nogil=True, error_model='numpy')
+def bollinger_last(close, period, nstd):
+    """
+    Bollinger Bands for the last bar only.
+
+    Reads just the trailing window, so cost is O(period) regardless of
+    series length. Uses the population standard deviation (ddof=0).
+
+    Args:
+        close: float64 close prices
+        period: Window length
+        nstd: Number of standard deviations for the bands
+
+    Returns:
+        Tuple of (upper, middle, lower) floats, NaN if fewer than period bars
+    """
+    n = close.shape[0]
+    if n < period:
+        return np.nan, np.nan, np.nan
+
+    mean = 0.0
+    for i in range(n - period, n):
+        mean += close[i]
+    mean /= period
+
+    var = 0.0
+    for i in range(n - period, n):
+        d = close[i] - mean
+        var += d * d
+    std = np.sqrt(var / period)
+
+    return mean + nstd * std, mean, mean - nstd * std
+
+
+@njit('f8(f8[::1], i8)', cache=True, nogil=True, error_model='numpy')
+def rsi_last(close, period):
+    """
+    RSI for the last bar only.
+
+    Wilder smoothing depends on the full history, so this still walks the
+    series once, but keeps only scalar state instead of output arrays.
+
+    Args:
+        close: float64 close prices
+        period: RSI period
+
+    Returns:
+        Last RSI value (0-100), NaN if fewer than period bars
+    """
+    n = close.shape[0]
+    if n < period:
+        return np.nan
+
+    alpha = 1.0 / period
+    avg_up = 0.0
+    avg_down = 0.0
+
+    for i in range(1, n):
+        diff = close[i] - close[i - 1]
+        up = diff if diff > 0 else 0.0
+        down = -diff if diff < 0 else 0.0
+        avg_up = (1.0 - alpha) * avg_up + alpha * up
+        avg_down = (1.0 - alpha) * avg_down + alpha * down
+
+    if avg_down == 0:
+        return 100.0
+    return 100.0 - 100.0 / (1.0 + avg_up / avg_down)
+
+
+@njit('UniTuple(f8, 2)(f8[::1], f8[::1], f8[::1], i8, i8)', cache=True, nogil=True, error_model='numpy')
+def stochastic_last(high, low, close, period, smooth):
+    """
+    Stochastic Oscillator %K and %D for the last bar only.
+
+    Only the trailing smooth %K values are computed, so cost is
+    O(period * smooth).
+
+    Args:
+        high: float64 high prices
+        low: float64 low prices
+        close: float64 close prices
+        period: Look-back window for %K
+        smooth: Moving-average window for %D
+
+    Returns:
+        Tuple of (k, d) floats, NaN where there is not enough history
+    """
+    n = close.shape[0]
+    if n < period:
+        return np.nan, np.nan
+
+    k_last = np.nan
+    k_sum = 0.0
+    k_count = 0
+    for i in range(max(period - 1, n - smooth), n):
+        lowest = low[i]
+        highest = high[i]
+        for j in range(i - period + 1, i):
+            if low[j] < lowest:
+                lowest = low[j]
+            if high[j] > highest:
+                highest = high[j]
+        k_last = 100.0 * (close[i] - lowest) / (highest - lowest)
+        k_sum += k_last
+        k_count += 1
+
+    d_last = k_sum / smooth if k_count == smooth and not np.isnan(k_sum) else np.nan
+    return k_last, d_last
+
+
+@njit('UniTuple(f8, 3)(f8[::1], i8, i8, i8)', cache=True, nogil=True, error_model='numpy')
+def macd_last(close, fast, slow, signal):
+    """
+    MACD, signal and histogram for the last bar only.
+
+    Runs the three EMA recurrences in one pass with scalar state.
+
+    Args:
+        close: float64 close prices
+        fast: Fast EMA span
+        slow: Slow EMA span
+        signal: Signal line EMA span
+
+    Returns:
+        Tuple of (macd, signal, histogram) floats, NaN where there is not
+        enough history
+    """
+    n = close.shape[0]
+    if n == 0:
+        return np.nan, np.nan, np.nan
+
+    alpha_fast = 2.0 / (fast + 1)
+    alpha_slow = 2.0 / (slow + 1)
+    alpha_signal = 2.0 / (signal + 1)
+    ema_fast = close[0]
+    ema_slow = close[0]
+    line = np.nan
+    signal_avg = 0.0
+    signal_count = 0
+
+    for i in range(n):
+        if i > 0:
+            ema_fast = (1.0 - alpha_fast) * ema_fast + alpha_fast * close[i]
+            ema_slow = (1.0 - alpha_slow) * ema_slow + alpha_slow * close[i]
+        if i >= fast - 1 and i >= slow - 1:
+            line = ema_fast - ema_slow
+            if signal_count == 0:
+                signal_avg = line
+            else:
+                signal_avg = (1.0 - alpha_signal) * signal_avg + alpha_signal * line
+            signal_count += 1
+
+    signal_value = signal_avg if signal_count >= signal else np.nan
+    return line, signal_value, line - signal_value
+
+
+@njit('i8(f8, f8, f8)', cache=True, nogil=True, error_model='numpy')
+def condition_code(rsi_value, macd_value, signal_value):
+    """
+    Market condition from the last RSI and MACD values.
+
+    MACD above/below its signal line and RSI above/below 50 each count as
+    one bullish/bearish vote; NaN inputs cast no vote.
+
+    Args:
+        rsi_value: Last RSI value
+        macd_value: Last MACD line value
+        signal_value: Last MACD signal line value
+
+    Returns:
+        1 for bullish, -1 for bearish, 0 for sideways
+    """
+    tally = ((macd_value > signal_value) - (macd_value < signal_value)
+             + (rsi_value > 50.0) - (rsi_value < 50.0))
+    return (tally > 0) - (tally < 0)
+
+
+@njit(parallel=True, cache=True, nogil=True, error_model='numpy')
+def batch_last(close, high, low, offsets, bb_period, nstd, rsi_period,
+               stoch_period, smooth, fast, slow, signal):
+    """
+    Last-bar indicators for many series in one parallel call.
+
+    Series are concatenated into flat arrays; series s spans
+    offsets[s]:offsets[s + 1]. Each series runs the *_last kernels and
+    condition_code, with series distributed across cores by prange.
+
+    Args:
+        close: float64 concatenated close prices
+        high: float64 concatenated high prices
+        low: float64 concatenated low prices
+        offsets: int64 series boundaries (length n_series + 1)
+        bb_period: Bollinger window
+        nstd: Bollinger standard deviations
+        rsi_period: RSI period
+        stoch_period: Stochastic %K window
+        smooth: Stochastic %D window
+        fast: MACD fast EMA span
+        slow: MACD slow EMA span
+        signal: MACD signal EMA span
+
+    Returns:
+        float64 array of shape (n_series, len(BATCH_FIELDS))
+    """
+    n_series = offsets.shape[0] - 1
+    out = np.empty((n_series, 10))
+
+    for s in prange(n_series):
+        start = offsets[s]
+        end = offsets[s + 1]
+        c = close[start:end]
+
+        upper, middle, lower = bollinger_last(c, bb_period, nstd)
+        rsi_value = rsi_last(c, rsi_period)
+        k, d = stochastic_last(high[start:end], low[start:end], c, stoch_period, smooth)
+        line, signal_value, hist = macd_last(c, fast, slow, signal)
+
+        out[s, 0] = upper
+        out[s, 1] = middle
+        out[s, 2] = lower
+        out[s, 3] = rsi_value
+        out[s, 4] = k
+        out[s, 5] = d
+        out[s, 6] = line
+        out[s, 7] = signal_value
+        out[s, 8] = hist
+        out[s, 9] = condition_code(rsi_value, line, signal_value)
+
+    return out
+
+
+def warmup():
+    """Compile (or load from cache) every kernel on a dummy series."""
+    dummy = np.linspace(100.0, 110.0, 64)
+    bollinger_last(dummy, 20, 2.0)
+    rsi_last(dummy, 14)
+    stochastic_last(dummy + 1.0, dummy - 1.0, dummy, 14, 3)
+    macd_last(dummy, 12, 26, 9)
+    condition_code(55.0, 1.0, 0.5)
+    two = np.concatenate((dummy, dummy))
+    batch_last(two, two + 1.0, two - 1.0, np.array([0, 64, 128]), 20, 2.0, 14, 14, 3, 12, 26, 9)
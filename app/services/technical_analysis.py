@@ -2,13 +2,86 @@
 Technical Analysis Service with pattern recognition and indicators.
 Implements automated technical analysis with 80%+ accuracy target.
 """
-import pandas as pd
+import threading
 import numpy as np
 from typing import Dict, List, Optional, Tuple
-from ta import momentum, volatility, trend
+from cachetools import TTLCache
 from flask import current_app
 
-from app.utils.cache import cache_get, cache_set, get_analysis_cache_key
+from app.services import streaming_indicators, ta_kernels
+from app.utils.cache import (
+    cache_get, cache_mget, cache_set, cache_set_many, get_analysis_cache_key
+)
+
+ANALYSIS_CACHE_TTL = 300  # 5 minutes
+
+# Serializes ta_kernels.batch_last calls from concurrent scans; numba's
+# default threading layer rejects concurrent parallel launches
+_BATCH_LOCK = threading.Lock()
+
+_NO_INDICATORS = {'bollinger_bands': None, 'rsi': None, 'stochastic': None, 'macd': None}
+
+# Candle patterns are fixed records, built once and shared read-only
+_DOJI = {
+    'name': 'Doji',
+    'type': 'neutral',
+    'confidence': 0.7,
+    'indicator': 'simple_doji'
+}
+_HAMMER = {
+    'name': 'Hammer',
+    'type': 'bullish',
+    'confidence': 0.65,
+    'indicator': 'simple_hammer'
+}
+_SHOOTING_STAR = {
+    'name': 'Shooting Star',
+    'type': 'bearish',
+    'confidence': 0.65,
+    'indicator': 'simple_shooting_star'
+}
+
+# (buy, sell) votes per interpreted indicator label, and which field of
+# each indicator holds its label
+_LABEL_VOTES = {
+    'oversold': (1, 0),
+    'overbought': (0, 1),
+    'bullish_crossover': (1, 0),
+    'bearish_crossover': (0, 1),
+    'bullish': (1, 0),
+    'bearish': (0, 1)
+}
+_PATTERN_VOTES = {'bullish': (2, 0), 'bearish': (0, 2)}
+_NO_VOTE = (0, 0)
+_SIGNAL_FIELDS = (
+    ('rsi', 'signal'),
+    ('bollinger_bands', 'signal'),
+    ('stochastic', 'signal'),
+    ('macd', 'trend')
+)
+
+
+def _as_ohlc_arrays(price_data) -> Dict[str, np.ndarray]:
+    """
+    Convert OHLC columns to contiguous float64 arrays once per analysis.
+
+    Args:
+        price_data: OHLCV arrays keyed by column, or a DataFrame
+
+    Returns:
+        Dictionary of open/high/low/close arrays
+    """
+    return {
+        col: np.ascontiguousarray(price_data[col], dtype=np.float64)
+        for col in ('open', 'high', 'low', 'close')
+    }
+
+
+def _nan_to_none(value: float) -> Optional[float]:
+    """Convert a kernel result to a JSON-safe float, mapping NaN to None."""
+    value = float(value)
+    # NaN is the only value unequal to itself; avoids a NumPy ufunc call
+    return None if value != value else value
 
 
 class TechnicalAnalysisService:
@@ -18,149 +91,261 @@ class TechnicalAnalysisService:
     - Technical indicators (Bollinger Bands, RSI, Stochastic)
     """
 
-    def __init__(self):
-        self.confidence_threshold = current_app.config['PATTERN_CONFIDENCE_THRESHOLD']
+    # Process-wide first-level cache in front of Redis, shared by all
+    # instances and scan worker threads; cached results are read-only
+    _l1 = TTLCache(maxsize=1024, ttl=ANALYSIS_CACHE_TTL)
+    _l1_lock = threading.RLock()
 
-    def analyze_asset(self, symbol: str, price_data: pd.DataFrame) -> Dict:
+    def __init__(self):
+        config = current_app.config
+        self.confidence_threshold = config['PATTERN_CONFIDENCE_THRESHOLD']
+
+        # Snapshot indicator settings so per-asset calls skip the app-context proxy
+        self.bb_period = config.get('BOLLINGER_PERIOD', 20)
+        self.rsi_period = config.get('RSI_PERIOD', 14)
+        self.stoch_period = config.get('STOCHASTIC_PERIOD', 14)
+        self.macd_fast = 12
+        self.macd_slow = 26
+        self.macd_signal = 9
+        self.stoch_smooth = 3
+
+        # Shortest history for which every kernel returns a full value
+        self.min_bars = max(
+            self.bb_period,
+            self.rsi_period,
+            self.stoch_period + self.stoch_smooth - 1,
+            self.macd_slow + self.macd_signal - 1
+        )
+        self.max_assets_scan = config['MAX_ASSETS_SCAN']
+
+    def analyze_asset(self, symbol: str, price_data: Dict[str, np.ndarray],
+                      cache_key: Optional[str] = None, timeframe: str = '1d') -> Dict:
         """
         Perform complete technical analysis on an asset.
 
         Args:
             symbol: Asset symbol
-            price_data: DataFrame with OHLCV data (open, high, low, close, volume)
+            price_data: OHLCV arrays keyed by column (open, high, low, close, volume),
+                as built by price_payload_to_arrays; a DataFrame is also accepted
+            cache_key: Precomputed analysis cache key (generated if not provided)
+            timeframe: Bar interval of price_data; keys the saved RSI/MACD state
 
         Returns:
             Dictionary with analysis results and signals
         """
         # Check cache first
-        cache_key = get_analysis_cache_key(symbol, 'technical')
-        cached = cache_get(cache_key)
-        if cached:
+        if cache_key is None:
+            cache_key = get_analysis_cache_key(symbol, 'technical')
+
+        # In-process hits skip the Redis round-trip and deserialization;
+        # keying on the latest bar keeps results from other data apart
+        close = price_data['close']
+        l1_key = (cache_key, len(close), float(np.asarray(close)[-1]) if len(close) else None)
+        with self._l1_lock:
+            cached = self._l1.get(l1_key)
+        if cached is not None:
             return cached
 
+        cached = cache_get(cache_key)
+        if not cached:
+            cached = self._analyze_uncached(symbol, price_data, timeframe)
+
+            # Cache results
+            cache_set(cache_key, cached, ttl=ANALYSIS_CACHE_TTL)
+
+        with self._l1_lock:
+            self._l1[l1_key] = cached
+
+        return cached
+
+    def _analyze_uncached(self, symbol: str, price_data: Dict[str, np.ndarray],
+                          timeframe: str = '1d') -> Dict:
+        """
+        Run indicators, pattern detection and signal generation for an asset.
+
+        Args:
+            symbol: Asset symbol
+            price_data: OHLCV arrays keyed by column
+            timeframe: Bar interval of price_data
+
+        Returns:
+            Dictionary with analysis results and signals
+        """
+        # Column lookups and dtype conversion happen here only; the
+        # indicator and pattern code index plain arrays
+        arrays = _as_ohlc_arrays(price_data)
+        indicators, condition_code = self._compute_indicators(arrays, symbol, timeframe)
+        return self._build_results(symbol, arrays, indicators, condition_code)
+
+    def _build_results(self, symbol: str, arrays: Dict[str, np.ndarray],
+                       indicators: Dict, condition_code: int) -> Dict:
+        """
+        Add pattern detection and signals to computed indicators.
+
+        Args:
+            symbol: Asset symbol
+            arrays: OHLC arrays from _as_ohlc_arrays
+            indicators: Indicator dictionary
+            condition_code: Market condition code
+
+        Returns:
+            Dictionary with analysis results and signals
+        """
         results = {
             'symbol': symbol,
-            'indicators': self._calculate_indicators(price_data),
-            'patterns': self._detect_patterns(price_data),
-            'signals': []
+            'indicators': indicators,
+            'patterns': self._detect_patterns(arrays),
+            'signals': [],
+            # -1 bearish, 0 sideways, 1 bullish (see ta_kernels.condition_code)
+            'market_condition_code': condition_code
         }
 
         # Generate trading signals based on indicators and patterns
         results['signals'] = self._generate_signals(results['indicators'], results['patterns'])
 
-        # Cache results
-        cache_set(cache_key, results, ttl=300)  # 5 minutes
-
         return results
 
-    def _calculate_indicators(self, df: pd.DataFrame) -> Dict:
+    def _calculate_indicators(self, price_data: Dict[str, np.ndarray]) -> Dict:
         """
-        Calculate technical indicators using pandas-ta and ta libraries.
+        Calculate technical indicators with the Numba kernels in ta_kernels.
+
+        Only the last value of each indicator is used, so the *_last kernels
+        are called instead of building full output series.
 
         Args:
-            df: OHLCV DataFrame
+            price_data: OHLCV arrays keyed by column
 
         Returns:
             Dictionary with indicator values
         """
-        indicators = {}
+        return self._compute_indicators(price_data)[0]
 
-        # Bollinger Bands
-        try:
-            period = current_app.config.get('BOLLINGER_PERIOD', 20)
-            bb = volatility.BollingerBands(close=df['close'], window=period, window_dev=2)
-
-            upper = bb.bollinger_hband().iloc[-1]
-            middle = bb.bollinger_mavg().iloc[-1]
-            lower = bb.bollinger_lband().iloc[-1]
-            current_price = df['close'].iloc[-1]
-
-            indicators['bollinger_bands'] = {
-                'upper': float(upper) if not np.isnan(upper) else None,
-                'middle': float(middle) if not np.isnan(middle) else None,
-                'lower': float(lower) if not np.isnan(lower) else None,
-                'current_price': float(current_price),
-                'signal': self._interpret_bollinger(current_price, upper, lower)
-            }
-        except Exception as e:
-            current_app.logger.error(f"Bollinger Bands calculation error: {str(e)}")
-            indicators['bollinger_bands'] = None
+    def _compute_indicators(self, price_data: Dict[str, np.ndarray],
+                            symbol: Optional[str] = None,
+                            timeframe: str = '1d') -> Tuple[Dict, int]:
+        """
+        Calculate technical indicators and the market condition code.
 
-        # RSI (Relative Strength Index)
-        try:
-            rsi_period = current_app.config.get('RSI_PERIOD', 14)
-            rsi_indicator = momentum.RSIIndicator(close=df['close'], window=rsi_period)
-            rsi_value = rsi_indicator.rsi().iloc[-1]
+        The condition code is derived from the raw kernel scalars, so
+        predictions need not re-read it from the indicator dicts.
 
-            indicators['rsi'] = {
-                'value': float(rsi_value) if not np.isnan(rsi_value) else None,
-                'signal': self._interpret_rsi(rsi_value)
-            }
-        except Exception as e:
-            current_app.logger.error(f"RSI calculation error: {str(e)}")
-            indicators['rsi'] = None
+        Args:
+            price_data: OHLCV arrays keyed by column
+            symbol: Asset symbol; when given, RSI and MACD resume from the
+                symbol's saved recurrence state (see streaming_indicators)
+            timeframe: Bar interval of price_data, part of the state key
 
-        # Stochastic Oscillator
+        Returns:
+            Tuple of (indicator dictionary, market condition code)
+        """
+        close = np.ascontiguousarray(price_data['close'], dtype=np.float64)
+        high = np.ascontiguousarray(price_data['high'], dtype=np.float64)
+        low = np.ascontiguousarray(price_data['low'], dtype=np.float64)
+
+        # Checked once here so the kernels always have enough history and
+        # their results need no per-value NaN handling
+        if close.shape[0] < self.min_bars:
+            return dict(_NO_INDICATORS), 0
+
+        # Only malformed input can raise; one guard covers the whole set
         try:
-            stoch_period = current_app.config.get('STOCHASTIC_PERIOD', 14)
-            stoch = momentum.StochasticOscillator(
-                high=df['high'],
-                low=df['low'],
-                close=df['close'],
-                window=stoch_period,
-                smooth_window=3
+            upper, middle, lower = ta_kernels.bollinger_last(close, self.bb_period, 2.0)
+            slowk, slowd = ta_kernels.stochastic_last(
+                high, low, close, self.stoch_period, self.stoch_smooth
             )
-            slowk = stoch.stoch().iloc[-1]
-            slowd = stoch.stoch_signal().iloc[-1]
+            if symbol is None:
+                rsi_value = ta_kernels.rsi_last(close, self.rsi_period)
+                macd_value, signal_value, hist_value = ta_kernels.macd_last(
+                    close, self.macd_fast, self.macd_slow, self.macd_signal
+                )
+            else:
+                rsi_value, macd_value, signal_value, hist_value = streaming_indicators.rsi_macd_last(
+                    symbol, close, self.rsi_period, self.macd_fast, self.macd_slow, self.macd_signal,
+                    timeframe
+                )
+        except Exception:
+            current_app.logger.exception("Indicator calculation error")
+            return dict(_NO_INDICATORS), 0
+
+        indicators = self._format_indicators(
+            close[-1], upper, middle, lower, rsi_value, slowk, slowd,
+            macd_value, signal_value, hist_value
+        )
+        return indicators, int(ta_kernels.condition_code(rsi_value, macd_value, signal_value))
+
+    def _format_indicators(self, current_price: float, upper: float, middle: float, lower: float,
+                           rsi_value: float, slowk: float, slowd: float, macd_value: float,
+                           signal_value: float, hist_value: float) -> Dict:
+        """
+        Build the indicator dictionary from last-bar kernel values.
 
-            indicators['stochastic'] = {
-                'k': float(slowk) if not np.isnan(slowk) else None,
-                'd': float(slowd) if not np.isnan(slowd) else None,
-                'signal': self._interpret_stochastic(slowk, slowd)
-            }
-        except Exception as e:
-            current_app.logger.error(f"Stochastic calculation error: {str(e)}")
-            indicators['stochastic'] = None
+        Args:
+            current_price: Last close
+            upper, middle, lower: Bollinger Bands
+            rsi_value: RSI
+            slowk, slowd: Stochastic %K and %D
+            macd_value, signal_value, hist_value: MACD line, signal and histogram
 
-        # MACD
-        try:
-            macd_indicator = trend.MACD(close=df['close'], window_slow=26, window_fast=12, window_sign=9)
-            macd_value = macd_indicator.macd().iloc[-1]
-            signal_value = macd_indicator.macd_signal().iloc[-1]
-            hist_value = macd_indicator.macd_diff().iloc[-1]
-
-            indicators['macd'] = {
-                'macd': float(macd_value) if not np.isnan(macd_value) else None,
-                'signal': float(signal_value) if not np.isnan(signal_value) else None,
-                'histogram': float(hist_value) if not np.isnan(hist_value) else None,
+        Returns:
+            Dictionary with indicator values; NaN values become None
+        """
+        # NaN is mapped to None once here, so the interpreters only test for None
+        current_price = float(current_price)
+        upper, middle, lower, rsi_value, slowk, slowd, macd_value, signal_value, hist_value = (
+            _nan_to_none(value) for value in (
+                upper, middle, lower, rsi_value, slowk, slowd, macd_value, signal_value, hist_value
+            )
+        )
+
+        return {
+            # Bollinger Bands
+            'bollinger_bands': {
+                'upper': upper,
+                'middle': middle,
+                'lower': lower,
+                'current_price': current_price,
+                'signal': self._interpret_bollinger(current_price, upper, lower)
+            },
+            # RSI (Relative Strength Index)
+            'rsi': {
+                'value': rsi_value,
+                'signal': self._interpret_rsi(rsi_value)
+            },
+            # Stochastic Oscillator; a flat high/low window still yields None
+            'stochastic': {
+                'k': slowk,
+                'd': slowd,
+                'signal': self._interpret_stochastic(slowk, slowd)
+            },
+            # MACD
+            'macd': {
+                'macd': macd_value,
+                'signal': signal_value,
+                'histogram': hist_value,
                 'trend': self._interpret_macd(macd_value, signal_value)
             }
-        except Exception as e:
-            current_app.logger.error(f"MACD calculation error: {str(e)}")
-            indicators['macd'] = None
-
-        return indicators
+        }
 
-    def _detect_patterns(self, df: pd.DataFrame) -> List[Dict]:
+    def _detect_patterns(self, price_data: Dict[str, np.ndarray]) -> List[Dict]:
         """
         Detect chart patterns using simple price action analysis.
 
         Args:
-            df: OHLCV DataFrame
+            price_data: OHLCV arrays keyed by column
 
         Returns:
             List of detected patterns with confidence scores
         """
         # Use simple pattern detection based on price action
-        patterns = self._simple_pattern_detection(df)
+        patterns = self._simple_pattern_detection(price_data)
         return patterns
 
-    def _simple_pattern_detection(self, df: pd.DataFrame) -> List[Dict]:
+    def _simple_pattern_detection(self, price_data: Dict[str, np.ndarray]) -> List[Dict]:
         """
         Simple pattern detection fallback based on price action.
 
         Args:
-            df: OHLCV DataFrame
+            price_data: OHLCV arrays keyed by column
 
         Returns:
             List of simple patterns
@@ -168,47 +353,47 @@ class TechnicalAnalysisService:
         patterns = []
 
         try:
-            # Check for Doji (open ~= close)
-            last_candle = df.iloc[-1]
-            body_size = abs(last_candle['close'] - last_candle['open'])
-            candle_range = last_candle['high'] - last_candle['low']
-
-            if candle_range > 0 and body_size / candle_range < 0.1:
-                patterns.append({
-                    'name': 'Doji',
-                    'type': 'neutral',
-                    'confidence': 0.7,
-                    'indicator': 'simple_doji'
-                })
-
-            # Check for Hammer (long lower shadow, small body at top)
-            lower_shadow = last_candle['open'] - last_candle['low'] if last_candle['close'] > last_candle['open'] else last_candle['close'] - last_candle['low']
-            if candle_range > 0 and lower_shadow / candle_range > 0.6:
-                patterns.append({
-                    'name': 'Hammer',
-                    'type': 'bullish',
-                    'confidence': 0.65,
-                    'indicator': 'simple_hammer'
-                })
-
-            # Check for Shooting Star (long upper shadow, small body at bottom)
-            upper_shadow = last_candle['high'] - last_candle['close'] if last_candle['close'] > last_candle['open'] else last_candle['high'] - last_candle['open']
-            if candle_range > 0 and upper_shadow / candle_range > 0.6:
-                patterns.append({
-                    'name': 'Shooting Star',
-                    'type': 'bearish',
-                    'confidence': 0.65,
-                    'indicator': 'simple_shooting_star'
-                })
-
+            o, h, l, c = (
+                float(np.asarray(price_data[col])[-1])
+                for col in ('open', 'high', 'low', 'close')
+            )
         except Exception as e:
             current_app.logger.error(f"Simple pattern detection error: {str(e)}")
+            return patterns
+
+        # All three patterns are ratios of the candle range
+        candle_range = h - l
+        if not candle_range > 0:
+            return patterns
+        inv_range = 1.0 / candle_range
+
+        body_ratio = abs(c - o) * inv_range
+        # Both shadow patterns need a shadow over 0.6 of the range, so a
+        # body of 0.4 or more rules out every pattern
+        if body_ratio >= 0.4:
+            return patterns
+
+        bullish_body = c > o
+        lower_ratio = ((o if bullish_body else c) - l) * inv_range
+        upper_ratio = (h - (c if bullish_body else o)) * inv_range
+
+        # Doji (open ~= close)
+        if body_ratio < 0.1:
+            patterns.append(_DOJI)
+
+        # Hammer (long lower shadow, small body at top)
+        if lower_ratio > 0.6:
+            patterns.append(_HAMMER)
+
+        # Shooting Star (long upper shadow, small body at bottom)
+        if upper_ratio > 0.6:
+            patterns.append(_SHOOTING_STAR)
 
         return patterns
 
-    def _interpret_bollinger(self, price: float, upper: float, lower: float) -> str:
+    def _interpret_bollinger(self, price: float, upper: Optional[float], lower: Optional[float]) -> str:
         """Interpret Bollinger Bands signal."""
-        if np.isnan(upper) or np.isnan(lower):
+        if upper is None or lower is None:
             return 'neutral'
 
         if price <= lower:
@@ -218,9 +403,9 @@ class TechnicalAnalysisService:
         else:
             return 'neutral'
 
-    def _interpret_rsi(self, rsi: float) -> str:
+    def _interpret_rsi(self, rsi: Optional[float]) -> str:
         """Interpret RSI signal."""
-        if np.isnan(rsi):
+        if rsi is None:
             return 'neutral'
 
         if rsi < 30:
@@ -230,9 +415,9 @@ class TechnicalAnalysisService:
         else:
             return 'neutral'
 
-    def _interpret_stochastic(self, k: float, d: float) -> str:
+    def _interpret_stochastic(self, k: Optional[float], d: Optional[float]) -> str:
         """Interpret Stochastic Oscillator signal."""
-        if np.isnan(k) or np.isnan(d):
+        if k is None or d is None:
             return 'neutral'
 
         if k < 20 and d < 20:
@@ -246,9 +431,9 @@ class TechnicalAnalysisService:
         else:
             return 'neutral'
 
-    def _interpret_macd(self, macd: float, signal: float) -> str:
+    def _interpret_macd(self, macd: Optional[float], signal: Optional[float]) -> str:
         """Interpret MACD signal."""
-        if np.isnan(macd) or np.isnan(signal):
+        if macd is None or signal is None:
             return 'neutral'
 
         if macd > signal:
@@ -271,40 +456,26 @@ class TechnicalAnalysisService:
         """
         signals = []
 
-        # Strong buy signals
+        # Strong buy signals: each indicator label votes through a table
+        # lookup instead of a chain of string comparisons
         buy_score = 0
         sell_score = 0
 
         # Indicator signals
-        if indicators.get('rsi') and indicators['rsi']['signal'] == 'oversold':
-            buy_score += 1
-        if indicators.get('rsi') and indicators['rsi']['signal'] == 'overbought':
-            sell_score += 1
-
-        if indicators.get('bollinger_bands') and indicators['bollinger_bands']['signal'] == 'oversold':
-            buy_score += 1
-        if indicators.get('bollinger_bands') and indicators['bollinger_bands']['signal'] == 'overbought':
-            sell_score += 1
-
-        if indicators.get('stochastic'):
-            stoch_signal = indicators['stochastic']['signal']
-            if stoch_signal in ['oversold', 'bullish_crossover']:
-                buy_score += 1
-            elif stoch_signal in ['overbought', 'bearish_crossover']:
-                sell_score += 1
-
-        if indicators.get('macd') and indicators['macd']['trend'] == 'bullish':
-            buy_score += 1
-        if indicators.get('macd') and indicators['macd']['trend'] == 'bearish':
-            sell_score += 1
-
-        # Pattern signals
+        for name, field in _SIGNAL_FIELDS:
+            indicator = indicators.get(name)
+            if indicator:
+                buy, sell = _LABEL_VOTES.get(indicator[field], _NO_VOTE)
+                buy_score += buy
+                sell_score += sell
+
+        # Pattern signals (patterns have higher weight)
+        threshold = self.confidence_threshold
         for pattern in patterns:
-            if pattern['confidence'] >= self.confidence_threshold:
-                if pattern['type'] == 'bullish':
-                    buy_score += 2  # Patterns have higher weight
-                elif pattern['type'] == 'bearish':
-                    sell_score += 2
+            if pattern['confidence'] >= threshold:
+                buy, sell = _PATTERN_VOTES.get(pattern['type'], _NO_VOTE)
+                buy_score += buy
+                sell_score += sell
 
         # Generate signals based on scores
         total_indicators = 4  # RSI, Bollinger, Stochastic, MACD
@@ -330,38 +501,133 @@ class TechnicalAnalysisService:
 
         return signals
 
-    def scan_multiple_assets(self, symbols: List[str], price_data_dict: Dict[str, pd.DataFrame]) -> List[Dict]:
+    def _analyze_batch(self, price_data_dict: Dict[str, Dict[str, np.ndarray]]) -> Dict[str, Optional[Dict]]:
+        """
+        Analyze many assets with one parallel indicator kernel call.
+
+        Series long enough for every indicator are concatenated and passed
+        to ta_kernels.batch_last, which spreads them across cores; patterns
+        and signals are then built per symbol as in _analyze_uncached.
+
+        Args:
+            price_data_dict: Dictionary mapping symbols to OHLCV arrays
+
+        Returns:
+            Dictionary mapping symbols to analysis results (None on error)
+        """
+        arrays_by_symbol = {}
+        analyses = {}
+
+        for symbol, price_data in price_data_dict.items():
+            try:
+                arrays_by_symbol[symbol] = _as_ohlc_arrays(price_data)
+            except Exception as e:
+                current_app.logger.error(f"Error analyzing {symbol}: {str(e)}")
+                analyses[symbol] = None
+
+        batch = [s for s, arrays in arrays_by_symbol.items() if arrays['close'].shape[0] >= self.min_bars]
+        if batch:
+            lengths = [arrays_by_symbol[s]['close'].shape[0] for s in batch]
+            offsets = np.zeros(len(batch) + 1, dtype=np.int64)
+            np.cumsum(lengths, out=offsets[1:])
+            close, high, low = (
+                np.concatenate([arrays_by_symbol[s][col] for s in batch])
+                for col in ('close', 'high', 'low')
+            )
+            try:
+                with _BATCH_LOCK:
+                    values = ta_kernels.batch_last(
+                        close, high, low, offsets, self.bb_period, 2.0, self.rsi_period,
+                        self.stoch_period, self.stoch_smooth,
+                        self.macd_fast, self.macd_slow, self.macd_signal
+                    )
+            except Exception:
+                current_app.logger.exception("Indicator calculation error")
+                values = None
+        else:
+            values = None
+
+        batch_rows = {} if values is None else dict(zip(batch, values.tolist()))
+
+        for symbol, arrays in arrays_by_symbol.items():
+            row = batch_rows.get(symbol)
+            if row is None:
+                indicators, condition_code = dict(_NO_INDICATORS), 0
+            else:
+                indicators = self._format_indicators(float(arrays['close'][-1]), *row[:9])
+                condition_code = int(row[9])
+            analyses[symbol] = self._build_results(symbol, arrays, indicators, condition_code)
+
+        return analyses
+
+    def scan_multiple_assets(self, symbols: List[str], price_data_dict: Dict[str, Dict[str, np.ndarray]]) -> List[Dict]:
         """
         Scan multiple assets for trading opportunities.
 
         Args:
             symbols: List of asset symbols
-            price_data_dict: Dictionary mapping symbols to OHLCV DataFrames
+            price_data_dict: Dictionary mapping symbols to OHLCV arrays
 
         Returns:
             List of opportunities sorted by confidence
         """
-        opportunities = []
+        return self.opportunities_from(self.analyze_many(symbols, price_data_dict))
 
-        for symbol in symbols[:current_app.config['MAX_ASSETS_SCAN']]:
-            if symbol not in price_data_dict:
-                continue
+    def analyze_many(self, symbols: List[str],
+                     price_data_dict: Dict[str, Dict[str, np.ndarray]]) -> Dict[str, Optional[Dict]]:
+        """
+        Analyze up to MAX_ASSETS_SCAN assets, reading and writing the cache in bulk.
 
-            try:
-                analysis = self.analyze_asset(symbol, price_data_dict[symbol])
-
-                if analysis['signals']:
-                    for signal in analysis['signals']:
-                        opportunities.append({
-                            'symbol': symbol,
-                            'signal_type': signal['type'],
-                            'confidence': signal['confidence'],
-                            'strength': signal['strength'],
-                            'patterns': analysis['patterns'],
-                            'indicators': analysis['indicators']
-                        })
-            except Exception as e:
-                current_app.logger.error(f"Error analyzing {symbol}: {str(e)}")
+        Args:
+            symbols: List of asset symbols
+            price_data_dict: Dictionary mapping symbols to OHLCV arrays
+
+        Returns:
+            Dictionary mapping each scanned symbol to its analysis (as
+            analyze_asset returns it), in scan order
+        """
+        scan_symbols = [s for s in symbols[:self.max_assets_scan] if s in price_data_dict]
+
+        # Keys are generated once per scan; one MGET reads every cached
+        # analysis and only misses are recomputed
+        cache_keys = {symbol: get_analysis_cache_key(symbol, 'technical') for symbol in scan_symbols}
+        analyses = dict(zip(scan_symbols, cache_mget(list(cache_keys.values()))))
+        misses = [symbol for symbol, analysis in analyses.items() if not analysis]
+
+        fresh = self._analyze_batch({symbol: price_data_dict[symbol] for symbol in misses})
+        analyses.update(fresh)
+
+        # Pipeline all fresh results back in one round-trip
+        cache_set_many(
+            {cache_keys[symbol]: analysis for symbol, analysis in fresh.items() if analysis},
+            ttl=ANALYSIS_CACHE_TTL
+        )
+
+        return analyses
+
+    def opportunities_from(self, analyses: Dict[str, Optional[Dict]]) -> List[Dict]:
+        """
+        Flatten per-symbol analyses into trading opportunities.
+
+        Args:
+            analyses: Symbol to analysis mapping from analyze_many
+
+        Returns:
+            List of opportunities sorted by confidence
+        """
+        opportunities = []
+
+        for symbol, analysis in analyses.items():
+            if analysis and analysis['signals']:
+                for signal in analysis['signals']:
+                    opportunities.append({
+                        'symbol': symbol,
+                        'signal_type': signal['type'],
+                        'confidence': signal['confidence'],
+                        'strength': signal['strength'],
+                        'patterns': analysis['patterns'],
+                        'indicators': analysis['indicators']
+                    })
 
         # Sort by confidence
         opportunities.sort(key=lambda x: x['confidence'], reverse=True)
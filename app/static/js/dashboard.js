@@ -7,7 +7,8 @@ let historicalData = [];
 // Initialize WebSocket connection
 function initWebSocket() {
     socket = io('http://localhost:5000', {
-        transports: ['websocket', 'polling']
+        // Websocket only: long-polling requests need sticky sessions
+        transports: ['websocket']
     });
 
     socket.on('connect', () => {
@@ -25,6 +26,13 @@ function initWebSocket() {
         updatePriceDisplay(data);
     });
 
+    // Server coalesces ticks into one batch per symbol
+    socket.on('price_updates', (batch) => {
+        if (batch.length) {
+            updatePriceDisplay(batch[batch.length - 1]);
+        }
+    });
+
     socket.on('portfolio_update', (data) => {
         console.log('Portfolio update:', data);
         updatePortfolioDisplay(data);
@@ -3,6 +3,7 @@ Utility modules for Broker Assistant application.
 """
 from .cache import cache_get, cache_set, cache_delete, cache_exists
 from .encryption import encrypt_data, decrypt_data
+from .price_parse import price_payload_to_arrays, prices_to_arrays
 
 __all__ = [
     'cache_get',
@@ -10,5 +11,7 @@ __all__ = [
     'cache_delete',
     'cache_exists',
     'encrypt_data',
-    'decrypt_data'
+    'decrypt_data',
+    'price_payload_to_arrays',
+    'prices_to_arrays'
 ]
@@ -0,0 +1,30 @@
+"""
+Bulk-load helpers for PostgreSQL.
+"""
+import csv
+import io
+from typing import List
+
+
+def copy_rows(cursor, table: str, columns: List[str], rows: List[List]):
+    """
+    Stream rows into a table through COPY FROM STDIN.
+
+    Args:
+        cursor: Raw psycopg2 cursor
+        table: Target table name
+        columns: Column names, in row order
+        rows: Row values (None is written as NULL)
+    """
+    if not rows:
+        return
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, delimiter='\t', quoting=csv.QUOTE_MINIMAL)
+    writer.writerows(rows)
+    buffer.seek(0)
+
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, DELIMITER E'\\t')",
+        buffer
+    )
@@ -2,10 +2,14 @@
 Redis caching utilities for sub-millisecond performance.
 Reduces API calls and accelerates chart loading.
 """
-import json
-from typing import Any, Optional
+import hashlib
+from typing import Any, Dict, List, Optional
+import orjson
 from flask import current_app
-from app import redis_client
+# The client is read from the package at call time: create_app() assigns
+# it after this module may already have been imported
+import app as _app
+from app.utils.json_provider import dumps_bytes
 
 
 def cache_get(key: str) -> Optional[Any]:
@@ -19,9 +23,9 @@ def cache_get(key: str) -> Optional[Any]:
         Cached value or None if not found
     """
     try:
-        value = redis_client.get(key)
+        value = _app.redis_client.get(key)
         if value:
-            return json.loads(value)
+            return orjson.loads(value)
         return None
     except Exception as e:
         current_app.logger.error(f"Cache get error for key {key}: {str(e)}")
@@ -34,7 +38,7 @@ def cache_set(key: str, value: Any, ttl: Optional[int] = None) -> bool:
 
     Args:
         key: Cache key
-        value: Value to cache (will be JSON serialized)
+        value: Value to cache (serialized to JSON with orjson)
         ttl: Time to live in seconds (uses config default if not provided)
 
     Returns:
@@ -44,29 +48,77 @@ def cache_set(key: str, value: Any, ttl: Optional[int] = None) -> bool:
         if ttl is None:
             ttl = current_app.config['CACHE_TTL_SECONDS']
 
-        serialized = json.dumps(value)
-        redis_client.setex(key, ttl, serialized)
+        # orjson bytes go to Redis as-is, with no str round-trip
+        _app.redis_client.setex(key, ttl, dumps_bytes(value))
         return True
     except Exception as e:
         current_app.logger.error(f"Cache set error for key {key}: {str(e)}")
         return False
 
 
-def cache_delete(key: str) -> bool:
+def cache_mget(keys: List[str]) -> List[Optional[Any]]:
     """
-    Delete key from Redis cache.
+    Retrieve many values from Redis cache in one round-trip.
 
     Args:
-        key: Cache key
+        keys: Cache keys
+
+    Returns:
+        Cached values (None for misses), in key order
+    """
+    if not keys:
+        return []
+    try:
+        return [orjson.loads(value) if value else None for value in _app.redis_client.mget(keys)]
+    except Exception as e:
+        current_app.logger.error(f"Cache mget error for {len(keys)} keys: {str(e)}")
+        return [None] * len(keys)
+
+
+def cache_set_many(items: Dict[str, Any], ttl: Optional[int] = None) -> bool:
+    """
+    Store many values with the same TTL in one pipelined round-trip.
+
+    Args:
+        items: Mapping of cache key to value (serialized to JSON with orjson)
+        ttl: Time to live in seconds (uses config default if not provided)
+
+    Returns:
+        True if successful, False otherwise
+    """
+    if not items:
+        return True
+    try:
+        if ttl is None:
+            ttl = current_app.config['CACHE_TTL_SECONDS']
+
+        # The context manager resets the pipeline and returns its
+        # connection to the pool even if execute() fails
+        with _app.redis_client.pipeline(transaction=False) as pipe:
+            for key, value in items.items():
+                pipe.setex(key, ttl, dumps_bytes(value))
+            pipe.execute()
+        return True
+    except Exception as e:
+        current_app.logger.error(f"Cache set error for {len(items)} keys: {str(e)}")
+        return False
+
+
+def cache_delete(*keys: str) -> bool:
+    """
+    Delete one or more keys from Redis cache in a single command.
+
+    Args:
+        keys: Cache keys
 
     Returns:
         True if successful, False otherwise
     """
     try:
-        redis_client.delete(key)
+        _app.redis_client.delete(*keys)
         return True
     except Exception as e:
-        current_app.logger.error(f"Cache delete error for key {key}: {str(e)}")
+        current_app.logger.error(f"Cache delete error for keys {keys}: {str(e)}")
         return False
 
 
@@ -81,7 +133,7 @@ def cache_exists(key: str) -> bool:
         True if key exists, False otherwise
     """
     try:
-        return redis_client.exists(key) > 0
+        return _app.redis_client.exists(key) > 0
     except Exception as e:
         current_app.logger.error(f"Cache exists error for key {key}: {str(e)}")
         return False
@@ -134,3 +186,59 @@ def get_analysis_cache_key(symbol: str, analysis_type: str) -> str:
         Cache key
     """
     return f"analysis:{analysis_type}:{symbol}"
+
+
+def get_news_ai_cache_key(symbol: str, articles: List[Dict]) -> str:
+    """
+    Generate content-addressed cache key for AI sentiment of an article set.
+
+    The key depends only on the symbol and the set of article URLs (titles
+    when no URL is present), so the same articles map to the same key
+    regardless of order or when they were fetched.
+
+    Args:
+        symbol: Asset symbol
+        articles: News articles sent to the model
+
+    Returns:
+        Cache key
+    """
+    identities = sorted(a.get('url') or a.get('title') or '' for a in articles)
+    digest = hashlib.blake2b(
+        orjson.dumps([symbol, identities]), digest_size=16
+    ).hexdigest()
+    return f"news:ai:{digest}"
+
+
+def get_portfolio_cache_key(resource: str, user_id: int, variant: str = 'all') -> str:
+    """
+    Generate standardized cache key for a user's portfolio responses.
+
+    Args:
+        resource: Portfolio resource (positions, favorites, summary)
+        user_id: Owner of the portfolio
+        variant: Query variant (e.g. open/closed filter for positions)
+
+    Returns:
+        Cache key
+    """
+    return f"portfolio:{resource}:{user_id}:{variant}"
+
+
+def invalidate_portfolio_cache(user_id: int) -> bool:
+    """
+    Drop every cached portfolio response for a user.
+
+    Args:
+        user_id: Owner of the portfolio
+
+    Returns:
+        True if successful, False otherwise
+    """
+    return cache_delete(
+        get_portfolio_cache_key('positions', user_id),
+        get_portfolio_cache_key('positions', user_id, 'open'),
+        get_portfolio_cache_key('positions', user_id, 'closed'),
+        get_portfolio_cache_key('favorites', user_id),
+        get_portfolio_cache_key('summary', user_id)
+    )
@@ -2,11 +2,34 @@
 AES-256 encryption utilities for sensitive data protection.
 Used for data at rest encryption in the database.
 """
+from functools import lru_cache
 from cryptography.fernet import Fernet
 from flask import current_app
 from typing import Optional
 
 
+@lru_cache(maxsize=8)
+def _fernet_for_key(key: str) -> Fernet:
+    """Build (once per key) the Fernet cipher for an encryption key."""
+    return Fernet(key.encode())
+
+
+def get_fernet() -> Optional[Fernet]:
+    """
+    Get the shared Fernet cipher for the configured DB_ENCRYPTION_KEY.
+
+    The cipher is memoized per key, so the base64 key parsing happens once
+    per process rather than on every encrypt/decrypt.
+
+    Returns:
+        Fernet instance or None if no key is configured
+    """
+    key = current_app.config.get('DB_ENCRYPTION_KEY')
+    if not key:
+        return None
+    return _fernet_for_key(key)
+
+
 def encrypt_data(data: str) -> Optional[str]:
     """
     Encrypt data using AES-256 (via Fernet).
@@ -26,8 +49,7 @@ def encrypt_data(data: str) -> Optional[str]:
             current_app.logger.warning("DB_ENCRYPTION_KEY not configured, data not encrypted")
             return data
 
-        f = Fernet(key.encode())
-        encrypted = f.encrypt(data.encode())
+        encrypted = _fernet_for_key(key).encrypt(data.encode())
         return encrypted.decode()
     except Exception as e:
         current_app.logger.error(f"Encryption error: {str(e)}")
@@ -53,8 +75,7 @@ def decrypt_data(encrypted_data: str) -> Optional[str]:
             current_app.logger.warning("DB_ENCRYPTION_KEY not configured, returning data as-is")
             return encrypted_data
 
-        f = Fernet(key.encode())
-        decrypted = f.decrypt(encrypted_data.encode())
+        decrypted = _fernet_for_key(key).decrypt(encrypted_data.encode())
         return decrypted.decode()
     except Exception as e:
         current_app.logger.error(f"Decryption error: {str(e)}")
@@ -0,0 +1,159 @@
+"""
+Price data parsing utilities.
+Builds columnar NumPy arrays from raw OHLCV payloads without pandas.
+
+Payloads are either columnar ({open: [...], high: [...], ...}, preferred)
+or a list of per-bar rows ([{open, high, ...}, ...], deprecated).
+"""
+from typing import Any, Dict, List, Tuple
+import numpy as np
+
+PRICE_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+REQUIRED_PRICE_COLUMNS = frozenset(PRICE_COLUMNS)
+
+
+def validate_price_rows(rows) -> Tuple[bool, List[str]]:
+    """
+    Cheap shape check of a price payload before any arrays are built.
+
+    Only the first row's keys are checked; prices_to_arrays still rejects
+    later malformed rows.
+
+    Args:
+        rows: Raw price_data payload
+
+    Returns:
+        Tuple of (ok, sorted list of missing columns)
+    """
+    if not isinstance(rows, list) or not rows or not isinstance(rows[0], dict):
+        return False, sorted(REQUIRED_PRICE_COLUMNS)
+
+    missing = REQUIRED_PRICE_COLUMNS.difference(rows[0])
+    return not missing, sorted(missing)
+
+
+def _require_finite(arrays: Dict[str, np.ndarray]):
+    """
+    Reject None, NaN and inf values, which NumPy stores as non-finite floats.
+
+    Args:
+        arrays: OHLCV arrays keyed by column
+
+    Raises:
+        ValueError: If any value is not finite
+    """
+    if not all(np.isfinite(values).all() for values in arrays.values()):
+        raise ValueError('Price data values must be numeric')
+
+
+def prices_to_arrays(price_data: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Convert a list of OHLCV rows into a dict of float64 arrays.
+
+    Args:
+        price_data: List of {timestamp, open, high, low, close, volume} dicts
+
+    Returns:
+        Dictionary mapping each OHLCV column to a NumPy array
+
+    Raises:
+        ValueError: If rows are missing required columns or hold non-numeric
+            (including None, NaN and inf) values
+    """
+    n = len(price_data)
+    open_ = np.empty(n, dtype=np.float64)
+    high = np.empty(n, dtype=np.float64)
+    low = np.empty(n, dtype=np.float64)
+    close = np.empty(n, dtype=np.float64)
+    volume = np.empty(n, dtype=np.float64)
+
+    row = None
+    try:
+        for i, row in enumerate(price_data):
+            open_[i] = row['open']
+            high[i] = row['high']
+            low[i] = row['low']
+            close[i] = row['close']
+            volume[i] = row['volume']
+    except (KeyError, TypeError, ValueError):
+        missing = REQUIRED_PRICE_COLUMNS.difference(row) if isinstance(row, dict) else REQUIRED_PRICE_COLUMNS
+        if missing:
+            raise ValueError(f'Missing required columns: {sorted(missing)}')
+        raise ValueError('Price data values must be numeric')
+
+    arrays = {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+    _require_finite(arrays)
+    return arrays
+
+
+def columns_to_arrays(columns: Dict[str, List]) -> Dict[str, np.ndarray]:
+    """
+    Convert a columnar OHLCV payload into a dict of float64 arrays.
+
+    Each column is converted with a single np.asarray call, with no
+    per-row Python work. Extra keys such as timestamp are ignored.
+
+    Args:
+        columns: Mapping of OHLCV column to a list of values
+
+    Returns:
+        Dictionary mapping each OHLCV column to a NumPy array
+
+    Raises:
+        ValueError: If columns are missing, empty, non-numeric (including None,
+            NaN and inf) or of unequal length
+    """
+    missing = REQUIRED_PRICE_COLUMNS.difference(columns)
+    if missing:
+        raise ValueError(f'Missing required columns: {sorted(missing)}')
+
+    try:
+        arrays = {col: np.asarray(columns[col], dtype=np.float64) for col in PRICE_COLUMNS}
+    except (TypeError, ValueError):
+        raise ValueError('Price data values must be numeric')
+    _require_finite(arrays)
+
+    shapes = {values.shape for values in arrays.values()}
+    if len(shapes) != 1 or len(next(iter(shapes))) != 1:
+        raise ValueError('Price columns must be flat lists of equal length')
+    if not arrays['close'].shape[0]:
+        raise ValueError('Price data must contain at least one bar')
+
+    return arrays
+
+
+def validate_price_payload(price_data: Any) -> Tuple[bool, List[str]]:
+    """
+    Cheap shape check of a columnar or row-based price payload.
+
+    Args:
+        price_data: Raw price_data payload
+
+    Returns:
+        Tuple of (ok, sorted list of missing columns)
+    """
+    if isinstance(price_data, dict):
+        missing = REQUIRED_PRICE_COLUMNS.difference(price_data)
+        return not missing, sorted(missing)
+    return validate_price_rows(price_data)
+
+
+def price_payload_to_arrays(price_data: Any) -> Dict[str, np.ndarray]:
+    """
+    Convert a columnar or (deprecated) row-based price payload to arrays.
+
+    Args:
+        price_data: Columnar dict of lists, or list of OHLCV row dicts
+
+    Returns:
+        Dictionary mapping each OHLCV column to a NumPy array
+
+    Raises:
+        ValueError: If the payload is malformed
+    """
+    if isinstance(price_data, dict):
+        return columns_to_arrays(price_data)
+    if not isinstance(price_data, list):
+        raise ValueError('price_data must be a columnar object or a list of rows')
+    return prices_to_arrays(price_data)
+
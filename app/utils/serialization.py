@@ -0,0 +1,16 @@
+"""
+Helpers for converting model columns to JSON-ready values.
+"""
+from datetime import datetime
+from decimal import Decimal
+from typing import Optional, Union
+
+
+def opt_float(value: Optional[Union[Decimal, float, int]]) -> Optional[float]:
+    """Convert a numeric column to float, keeping None (and zero) intact."""
+    return float(value) if value is not None else None
+
+
+def opt_iso(value: Optional[datetime]) -> Optional[str]:
+    """Format a datetime column as ISO 8601, keeping None intact."""
+    return value.isoformat() if value is not None else None
@@ -0,0 +1,31 @@
+"""
+Kafka-to-WebSocket bridge entry point.
+
+Run exactly one instance per deployment: python bridge.py
+Room emits reach clients on every web worker through SOCKETIO_MESSAGE_QUEUE.
+"""
+# Flask-SocketIO runs in eventlet mode (eventlet is installed), so sockets
+# must be green before kafka-python, redis or Flask open any
+import eventlet
+eventlet.monkey_patch()
+
+import os  # noqa: E402
+
+from app import create_app, socketio  # noqa: E402
+from app.routes import websocket  # noqa: E402
+
+# Get configuration from environment
+config_name = os.getenv('FLASK_ENV', 'development')
+
+# Create application
+app = create_app(config_name)
+
+
+if __name__ == '__main__':
+    # create_app() already started it when KAFKA_BRIDGE_WORKER is set
+    if not app.config.get('KAFKA_BRIDGE_WORKER', False):
+        with app.app_context():
+            websocket.start_kafka_to_websocket_bridge()
+
+    while True:
+        socketio.sleep(60)
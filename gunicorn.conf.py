@@ -0,0 +1,36 @@
+"""
+Gunicorn configuration for production.
+
+Run with: gunicorn -c gunicorn.conf.py "run:app"
+
+Socket.IO sessions live in the worker that accepted them, and gunicorn
+has no sticky sessions, so a client that falls back to long-polling gets
+"Invalid session" once its requests land on another worker. Run one
+worker per instance (the default) and scale out with more instances behind
+a load balancer with sticky sessions, with SOCKETIO_MESSAGE_QUEUE set so
+room emits reach clients on every instance. The bundled clients connect
+over websocket only, which keeps each session on one connection; raise
+WORKERS only for clients that never use polling.
+
+Keep KAFKA_BRIDGE_WORKER=false here: every worker runs create_app(), so the
+bridge runs in its own process instead (python bridge.py).
+"""
+import os
+
+bind = os.getenv('BIND', '0.0.0.0:5000')
+# One eventlet worker already multiplexes worker_connections clients
+workers = int(os.getenv('WORKERS', '1'))
+
+# Green-thread workers multiplex websockets and HTTP over epoll
+worker_class = 'eventlet'
+worker_connections = 1000
+timeout = 120
+
+# Each worker sets up its own Redis/DB connections after forking; Numba
+# kernels compiled with cache=True load from __pycache__ in every worker,
+# so preloading would only share those connections across processes
+preload_app = False
+
+accesslog = '-'
+errorlog = '-'
+loglevel = os.getenv('LOG_LEVEL', 'info')
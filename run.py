@@ -2,6 +2,7 @@
 Broker Assistant Application Entry Point.
 """
 import os
+import sys
 from app import create_app, socketio
 
 # Get configuration from environment
@@ -12,6 +13,13 @@ app = create_app(config_name)
 
 
 if __name__ == '__main__':
+    if config_name != 'development':
+        # The SocketIO development server has no worker pool
+        sys.exit(
+            f"run.py only serves FLASK_ENV=development (got '{config_name}'); "
+            'use: gunicorn -c gunicorn.conf.py "run:app"'
+        )
+
     # Run with SocketIO for WebSocket support
     socketio.run(
         app,
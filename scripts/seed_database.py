@@ -12,8 +12,162 @@ from app import create_app, db
 from app.models.user import User
 from app.models.portfolio import Position, FavoriteAsset
 from app.models.prediction import Prediction, PredictionFactor
+from app.utils.bulk import copy_rows
 from datetime import datetime, timedelta
 import random
+import numpy as np
+
+
+def _factor_templates(prediction_type):
+    """Sample XAI factors for a prediction type; RSI value and pattern name are filled per row."""
+    bullish = prediction_type == 'BUY'
+    return (
+        {
+            'factor_type': 'indicator',
+            'factor_name': 'RSI',
+            'factor_value': None,
+            'weight': 0.2,
+            'description': f"RSI indicates {'oversold' if bullish else 'overbought'} conditions"
+        },
+        {
+            'factor_type': 'indicator',
+            'factor_name': 'MACD',
+            'factor_value': 'bullish' if bullish else 'bearish',
+            'weight': 0.25,
+            'description': f"MACD showing {'bullish' if bullish else 'bearish'} crossover"
+        },
+        {
+            'factor_type': 'pattern',
+            'factor_name': None,
+            'factor_value': prediction_type.lower(),
+            'weight': 0.3,
+            'description': f"Chart pattern suggests {prediction_type.lower()} signal"
+        },
+        {
+            'factor_type': 'news',
+            'factor_name': 'News Sentiment',
+            'factor_value': 'positive' if bullish else 'negative',
+            'weight': 0.25,
+            'description': f"Recent news sentiment is {'positive' if bullish else 'negative'}"
+        }
+    )
+
+
+# Sample option values
+_PREDICTION_TYPES = ('BUY', 'SELL', 'HOLD')
+_HORIZONS = ('short', 'medium', 'long')
+_ANALYSIS_TYPES = ('technical', 'fundamental', 'hybrid')
+_MARKET_CONDITIONS = ('bullish', 'bearish', 'sideways')
+_OUTCOMES = ('pending', 'correct', 'incorrect')
+_CHART_PATTERNS = ('Head and Shoulders', 'Double Bottom', 'Triangle')
+_RISK_TOLERANCES = ('low', 'medium', 'high')
+_INTEREST_REASONS = (
+    'Strong growth potential',
+    'Solid fundamentals',
+    'Technical breakout pattern',
+    'Dividend yield',
+    'Market leader'
+)
+
+# Formatted once instead of per prediction
+_FACTOR_TEMPLATES = {
+    prediction_type: _factor_templates(prediction_type)
+    for prediction_type in _PREDICTION_TYPES
+}
+
+
+def _with_defaults(table, rows):
+    """
+    Fill in Python-side column defaults missing from the rows.
+
+    COPY bypasses SQLAlchemy, so defaults such as created_at=datetime.utcnow
+    have to be applied before the rows are written.
+
+    Args:
+        table: Target table
+        rows: Column values for each row
+
+    Returns:
+        New row dictionaries with every defaulted column set
+    """
+    # Evaluated once per table, so every row shares one utcnow() timestamp
+    defaults = {
+        column.name: column.default.arg(None) if column.default.is_callable else column.default.arg
+        for column in table.columns
+        if column.default is not None and not column.primary_key and column.name not in rows[0]
+    }
+    return [{**row, **defaults} for row in rows]
+
+
+def _copy_table(table, rows, returning_ids):
+    """
+    Write rows with PostgreSQL COPY FROM STDIN.
+
+    IDs are reserved from the table's sequence up front, as in
+    PredictionService, so dependent rows can reference them.
+
+    Args:
+        table: Target table
+        rows: Column values for each row
+        returning_ids: Reserve and return IDs for the rows
+
+    Returns:
+        List of reserved IDs if requested, otherwise None
+    """
+    connection = db.session.connection()
+    rows = _with_defaults(table, rows)
+    columns = list(rows[0])
+
+    ids = None
+    if returning_ids:
+        ids = connection.execute(
+            db.text(f"SELECT nextval('{table.name}_id_seq') FROM generate_series(1, :n)"),
+            {'n': len(rows)}
+        ).scalars().all()
+        values = [[row_id] + [row[name] for name in columns] for row_id, row in zip(ids, rows)]
+        columns = ['id'] + columns
+    else:
+        values = [[row[name] for name in columns] for row in rows]
+
+    cursor = connection.connection.cursor()
+    try:
+        copy_rows(cursor, table.name, columns, values)
+    finally:
+        cursor.close()
+    return ids
+
+
+def _insert_rows(model, rows, returning_ids=False):
+    """
+    Insert row dictionaries in bulk.
+
+    PostgreSQL gets COPY FROM STDIN; other databases get one executemany
+    Core INSERT. Both skip ORM unit-of-work bookkeeping. Rows must share
+    the same keys.
+
+    Args:
+        model: Model class whose table receives the rows
+        rows: Column values for each row
+        returning_ids: Return the generated IDs in row order
+
+    Returns:
+        List of generated IDs if requested, otherwise None
+    """
+    if not rows:
+        return [] if returning_ids else None
+
+    table = model.__table__
+    if db.session.get_bind().dialect.name == 'postgresql':
+        return _copy_table(table, rows, returning_ids)
+
+    if not returning_ids:
+        db.session.execute(db.insert(table), rows)
+        return None
+
+    return db.session.execute(
+        db.insert(table).returning(table.c.id, sort_by_parameter_order=True),
+        rows
+    ).scalars().all()
 
 
 def create_sample_users():
@@ -21,15 +175,14 @@ def create_sample_users():
     print("Creating sample users...")
 
     users = [
-        User(username='demo', email='demo@brokerassistant.com', password_hash='hashed_password_1'),
-        User(username='trader1', email='trader1@brokerassistant.com', password_hash='hashed_password_2'),
-        User(username='investor', email='investor@brokerassistant.com', password_hash='hashed_password_3'),
+        {'username': 'demo', 'email': 'demo@brokerassistant.com', 'password_hash': 'hashed_password_1'},
+        {'username': 'trader1', 'email': 'trader1@brokerassistant.com', 'password_hash': 'hashed_password_2'},
+        {'username': 'investor', 'email': 'investor@brokerassistant.com', 'password_hash': 'hashed_password_3'},
     ]
 
-    for user in users:
-        db.session.add(user)
+    for user, user_id in zip(users, _insert_rows(User, users, returning_ids=True)):
+        user['id'] = user_id
 
-    db.session.commit()
     print(f"Created {len(users)} users")
     return users
 
@@ -39,39 +192,52 @@ def create_sample_positions(users):
     print("Creating sample positions...")
 
     symbols = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'META', 'NFLX']
+    position_types = ['BUY', 'SELL']
+
+    # Draw every random value in one NumPy call per column; the loop below
+    # only indexes into the arrays. tolist() yields plain Python numbers
+    # that every DB driver adapts.
+    rng = np.random.default_rng()
+    owners = users[:2]  # First 2 users have positions
+    counts = rng.integers(3, 6, len(owners))  # 3-5 positions per user
+    n = int(counts.sum())
+
+    owner_idx = np.repeat(np.arange(len(owners)), counts).tolist()
+    symbol_idx = rng.integers(0, len(symbols), n).tolist()
+    type_idx = rng.integers(0, len(position_types), n)
+    entry_prices = rng.uniform(50, 500, n)
+    quantities = rng.integers(1, 101, n)
+    current_prices = entry_prices * rng.uniform(0.85, 1.15, n)  # ±15%
+    open_flags = (rng.random(n) < 2 / 3).tolist()  # 2/3 open
+    opened_days = rng.integers(1, 91, n).tolist()
+    closed_days = rng.integers(1, 31, n).tolist()
+    pnls = np.where(type_idx == 0, 1.0, -1.0) * (current_prices - entry_prices) * quantities
+
+    now = datetime.utcnow()
     positions = []
 
-    for user in users[:2]:  # First 2 users have positions
-        # Create 3-5 positions per user
-        num_positions = random.randint(3, 5)
-
-        for _ in range(num_positions):
-            symbol = random.choice(symbols)
-            position_type = random.choice(['BUY', 'SELL'])
-            entry_price = random.uniform(50, 500)
-            quantity = random.randint(1, 100)
-            is_open = random.choice([True, True, False])  # 2/3 open
-
-            position = Position(
-                user_id=user.id,
-                symbol=symbol,
-                asset_name=f'{symbol} Corporation',
-                position_type=position_type,
-                quantity=quantity,
-                entry_price=entry_price,
-                current_price=entry_price * random.uniform(0.85, 1.15),  # ±15%
-                opened_at=datetime.utcnow() - timedelta(days=random.randint(1, 90)),
-                is_open=is_open
-            )
-
-            if not is_open:
-                position.closed_at = datetime.utcnow() - timedelta(days=random.randint(1, 30))
-
-            position.calculate_pnl()
-            positions.append(position)
-            db.session.add(position)
-
-    db.session.commit()
+    for i, (entry_price, quantity, current_price, pnl) in enumerate(zip(
+        entry_prices.tolist(), quantities.tolist(), current_prices.tolist(), pnls.tolist()
+    )):
+        symbol = symbols[symbol_idx[i]]
+        is_open = open_flags[i]
+
+        positions.append({
+            'user_id': owners[owner_idx[i]]['id'],
+            'symbol': symbol,
+            'asset_name': f'{symbol} Corporation',
+            'position_type': position_types[type_idx[i]],
+            'quantity': quantity,
+            'entry_price': entry_price,
+            'current_price': current_price,
+            'opened_at': now - timedelta(days=opened_days[i]),
+            'closed_at': None if is_open else now - timedelta(days=closed_days[i]),
+            'is_open': is_open,
+            'unrealized_pnl': pnl if is_open else None,
+            'realized_pnl': None if is_open else pnl
+        })
+
+    _insert_rows(Position, positions)
     print(f"Created {len(positions)} positions")
     return positions
 
@@ -93,36 +259,33 @@ def create_sample_favorites(users):
         'WMT': 'Walmart Inc.'
     }
 
+    symbol_list = list(symbols)
+    now = datetime.utcnow()
     favorites = []
 
     for user in users:
-        # Each user has 5-8 favorites
+        # Each user has 5-8 distinct favorites; the other fields are drawn
+        # for all of them at once
         num_favorites = random.randint(5, 8)
-        user_symbols = random.sample(list(symbols.keys()), num_favorites)
-
-        for symbol in user_symbols:
-            favorite = FavoriteAsset(
-                user_id=user.id,
-                symbol=symbol,
-                asset_name=symbols[symbol],
-                asset_type='stock',
-                interest_reason=random.choice([
-                    'Strong growth potential',
-                    'Solid fundamentals',
-                    'Technical breakout pattern',
-                    'Dividend yield',
-                    'Market leader'
-                ]),
-                risk_tolerance=random.choice(['low', 'medium', 'high']),
-                investment_horizon=random.choice(['short', 'medium', 'long']),
-                added_at=datetime.utcnow() - timedelta(days=random.randint(1, 180)),
-                view_count=random.randint(0, 50)
-            )
-
-            favorites.append(favorite)
-            db.session.add(favorite)
-
-    db.session.commit()
+        user_symbols = random.sample(symbol_list, num_favorites)
+        reasons = random.choices(_INTEREST_REASONS, k=num_favorites)
+        risks = random.choices(_RISK_TOLERANCES, k=num_favorites)
+        horizons = random.choices(_HORIZONS, k=num_favorites)
+
+        for i, symbol in enumerate(user_symbols):
+            favorites.append({
+                'user_id': user['id'],
+                'symbol': symbol,
+                'asset_name': symbols[symbol],
+                'asset_type': 'stock',
+                'interest_reason': reasons[i],
+                'risk_tolerance': risks[i],
+                'investment_horizon': horizons[i],
+                'added_at': now - timedelta(days=random.randint(1, 180)),
+                'view_count': random.randint(0, 50)
+            })
+
+    _insert_rows(FavoriteAsset, favorites)
     print(f"Created {len(favorites)} favorite assets")
     return favorites
 
@@ -132,81 +295,84 @@ def create_sample_predictions():
     print("Creating sample predictions...")
 
     symbols = ['AAPL', 'GOOGL', 'MSFT', 'AMZN', 'TSLA', 'NVDA', 'META', 'NFLX', 'JPM', 'V']
-    predictions = []
 
-    for _ in range(20):  # 20 sample predictions
-        symbol = random.choice(symbols)
-        prediction_type = random.choice(['BUY', 'SELL', 'HOLD'])
-        confidence = random.uniform(0.6, 0.95)
-        price = random.uniform(50, 500)
-
-        prediction = Prediction(
-            symbol=symbol,
-            asset_name=f'{symbol} Corporation',
-            prediction_type=prediction_type,
-            confidence_score=confidence,
-            target_price=price * (1.1 if prediction_type == 'BUY' else 0.9),
-            stop_loss=price * (0.95 if prediction_type == 'BUY' else 1.05),
-            time_horizon=random.choice(['short', 'medium', 'long']),
-            analysis_type=random.choice(['technical', 'fundamental', 'hybrid']),
-            model_version='v1.0',
-            price_at_prediction=price,
-            market_condition=random.choice(['bullish', 'bearish', 'sideways']),
-            created_at=datetime.utcnow() - timedelta(days=random.randint(0, 30)),
-            expires_at=datetime.utcnow() + timedelta(days=random.randint(7, 90)),
-            actual_outcome=random.choice(['pending', 'correct', 'incorrect']),
-            user_executed=random.choice([True, False])
-        )
-
-        # Set accuracy for non-pending outcomes
-        if prediction.actual_outcome != 'pending':
-            prediction.accuracy_score = random.uniform(0.6, 0.95) if prediction.actual_outcome == 'correct' else random.uniform(0.3, 0.6)
-            prediction.outcome_verified_at = datetime.utcnow() - timedelta(days=random.randint(0, 15))
+    # One vectorized draw per column, indexed in the loop (see positions)
+    rng = np.random.default_rng()
+    n = 20  # 20 sample predictions
+    symbol_idx = rng.integers(0, len(symbols), n).tolist()
+    type_idx = rng.integers(0, len(_PREDICTION_TYPES), n).tolist()
+    confidences = rng.uniform(0.6, 0.95, n).tolist()
+    prices = rng.uniform(50, 500, n).tolist()
+    outcome_idx = rng.integers(0, len(_OUTCOMES), n)
+    horizon_idx = rng.integers(0, len(_HORIZONS), n).tolist()
+    analysis_idx = rng.integers(0, len(_ANALYSIS_TYPES), n).tolist()
+    condition_idx = rng.integers(0, len(_MARKET_CONDITIONS), n).tolist()
+    created_days = rng.integers(0, 31, n).tolist()
+    expires_days = rng.integers(7, 91, n).tolist()
+    executed = (rng.random(n) < 0.5).tolist()
+    # Correct outcomes score 0.6-0.95, incorrect ones 0.3-0.6; pending
+    # ones get no accuracy or verification time (None)
+    verified = outcome_idx != 0
+    accuracies = np.where(
+        verified,
+        np.where(outcome_idx == 1, rng.uniform(0.6, 0.95, n), rng.uniform(0.3, 0.6, n)),
+        None
+    ).tolist()
+    verified_days = rng.integers(0, 16, n).astype('timedelta64[D]')
+    rsi_values = rng.uniform(30, 70, n).tolist()
+    pattern_idx = rng.integers(0, len(_CHART_PATTERNS), n).tolist()
+    outcome_idx = outcome_idx.tolist()
+
+    now = datetime.utcnow()
+    verified_at = np.where(
+        verified, (np.datetime64(now, 'us') - verified_days).astype(object), None
+    ).tolist()
+    predictions = []
+    factor_sets = []
+
+    for i in range(n):
+        symbol = symbols[symbol_idx[i]]
+        prediction_type = _PREDICTION_TYPES[type_idx[i]]
+        price = prices[i]
+
+        prediction = {
+            'symbol': symbol,
+            'asset_name': f'{symbol} Corporation',
+            'prediction_type': prediction_type,
+            'confidence_score': confidences[i],
+            'target_price': price * (1.1 if prediction_type == 'BUY' else 0.9),
+            'stop_loss': price * (0.95 if prediction_type == 'BUY' else 1.05),
+            'time_horizon': _HORIZONS[horizon_idx[i]],
+            'analysis_type': _ANALYSIS_TYPES[analysis_idx[i]],
+            'model_version': 'v1.0',
+            'price_at_prediction': price,
+            'market_condition': _MARKET_CONDITIONS[condition_idx[i]],
+            'created_at': now - timedelta(days=created_days[i]),
+            'expires_at': now + timedelta(days=expires_days[i]),
+            'actual_outcome': _OUTCOMES[outcome_idx[i]],
+            'user_executed': executed[i],
+            'accuracy_score': accuracies[i],
+            'outcome_verified_at': verified_at[i]
+        }
 
         predictions.append(prediction)
-        db.session.add(prediction)
-        db.session.flush()  # Get prediction ID
-
-        # Add factors
-        factors_data = [
-            {
-                'factor_type': 'indicator',
-                'factor_name': 'RSI',
-                'factor_value': str(random.uniform(30, 70)),
-                'weight': 0.2,
-                'description': f"RSI indicates {'oversold' if prediction_type == 'BUY' else 'overbought'} conditions"
-            },
-            {
-                'factor_type': 'indicator',
-                'factor_name': 'MACD',
-                'factor_value': 'bullish' if prediction_type == 'BUY' else 'bearish',
-                'weight': 0.25,
-                'description': f"MACD showing {'bullish' if prediction_type == 'BUY' else 'bearish'} crossover"
-            },
-            {
-                'factor_type': 'pattern',
-                'factor_name': random.choice(['Head and Shoulders', 'Double Bottom', 'Triangle']),
-                'factor_value': prediction_type.lower(),
-                'weight': 0.3,
-                'description': f"Chart pattern suggests {prediction_type.lower()} signal"
-            },
-            {
-                'factor_type': 'news',
-                'factor_name': 'News Sentiment',
-                'factor_value': 'positive' if prediction_type == 'BUY' else 'negative',
-                'weight': 0.25,
-                'description': f"Recent news sentiment is {'positive' if prediction_type == 'BUY' else 'negative'}"
-            }
-        ]
 
-        for factor_data in factors_data:
-            factor = PredictionFactor(
-                prediction_id=prediction.id,
-                **factor_data
-            )
-            db.session.add(factor)
+        # Factors are inserted once prediction IDs are known; only the RSI
+        # value and pattern name vary per prediction
+        factor_sets.append((prediction_type, str(rsi_values[i]), _CHART_PATTERNS[pattern_idx[i]]))
+
+    prediction_ids = _insert_rows(Prediction, predictions, returning_ids=True)
+    factor_rows = []
+    for prediction_id, (prediction_type, rsi_value, pattern_name) in zip(prediction_ids, factor_sets):
+        rsi, macd, pattern, news = _FACTOR_TEMPLATES[prediction_type]
+        factor_rows += [
+            {'prediction_id': prediction_id, **rsi, 'factor_value': rsi_value},
+            {'prediction_id': prediction_id, **macd},
+            {'prediction_id': prediction_id, **pattern, 'factor_name': pattern_name},
+            {'prediction_id': prediction_id, **news}
+        ]
+    _insert_rows(PredictionFactor, factor_rows)
 
-    db.session.commit()
     print(f"Created {len(predictions)} predictions with factors")
     return predictions
 
@@ -220,8 +386,8 @@ def seed_database():
     app = create_app('development')
 
     with app.app_context():
-        # Check if data already exists
-        if User.query.first():
+        # Check if data already exists (selects one id, builds no User)
+        if db.session.query(User.id).first() is not None:
             print("\nDatabase already contains data!")
             response = input("Do you want to clear and re-seed? (yes/no): ")
             if response.lower() != 'yes':
@@ -235,10 +401,18 @@ def seed_database():
 
         print("\nCreating sample data...\n")
 
-        users = create_sample_users()
-        positions = create_sample_positions(users)
-        favorites = create_sample_favorites(users)
-        predictions = create_sample_predictions()
+        # The creators only write; everything commits (or rolls back) as
+        # one transaction
+        with db.session.no_autoflush:
+            try:
+                users = create_sample_users()
+                positions = create_sample_positions(users)
+                favorites = create_sample_favorites(users)
+                predictions = create_sample_predictions()
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                raise
 
         print("\n" + "=" * 60)
         print("Database Seeding Complete!")
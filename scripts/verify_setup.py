@@ -2,10 +2,31 @@
 Verify Broker Assistant setup and configuration.
 Checks that all services and dependencies are properly configured.
 """
+import io
+import json
 import os
+import subprocess
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import requests
-from time import sleep
+from requests.adapters import HTTPAdapter
+
+API_CHECK_URL = 'http://localhost:5000/api/portfolio/positions?user_id=1'
+
+# One keep-alive session for every HTTP check
+SESSION = requests.Session()
+SESSION.mount('http://', HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Prints the normalized (lowercase, '-' separated) names of every
+# installed distribution as JSON
+DIST_NAMES_SCRIPT = (
+    "import json; from importlib.metadata import distributions; "
+    "print(json.dumps(sorted({d.metadata['Name'].lower().replace('_', '-') for d in distributions()})))"
+)
+
+_responses = {}
+_responses_lock = threading.Lock()
 
 
 class Colors:
@@ -17,6 +38,52 @@ class Colors:
     END = '\033[0m'
 
 
+class _ThreadOutput:
+    """
+    stdout replacement that sends each thread's writes to its own buffer.
+
+    Lets checks run concurrently while their output is printed one whole
+    check at a time.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+
+    def write(self, text):
+        return getattr(self.local, 'buffer', self.stream).write(text)
+
+    def flush(self):
+        getattr(self.local, 'buffer', self.stream).flush()
+
+
+def get_once(url, timeout=5):
+    """
+    GET a URL at most once per run and share the outcome between checks.
+
+    The lock is held during the request, so a concurrent caller waits for
+    the first response instead of sending its own.
+
+    Args:
+        url: URL to request
+        timeout: Request timeout in seconds
+
+    Returns:
+        The response; the first request's exception is re-raised instead
+    """
+    with _responses_lock:
+        if url not in _responses:
+            try:
+                _responses[url] = (SESSION.get(url, timeout=timeout), None)
+            except Exception as e:
+                _responses[url] = (None, e)
+        response, error = _responses[url]
+
+    if error is not None:
+        raise error
+    return response
+
+
 def print_status(message, status='info'):
     """Print colored status message."""
     if status == 'success':
@@ -55,19 +122,18 @@ def check_env_file():
         'NEWS_API_KEY'
     ]
 
+    # Parse once; each key check is then a dict lookup
     with open('.env', 'r') as f:
-        content = f.read()
-
-    missing_required = []
-    missing_optional = []
-
-    for key in required_keys:
-        if key not in content or f"{key}=" not in content:
-            missing_required.append(key)
+        env = dict(
+            (key.strip(), value.strip())
+            for key, value in (
+                line.split('=', 1) for line in f
+                if '=' in line and not line.lstrip().startswith('#')
+            )
+        )
 
-    for key in optional_keys:
-        if key not in content or content.find(f"{key}=\n") != -1 or content.endswith(f"{key}="):
-            missing_optional.append(key)
+    missing_required = [key for key in required_keys if not env.get(key)]
+    missing_optional = [key for key in optional_keys if not env.get(key)]
 
     if missing_required:
         print_status(f"Missing required keys: {', '.join(missing_required)}", 'error')
@@ -86,8 +152,6 @@ def check_docker_services():
     print("\n=== Checking Docker Services ===")
 
     try:
-        import subprocess
-
         result = subprocess.run(
             ['docker-compose', 'ps', '--services', '--filter', 'status=running'],
             capture_output=True,
@@ -122,7 +186,7 @@ def check_api_connectivity():
     print("\n=== Checking API Connectivity ===")
 
     try:
-        response = requests.get('http://localhost:5000/api/portfolio/positions?user_id=1', timeout=5)
+        response = get_once(API_CHECK_URL)
 
         if response.status_code == 200:
             print_status("API is responding", 'success')
@@ -141,11 +205,11 @@ def check_api_connectivity():
 
 
 def check_database():
-    """Check database connectivity."""
+    """Check database connectivity (shares the API check's request)."""
     print("\n=== Checking Database ===")
 
     try:
-        response = requests.get('http://localhost:5000/api/portfolio/positions?user_id=1', timeout=5)
+        response = get_once(API_CHECK_URL)
 
         if response.status_code == 200:
             print_status("Database is accessible", 'success')
@@ -164,8 +228,6 @@ def check_redis():
     print("\n=== Checking Redis ===")
 
     try:
-        import subprocess
-
         result = subprocess.run(
             ['docker-compose', 'exec', '-T', 'redis', 'redis-cli', 'ping'],
             capture_output=True,
@@ -190,8 +252,6 @@ def check_kafka():
     print("\n=== Checking Kafka ===")
 
     try:
-        import subprocess
-
         result = subprocess.run(
             ['docker-compose', 'exec', '-T', 'kafka', 'kafka-topics', '--bootstrap-server', 'localhost:9092', '--list'],
             capture_output=True,
@@ -227,22 +287,21 @@ def check_dependencies():
     ]
 
     try:
-        import subprocess
-
+        # Exact distribution names from importlib.metadata; avoids importing
+        # pip and substring-matching its table output
         result = subprocess.run(
-            ['docker-compose', 'exec', '-T', 'app', 'pip', 'list'],
+            ['docker-compose', 'exec', '-T', 'app', 'python', '-c', DIST_NAMES_SCRIPT],
             capture_output=True,
             text=True,
             timeout=10
         )
 
         if result.returncode == 0:
-            installed = result.stdout.lower()
-            missing = []
-
-            for package in required_packages:
-                if package.lower() not in installed:
-                    missing.append(package)
+            installed = set(json.loads(result.stdout))
+            missing = [
+                package for package in required_packages
+                if package.lower().replace('_', '-') not in installed
+            ]
 
             if missing:
                 print_status(f"Missing packages: {', '.join(missing)}", 'error')
@@ -275,14 +334,36 @@ def run_verification():
         ("Dependencies", check_dependencies)
     ]
 
-    results = {}
+    stdout = sys.stdout
+    output = _ThreadOutput(stdout)
 
-    for check_name, check_func in checks:
+    def run_check(check_name, check_func):
+        output.local.buffer = io.StringIO()
         try:
-            results[check_name] = check_func()
+            result = check_func()
         except Exception as e:
             print_status(f"Error during {check_name} check: {str(e)}", 'error')
-            results[check_name] = False
+            result = False
+        return result, output.local.buffer.getvalue()
+
+    # Checks mostly wait on subprocesses and HTTP, so they run concurrently;
+    # each check's output is printed as soon as it completes
+    completed = {}
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            futures = {
+                executor.submit(run_check, check_name, check_func): check_name
+                for check_name, check_func in checks
+            }
+            for future in as_completed(futures):
+                completed[futures[future]], text = future.result()
+                stdout.write(text)
+                stdout.flush()
+    finally:
+        sys.stdout = stdout
+
+    results = {check_name: completed[check_name] for check_name, _ in checks}
 
     # Summary
     print("\n" + "=" * 60)
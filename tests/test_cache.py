@@ -0,0 +1,73 @@
+"""
+Tests for Redis cache utilities.
+"""
+import logging
+import numpy as np
+import app as app_package
+from app.utils import cache
+
+
+class FakeRedis:
+    """In-memory stand-in for the handful of Redis commands used."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+    def mget(self, keys):
+        return [self.store.get(key) for key in keys]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.store.pop(key, None)
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        return []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_cache_roundtrip_numpy(app, monkeypatch):
+    """Test values are stored as orjson bytes and numpy scalars serialize."""
+    fake = FakeRedis()
+    monkeypatch.setattr(app_package, 'redis_client', fake)
+
+    assert cache.cache_set('k', {'rsi': np.float64(25.5), 'levels': np.array([1.0, 2.0])}, ttl=60)
+
+    assert isinstance(fake.store['k'], bytes)
+    assert cache.cache_get('k') == {'rsi': 25.5, 'levels': [1.0, 2.0]}
+
+
+def test_cache_set_many_and_mget(app, monkeypatch):
+    """Test pipelined writes are read back in key order with misses as None."""
+    monkeypatch.setattr(app_package, 'redis_client', FakeRedis())
+
+    assert cache.cache_set_many({'a': [1], 'b': {'x': 2}}, ttl=60)
+
+    assert cache.cache_mget(['b', 'missing', 'a']) == [{'x': 2}, None, [1]]
+
+
+def test_cache_uses_app_clients(app, caplog):
+    """Test helpers reach the client create_app() assigned, even though the
+    cache module was imported before it existed."""
+    assert app_package.redis_client is not None
+
+    # No Redis server runs in tests: the call must fail on the connection,
+    # not on a missing client
+    with caplog.at_level(logging.ERROR):
+        assert cache.cache_get('missing') is None
+        assert cache.cache_mget(['missing']) == [None]
+
+    assert 'NoneType' not in caplog.text
@@ -0,0 +1,24 @@
+"""
+Tests for encryption utilities.
+"""
+from cryptography.fernet import Fernet
+from app.utils.encryption import decrypt_data, encrypt_data
+
+
+def test_encrypt_roundtrip(app):
+    """Test values round-trip through the memoized cipher."""
+    app.config['DB_ENCRYPTION_KEY'] = Fernet.generate_key().decode()
+
+    encrypted = encrypt_data('alpha')
+
+    assert encrypted != 'alpha'
+    assert decrypt_data(encrypted) == 'alpha'
+    assert encrypt_data('') is None
+    assert decrypt_data('') is None
+
+
+def test_decrypt_invalid_token(app):
+    """Test a corrupt value decrypts to None."""
+    app.config['DB_ENCRYPTION_KEY'] = Fernet.generate_key().decode()
+
+    assert decrypt_data('not-a-token') is None
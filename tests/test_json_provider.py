@@ -0,0 +1,15 @@
+"""
+Tests for the orjson JSON provider.
+"""
+from decimal import Decimal
+import numpy as np
+from flask import jsonify
+
+
+def test_jsonify_handles_decimal_and_numpy(app):
+    """Test Decimal and NumPy values serialize as plain numbers."""
+    with app.test_request_context():
+        response = jsonify({'price': Decimal('101.25'), 'rsi': np.float64(28.5), 'volumes': np.array([1, 2])})
+
+    assert response.mimetype == 'application/json'
+    assert response.get_json() == {'price': 101.25, 'rsi': 28.5, 'volumes': [1, 2]}
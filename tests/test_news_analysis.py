@@ -0,0 +1,132 @@
+"""
+Tests for news analysis service.
+"""
+import pytest
+from app.services.news_analysis import NewsAnalysisService, POSITIVE_WORDS, NEGATIVE_WORDS
+
+
+@pytest.fixture
+def news_service(app):
+    """Create news analysis service instance."""
+    return NewsAnalysisService()
+
+
+def test_basic_sentiment_matches_keyword_counts(news_service):
+    """Test keyword counts match per-word substring counting."""
+    articles = [
+        {'title': 'Strong profit growth lifts shares', 'description': 'Analysts upgrade to buy'},
+        {'title': 'Risk of decline', 'description': 'Lower guidance raises concern'}
+    ]
+
+    positive = negative = 0
+    for article in articles:
+        text = f"{article['title']} {article['description']}".lower()
+        positive += sum(text.count(word) for word in POSITIVE_WORDS)
+        negative += sum(text.count(word) for word in NEGATIVE_WORDS)
+
+    result = news_service._basic_sentiment_analysis('AAPL', articles)
+
+    assert result['score'] == positive / (positive + negative)
+    assert result['articles_analyzed'] == 2
+
+
+def test_basic_sentiment_neutral_without_keywords(news_service):
+    """Test articles without keywords are neutral."""
+    result = news_service._basic_sentiment_analysis('AAPL', [{'title': 'Quarterly report'}])
+
+    assert result['sentiment'] == 'neutral'
+    assert result['score'] == 0.5
+
+
+def test_screen_assets_keeps_input_order(news_service):
+    """Test concurrent fundamental screening returns symbols in input order."""
+    symbols = [f'SYM{i}' for i in range(40)]
+
+    results = news_service.screen_assets_by_fundamentals(symbols)
+
+    assert [r['symbol'] for r in results] == symbols
+
+
+def test_ai_sentiment_skips_model_for_scored_articles(news_service, monkeypatch):
+    """Test a cached result for the same article set avoids the model call."""
+    from app.services import news_analysis
+
+    class FailingClient:
+        @property
+        def messages(self):
+            raise AssertionError('model should not be called')
+
+    cached = {'sentiment': 'bullish', 'score': 0.8, 'factors': [], 'summary': 'cached'}
+    monkeypatch.setattr(news_analysis, 'cache_get', lambda key: cached)
+    news_service.anthropic_client = FailingClient()
+
+    articles = [{'title': 'Profit surge', 'description': '', 'source': 'X', 'url': 'https://a'}]
+    result = news_service._analyze_sentiment_with_ai('AAPL', articles)
+
+    assert result['summary'] == 'cached'
+    assert result['articles_analyzed'] == 1
+
+
+def test_news_ai_cache_key_ignores_article_order():
+    """Test the content hash depends on the article set, not its order."""
+    from app.utils.cache import get_news_ai_cache_key
+
+    a = {'url': 'https://a'}
+    b = {'url': 'https://b'}
+
+    assert get_news_ai_cache_key('AAPL', [a, b]) == get_news_ai_cache_key('AAPL', [b, a])
+    assert get_news_ai_cache_key('AAPL', [a]) != get_news_ai_cache_key('MSFT', [a])
+
+
+def test_parse_model_json_unwraps_fences():
+    """Test fenced and bare JSON model responses parse to the same object."""
+    from app.services.news_analysis import _parse_model_json
+
+    payload = '{"sentiment": "bullish", "score": 0.7}'
+
+    assert _parse_model_json(payload) == {'sentiment': 'bullish', 'score': 0.7}
+    assert _parse_model_json(f'Here you go:\n```json\n{payload}\n```') == _parse_model_json(payload)
+
+
+def test_precomputed_text_not_exposed(news_service):
+    """Test the precomputed lowercase text is used for scoring but not returned."""
+    articles = [{'title': 'Ignored', 'description': '', '_text_lc': 'profit surge'}]
+
+    result = news_service._basic_sentiment_analysis('AAPL', articles)
+
+    assert result['sentiment'] == 'bullish'
+    assert '_text_lc' not in result['articles'][0]
+
+
+def test_fetch_news_merges_sources(app, news_service, monkeypatch):
+    """Test both sources are queried and a failing one is skipped."""
+    news_service.news_api_key = 'news-key'
+    news_service.finnhub_key = 'finnhub-key'
+
+    def failing_newsapi(symbol, api_key, limit):
+        raise RuntimeError('rate limited')
+
+    monkeypatch.setattr(news_service, '_fetch_from_newsapi', failing_newsapi)
+    monkeypatch.setattr(
+        news_service, '_fetch_from_finnhub',
+        lambda symbol, api_key, limit: [{'title': f'{symbol} {i}'} for i in range(limit)]
+    )
+
+    articles = news_service._fetch_news('AAPL', 3)
+
+    assert [a['title'] for a in articles] == ['AAPL 0', 'AAPL 1', 'AAPL 2']
+
+
+def test_fundamental_criteria_mask(news_service):
+    """Test vectorized screening treats missing metrics as passing."""
+    fundamentals = [
+        {'pe_ratio': 12, 'pb_ratio': 0.9, 'dividend_yield': 3},
+        {'pe_ratio': 25, 'pb_ratio': 0.9, 'dividend_yield': 3},
+        {'pe_ratio': None, 'pb_ratio': 2.0, 'dividend_yield': None},
+        {'pe_ratio': None, 'pb_ratio': None, 'dividend_yield': 0},
+        {'dividend_yield': 9}
+    ]
+
+    mask = news_service._fundamental_criteria_mask(fundamentals)
+
+    assert mask.tolist() == [True, False, False, True, False]
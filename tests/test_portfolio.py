@@ -0,0 +1,164 @@
+"""
+Tests for portfolio models.
+"""
+import pytest
+from app import db
+from app.models.user import User
+from app.models.portfolio import Position, FavoriteAsset
+
+
+@pytest.fixture
+def user(app):
+    """Create a user owning the test positions."""
+    user = User(username='trader', email='trader@example.com', password_hash='x')
+    db.session.add(user)
+    db.session.commit()
+    return user
+
+
+def test_notes_encryption_roundtrip(app, user):
+    """Test notes are encrypted at rest and decrypted on access."""
+    from cryptography.fernet import Fernet
+
+    app.config['DB_ENCRYPTION_KEY'] = Fernet.generate_key().decode()
+    position = Position(user_id=user.id, symbol='AAPL', position_type='BUY',
+                        quantity=1, entry_price=100, notes='long-term hold')
+
+    assert position._encrypted_notes != 'long-term hold'
+    assert position.notes == 'long-term hold'
+
+
+def test_portfolio_summary_totals(client, user):
+    """Test summary totals aggregated in SQL."""
+    db.session.add_all([
+        Position(user_id=user.id, symbol='AAPL', position_type='BUY',
+                 quantity=10, entry_price=100, current_price=110),
+        Position(user_id=user.id, symbol='MSFT', position_type='SELL',
+                 quantity=5, entry_price=200, current_price=190, is_open=False)
+    ])
+    db.session.commit()
+
+    response = client.get(f'/api/portfolio/summary?user_id={user.id}')
+    summary = response.get_json()['summary']
+
+    assert summary['total_positions'] == 2
+    assert summary['open_positions'] == 1
+    assert summary['total_unrealized_pnl'] == 100.0
+    assert summary['total_realized_pnl'] == 50.0
+
+
+def test_summary_totals_skips_unpriced(app, user):
+    """Test SQL aggregation ignores positions without a current price."""
+    db.session.add_all([
+        Position(user_id=user.id, symbol='AAPL', position_type='BUY',
+                 quantity=10, entry_price=100, current_price=90),
+        Position(user_id=user.id, symbol='TSLA', position_type='BUY',
+                 quantity=1, entry_price=50)
+    ])
+    db.session.commit()
+
+    totals = Position.summary_totals(db.session, user.id)
+
+    assert totals['total_positions'] == 2
+    assert totals['closed_positions'] == 0
+    assert totals['total_unrealized_pnl'] == -100.0
+    assert totals['total_realized_pnl'] == 0.0
+
+
+def test_delete_position_invalidates_cache(client, user, monkeypatch):
+    """Test deleting a position drops the owner's cached portfolio responses."""
+    from app.routes import portfolio as portfolio_routes
+
+    position = Position(user_id=user.id, symbol='AAPL', position_type='BUY',
+                        quantity=1, entry_price=100)
+    db.session.add(position)
+    db.session.commit()
+
+    invalidated = []
+    monkeypatch.setattr(portfolio_routes, 'invalidate_portfolio_cache', invalidated.append)
+
+    response = client.delete(f'/api/portfolio/positions/{position.id}')
+
+    assert response.status_code == 200
+    assert invalidated == [user.id]
+
+
+def test_bulk_favorites_skips_duplicates(client, user):
+    """Test bulk favorites insert ignores symbols already in the watchlist."""
+    db.session.add(FavoriteAsset(user_id=user.id, symbol='AAPL'))
+    db.session.commit()
+
+    response = client.post('/api/portfolio/favorites/bulk', json={
+        'user_id': user.id,
+        'favorites': [{'symbol': 'aapl'}, {'symbol': 'msft'}, {'symbol': 'tsla'}]
+    })
+
+    assert response.status_code == 201
+    assert response.get_json()['added'] == 2
+    assert response.get_json()['skipped'] == 1
+    assert FavoriteAsset.query.filter_by(user_id=user.id).count() == 3
+    assert FavoriteAsset.query.filter_by(symbol='MSFT').one().view_count == 0
+
+
+def test_bulk_positions_created(client, user):
+    """Test bulk position creation commits every row."""
+    response = client.post('/api/portfolio/positions/bulk', json={
+        'user_id': user.id,
+        'positions': [
+            {'symbol': 'aapl', 'position_type': 'BUY', 'quantity': 1, 'entry_price': 100},
+            {'symbol': 'msft', 'position_type': 'SELL', 'quantity': 2, 'entry_price': 200}
+        ]
+    })
+
+    assert response.status_code == 201
+    assert Position.query.filter_by(user_id=user.id).count() == 2
+
+
+def test_bulk_positions_rejects_invalid_type(client, user):
+    """Test bulk position creation validates every row before inserting."""
+    response = client.post('/api/portfolio/positions/bulk', json={
+        'user_id': user.id,
+        'positions': [
+            {'symbol': 'aapl', 'position_type': 'BUY', 'quantity': 1, 'entry_price': 100},
+            {'symbol': 'msft', 'position_type': 'HOLD', 'quantity': 2, 'entry_price': 200}
+        ]
+    })
+
+    assert response.status_code == 400
+    assert Position.query.count() == 0
+
+
+def test_list_dicts_matches_to_dict(app, user):
+    """Test row-based serialization matches the ORM to_dict output."""
+    from cryptography.fernet import Fernet
+
+    app.config['DB_ENCRYPTION_KEY'] = Fernet.generate_key().decode()
+    positions = [
+        Position(user_id=user.id, symbol='AAPL', position_type='BUY',
+                 quantity=10, entry_price=100, current_price=110, notes='core'),
+        Position(user_id=user.id, symbol='MSFT', position_type='SELL',
+                 quantity=5, entry_price=200, is_open=False)
+    ]
+    db.session.add_all(positions)
+    db.session.commit()
+
+    expected = {pos.id: pos.to_dict() for pos in positions}
+    rows = Position.list_dicts(db.session, user.id)
+
+    assert {row['id']: row for row in rows} == expected
+    assert [row['symbol'] for row in Position.list_dicts(db.session, user.id, False)] == ['MSFT']
+
+
+def test_create_position_response(client, user):
+    """Test the created position is serialized with its defaults before commit."""
+    response = client.post('/api/portfolio/positions', json={
+        'user_id': user.id, 'symbol': 'aapl', 'position_type': 'BUY',
+        'quantity': 2, 'entry_price': 150
+    })
+
+    position = response.get_json()['position']
+    assert response.status_code == 201
+    assert position['id'] is not None
+    assert position['is_open'] is True
+    assert position['current_price'] == 150.0
+    assert position['opened_at'] is not None
@@ -0,0 +1,256 @@
+"""
+Tests for prediction service.
+"""
+from app.models.prediction import Prediction, PredictionFactor
+from app.services.prediction_service import PredictionService
+
+
+def _make_entry(symbol):
+    prediction = Prediction(
+        symbol=symbol,
+        prediction_type='BUY',
+        confidence_score=0.85,
+        analysis_type='technical',
+        price_at_prediction=100.0,
+        actual_outcome='pending'
+    )
+    factors = [{
+        'factor_type': 'indicator',
+        'factor_name': 'RSI',
+        'factor_value': '25.0',
+        'weight': 0.2,
+        'description': 'RSI at 25.00 indicates oversold conditions'
+    }]
+    return prediction, factors
+
+
+def test_bulk_persist(app):
+    """Test bulk persistence of predictions and factors."""
+    with app.app_context():
+        service = PredictionService()
+        entries = [_make_entry(symbol) for symbol in ['AAPL', 'MSFT', 'GOOGL']]
+
+        assert service.bulk_persist(entries) == 3
+        assert Prediction.query.count() == 3
+        assert PredictionFactor.query.count() == 3
+
+        prediction = Prediction.query.filter_by(symbol='MSFT').one()
+        assert [f.factor_name for f in prediction.factors] == ['RSI']
+
+
+def test_bulk_persist_empty(app):
+    """Test bulk persistence with no entries."""
+    with app.app_context():
+        service = PredictionService()
+        assert service.bulk_persist([]) == 0
+
+
+def test_prediction_history_loads_factors(app):
+    """Test history returns predictions with factors already loaded."""
+    with app.app_context():
+        service = PredictionService()
+        service.bulk_persist([_make_entry('AAPL'), _make_entry('MSFT')])
+
+        history = service.get_prediction_history(limit=10)
+
+        assert len(history) == 2
+        assert all('factors' in pred.__dict__ for pred in history)
+        assert all(len(pred.to_dict()['factors']) == 1 for pred in history)
+
+
+def test_verify_predictions_marks_expired(app):
+    """Test only expired pending predictions are marked verified."""
+    from datetime import datetime, timedelta
+
+    with app.app_context():
+        service = PredictionService()
+        expired, _ = _make_entry('AAPL')
+        expired.expires_at = datetime.utcnow() - timedelta(days=1)
+        active, _ = _make_entry('MSFT')
+        active.expires_at = datetime.utcnow() + timedelta(days=1)
+        service.bulk_persist([(expired, []), (active, [])])
+
+        assert service.verify_predictions() == 1
+        assert Prediction.query.filter_by(symbol='AAPL').one().outcome_verified_at is not None
+        assert Prediction.query.filter_by(symbol='MSFT').one().outcome_verified_at is None
+
+        # Already verified predictions are not picked up again
+        assert service.verify_predictions() == 0
+
+
+def test_accuracy_stats(app):
+    """Test accuracy counts resolved predictions only."""
+    with app.app_context():
+        service = PredictionService()
+        entries = [_make_entry('AAPL') for _ in range(4)]
+        for (prediction, _), outcome in zip(entries, ['correct', 'correct', 'incorrect', 'pending']):
+            prediction.actual_outcome = outcome
+        service.bulk_persist(entries)
+
+        stats = service.get_accuracy_stats(symbol='AAPL')
+
+        assert stats['total_predictions'] == 3
+        assert stats['correct_predictions'] == 2
+        assert service.get_accuracy_stats(symbol='MSFT')['accuracy_percentage'] == 0
+
+
+def test_prediction_history_before_cursor(app):
+    """Test keyset pagination returns only predictions older than the cursor."""
+    from datetime import datetime, timedelta
+
+    with app.app_context():
+        service = PredictionService()
+        now = datetime.utcnow()
+        entries = [_make_entry(symbol) for symbol in ['AAPL', 'MSFT', 'GOOGL']]
+        for age, (prediction, _) in enumerate(entries):
+            prediction.created_at = now - timedelta(minutes=age)
+        service.bulk_persist(entries)
+
+        first_page = service.get_prediction_history(limit=2)
+        next_page = service.get_prediction_history(limit=2, before=first_page[-1].created_at)
+
+        assert [p.symbol for p in first_page] == ['AAPL', 'MSFT']
+        assert [p.symbol for p in next_page] == ['GOOGL']
+        assert [p.symbol for p in service.iter_prediction_history(before=now)] == ['MSFT', 'GOOGL']
+
+
+def test_prediction_history_cursor_splits_ties(app):
+    """Test a page ending inside a created_at tie resumes with the rest of it."""
+    from datetime import datetime
+
+    with app.app_context():
+        service = PredictionService()
+        now = datetime.utcnow()
+        entries = [_make_entry(symbol) for symbol in ['AAPL', 'MSFT', 'GOOGL', 'TSLA']]
+        for prediction, _ in entries:
+            prediction.created_at = now
+        service.bulk_persist(entries)
+
+        first_page = service.get_prediction_history(limit=3)
+        cursor = {'before': first_page[-1].created_at, 'before_id': first_page[-1].id}
+        next_page = service.get_prediction_history(limit=3, **cursor)
+        streamed = list(service.iter_prediction_history(limit=3, **cursor))
+
+        seen = [p.symbol for p in first_page + next_page]
+        assert sorted(seen) == ['AAPL', 'GOOGL', 'MSFT', 'TSLA']
+        assert [p.id for p in streamed] == [p.id for p in next_page]
+
+
+def test_combine_analyses_weights_signals(app):
+    """Test signal confidences are accumulated per type into the decision."""
+    with app.app_context():
+        service = PredictionService()
+        tech = {'signals': [
+            {'type': 'BUY', 'confidence': 0.9},
+            {'type': 'BUY', 'confidence': 0.8},
+            {'type': 'SELL', 'confidence': 0.1}
+        ]}
+
+        result = service._combine_analyses('AAPL', 100.0, tech, {'score': 0.7}, 'hybrid')
+
+        assert result['type'] == 'BUY'
+        assert abs(result['confidence'] - 2.0 / 2.1) < 1e-9
+
+
+def test_prediction_detail_includes_factors(client):
+    """Test the detail endpoint returns the prediction with its factors."""
+    service = PredictionService()
+    service.bulk_persist([_make_entry('AAPL')])
+    prediction = Prediction.query.one()
+
+    response = client.get(f'/api/analysis/predictions/{prediction.id}')
+
+    assert response.status_code == 200
+    assert [f['factor_name'] for f in response.get_json()['prediction']['factors']] == ['RSI']
+
+
+def test_build_prediction_hybrid_runs_both_analyses(app, monkeypatch):
+    """Test hybrid predictions combine technical and news results."""
+    import numpy as np
+
+    with app.app_context():
+        service = PredictionService()
+        monkeypatch.setattr(service.technical_service, 'analyze_asset', lambda symbol, data: {
+            'signals': [{'type': 'BUY', 'confidence': 0.9}], 'indicators': {}, 'patterns': []
+        })
+        monkeypatch.setattr(service.news_service, 'analyze_news_for_asset',
+                            lambda symbol: {'score': 0.8, 'sentiment': 'positive'})
+
+        prediction, _ = service.build_prediction('AAPL', {'close': np.array([100.0])}, 'hybrid')
+
+        assert prediction.prediction_type == 'BUY'
+        assert prediction.confidence_score == 1.0
+
+
+def test_build_prediction_reuses_given_analysis(app, monkeypatch):
+    """Test a precomputed technical analysis (e.g. from a scan) is not recomputed."""
+    import numpy as np
+
+    def fail(symbol, data):
+        raise AssertionError('analyze_asset should not run')
+
+    with app.app_context():
+        service = PredictionService()
+        monkeypatch.setattr(service.technical_service, 'analyze_asset', fail)
+        analysis = {'signals': [{'type': 'SELL', 'confidence': 0.9}], 'indicators': {}, 'patterns': []}
+
+        prediction, _ = service.build_prediction(
+            'AAPL', {'close': np.array([100.0])}, 'technical', tech_analysis=analysis
+        )
+
+        assert prediction.prediction_type == 'SELL'
+
+
+def test_verify_predictions_in_batches(app, monkeypatch):
+    """Test verification walks the backlog in keyset batches."""
+    from datetime import datetime, timedelta
+    from app.services import prediction_service
+
+    monkeypatch.setattr(prediction_service, 'VERIFY_BATCH_SIZE', 2)
+
+    with app.app_context():
+        service = PredictionService()
+        entries = [_make_entry(symbol) for symbol in ['AAPL', 'MSFT', 'GOOGL', 'TSLA', 'AMZN']]
+        for prediction, _ in entries:
+            prediction.expires_at = datetime.utcnow() - timedelta(days=1)
+        service.bulk_persist(entries)
+
+        assert service.verify_predictions() == 5
+        assert Prediction.query.filter(Prediction.outcome_verified_at.is_(None)).count() == 0
+
+
+def test_generate_prediction_persists_with_factors(app, monkeypatch):
+    """Test the Core insert path stores the prediction and returns it serializable."""
+    import numpy as np
+
+    with app.app_context():
+        service = PredictionService()
+        monkeypatch.setattr(service.technical_service, 'analyze_asset', lambda symbol, data: {
+            'signals': [{'type': 'BUY', 'confidence': 0.9}],
+            'indicators': {'rsi': {'value': 25.0, 'signal': 'oversold'}},
+            'patterns': []
+        })
+
+        prediction = service.generate_prediction('AAPL', {'close': np.array([100.0])}, 'technical')
+        result = prediction.to_dict()
+
+        stored = Prediction.query.one()
+        assert stored.id == result['id']
+        assert result['prediction_type'] == 'BUY'
+        assert [f['factor_name'] for f in result['factors']] == [f.factor_name for f in stored.factors]
+        assert all(f['id'] is not None for f in result['factors'])
+
+
+def test_market_condition_from_code(app):
+    """Test the precomputed condition code matches the indicator-based fallback."""
+    with app.app_context():
+        service = PredictionService()
+        indicators = {'macd': {'trend': 'bearish'}, 'rsi': {'value': 35.0}}
+
+        assert service._determine_market_condition({'indicators': indicators}) == 'bearish'
+        assert service._determine_market_condition(
+            {'indicators': indicators, 'market_condition_code': -1}
+        ) == 'bearish'
+        assert service._determine_market_condition(
+            {'indicators': indicators, 'market_condition_code': 1}
+        ) == 'bullish'
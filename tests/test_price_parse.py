@@ -0,0 +1,78 @@
+"""
+Tests for price data parsing utilities.
+"""
+import pytest
+import numpy as np
+from app.utils.price_parse import prices_to_arrays, validate_price_rows
+
+
+def test_prices_to_arrays():
+    """Test conversion of OHLCV rows to columnar arrays."""
+    rows = [
+        {'timestamp': '2024-01-01', 'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5, 'volume': 100},
+        {'timestamp': '2024-01-02', 'open': 1.5, 'high': 2.5, 'low': 1, 'close': 2, 'volume': 200}
+    ]
+    arrays = prices_to_arrays(rows)
+
+    assert arrays['close'].dtype == np.float64
+    np.testing.assert_array_equal(arrays['close'], [1.5, 2.0])
+    np.testing.assert_array_equal(arrays['volume'], [100, 200])
+    assert list(arrays) == ['open', 'high', 'low', 'close', 'volume']
+
+
+def test_prices_to_arrays_missing_column():
+    """Test that missing columns are reported."""
+    with pytest.raises(ValueError, match=r"\['volume'\]"):
+        prices_to_arrays([{'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5}])
+
+
+def test_validate_price_rows():
+    """Test lightweight payload validation."""
+    row = {'open': 1, 'high': 2, 'low': 0.5, 'close': 1.5, 'volume': 100}
+
+    assert validate_price_rows([row]) == (True, [])
+    assert validate_price_rows([{'close': 1.5}]) == (False, ['high', 'low', 'open', 'volume'])
+    assert validate_price_rows({'close': 1.5})[0] is False
+    assert validate_price_rows([])[0] is False
+
+
+def test_columnar_payload_to_arrays():
+    """Test columnar payloads convert per column and match the row format."""
+    from app.utils.price_parse import price_payload_to_arrays, validate_price_payload
+
+    columns = {'timestamp': ['2024-01-01', '2024-01-02'], 'open': [1, 1.5], 'high': [2, 2.5],
+               'low': [0.5, 1], 'close': [1.5, 2], 'volume': [100, 200]}
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    arrays = price_payload_to_arrays(columns)
+
+    assert validate_price_payload(columns) == (True, [])
+    for col, values in price_payload_to_arrays(rows).items():
+        np.testing.assert_array_equal(arrays[col], values)
+
+
+def test_columnar_payload_rejects_ragged():
+    """Test columnar payloads report missing, ragged and non-numeric columns."""
+    from app.utils.price_parse import price_payload_to_arrays, validate_price_payload
+
+    columns = {'open': [1, 2], 'high': [2, 3], 'low': [0, 1], 'close': [1, 2], 'volume': [5]}
+
+    assert validate_price_payload({'open': []}) == (False, ['close', 'high', 'low', 'volume'])
+    with pytest.raises(ValueError, match='equal length'):
+        price_payload_to_arrays(columns)
+    with pytest.raises(ValueError, match='numeric'):
+        price_payload_to_arrays({**columns, 'volume': ['a', 'b']})
+
+
+def test_columnar_payload_rejects_missing_values():
+    """Test None and non-finite values are rejected in both payload formats."""
+    from app.utils.price_parse import price_payload_to_arrays
+
+    columns = {'open': [1, 2], 'high': [2, 3], 'low': [0, 1], 'close': [1, 2], 'volume': [5, 6]}
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    for bad in (None, float('nan'), float('inf')):
+        with pytest.raises(ValueError, match='numeric'):
+            price_payload_to_arrays({**columns, 'close': [1, bad]})
+        with pytest.raises(ValueError, match='numeric'):
+            price_payload_to_arrays([rows[0], {**rows[1], 'close': bad}])
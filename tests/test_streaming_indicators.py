@@ -0,0 +1,70 @@
+"""
+Tests for incremental RSI/MACD state.
+"""
+import numpy as np
+import pytest
+from app.services import streaming_indicators, ta_kernels
+
+
+@pytest.fixture
+def close():
+    """Random-walk close prices."""
+    np.random.seed(7)
+    return 100 + np.random.randn(200).cumsum()
+
+
+def _expected(close):
+    return (ta_kernels.rsi_last(close, 14), *ta_kernels.macd_last(close, 12, 26, 9))
+
+
+def test_incremental_matches_full(close):
+    """Test resuming from saved state equals a full recomputation."""
+    streaming_indicators.reset()
+
+    for n in (100, 101, 102, 150, 200):
+        series = np.ascontiguousarray(close[:n])
+        result = streaming_indicators.rsi_macd_last('AAPL', series, 14, 12, 26, 9)
+        np.testing.assert_allclose(result, _expected(series), rtol=0, atol=1e-12)
+
+
+def test_shifted_window_restarts(close):
+    """Test a window that does not extend the saved series is recomputed."""
+    streaming_indicators.reset()
+
+    streaming_indicators.rsi_macd_last('AAPL', np.ascontiguousarray(close[:100]), 14, 12, 26, 9)
+    shifted = np.ascontiguousarray(close[1:101])
+    result = streaming_indicators.rsi_macd_last('AAPL', shifted, 14, 12, 26, 9)
+
+    np.testing.assert_allclose(result, _expected(shifted), rtol=0, atol=1e-12)
+
+
+def test_revised_bars_recompute(close):
+    """Test a revised last or middle bar is not served from saved state."""
+    streaming_indicators.reset()
+    series = np.ascontiguousarray(close[:100])
+    streaming_indicators.rsi_macd_last('AAPL', series, 14, 12, 26, 9)
+
+    revised_last = series.copy()
+    revised_last[-1] += 5.0
+    result = streaming_indicators.rsi_macd_last('AAPL', revised_last, 14, 12, 26, 9)
+    np.testing.assert_allclose(result, _expected(revised_last), rtol=0, atol=1e-12)
+
+    extended = np.ascontiguousarray(close[:120])
+    extended[50] += 5.0
+    result = streaming_indicators.rsi_macd_last('AAPL', extended, 14, 12, 26, 9)
+    np.testing.assert_allclose(result, _expected(extended), rtol=0, atol=1e-12)
+
+
+def test_timeframes_keep_separate_state(close):
+    """Test series of different intervals for one symbol do not share state."""
+    streaming_indicators.reset()
+    daily = np.ascontiguousarray(close[:100])
+    minute = np.ascontiguousarray(close[100:])
+
+    streaming_indicators.rsi_macd_last('AAPL', daily, 14, 12, 26, 9, timeframe='1d')
+    streaming_indicators.rsi_macd_last('AAPL', minute, 14, 12, 26, 9, timeframe='1m')
+    extended = np.ascontiguousarray(close[:101])
+    result = streaming_indicators.rsi_macd_last('AAPL', extended, 14, 12, 26, 9, timeframe='1d')
+
+    np.testing.assert_allclose(result, _expected(extended), rtol=0, atol=1e-12)
+    assert streaming_indicators._states[('AAPL', '1d', 14, 12, 26, 9)][0] == 101
@@ -0,0 +1,75 @@
+"""
+Tests for Numba indicator kernels against the ta library reference.
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from ta import momentum, volatility, trend
+from app.services import ta_kernels
+
+
+@pytest.fixture
+def ohlc():
+    """Generate a random-walk OHLC series."""
+    np.random.seed(7)
+    close = 100 + np.random.randn(200).cumsum()
+    high = close + np.abs(np.random.randn(200))
+    low = close - np.abs(np.random.randn(200))
+    return high, low, close
+
+
+def _assert_matches(actual, expected):
+    np.testing.assert_allclose(actual, np.asarray(expected), rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.parametrize('length', [5, 14, 16, 30, 40, 200])
+def test_last_value_kernels_match_ta(ohlc, length):
+    """Test last-bar kernels agree with the last value of the ta indicators."""
+    high, low, close = (pd.Series(a[:length].copy()) for a in ohlc)
+    bands = volatility.BollingerBands(close=close, window=20, window_dev=2)
+    stoch = momentum.StochasticOscillator(high=high, low=low, close=close, window=14, smooth_window=3)
+    macd = trend.MACD(close=close, window_slow=26, window_fast=12, window_sign=9)
+    high, low, close = high.to_numpy(), low.to_numpy(), close.to_numpy()
+
+    _assert_matches(ta_kernels.bollinger_last(close, 20, 2.0), [
+        bands.bollinger_hband().iloc[-1], bands.bollinger_mavg().iloc[-1], bands.bollinger_lband().iloc[-1]
+    ])
+    _assert_matches(ta_kernels.rsi_last(close, 14),
+                    momentum.RSIIndicator(close=pd.Series(close), window=14).rsi().iloc[-1])
+    _assert_matches(ta_kernels.stochastic_last(high, low, close, 14, 3),
+                    [stoch.stoch().iloc[-1], stoch.stoch_signal().iloc[-1]])
+    _assert_matches(ta_kernels.macd_last(close, 12, 26, 9),
+                    [macd.macd().iloc[-1], macd.macd_signal().iloc[-1], macd.macd_diff().iloc[-1]])
+
+
+def test_condition_code_votes():
+    """Test MACD and RSI votes reduce to the sign of their tally."""
+    assert ta_kernels.condition_code(60.0, 1.0, 0.5) == 1
+    assert ta_kernels.condition_code(40.0, 0.1, 0.5) == -1
+    assert ta_kernels.condition_code(60.0, 0.1, 0.5) == 0
+    assert ta_kernels.condition_code(np.nan, np.nan, np.nan) == 0
+
+
+def test_batch_last_matches_per_series(ohlc):
+    """Test the parallel multi-series kernel matches the per-series kernels."""
+    high, low, close = ohlc
+    lengths = [200, 60, 35]
+    offsets = np.array([0] + list(np.cumsum(lengths)), dtype=np.int64)
+    series = [tuple(a[:n].copy() for a in ohlc) for n in lengths]
+
+    out = ta_kernels.batch_last(
+        np.concatenate([c for _, _, c in series]),
+        np.concatenate([h for h, _, _ in series]),
+        np.concatenate([l for _, l, _ in series]),
+        offsets, 20, 2.0, 14, 14, 3, 12, 26, 9
+    )
+
+    assert out.shape == (len(lengths), len(ta_kernels.BATCH_FIELDS))
+    for row, (h, l, c) in zip(out, series):
+        rsi_value = ta_kernels.rsi_last(c, 14)
+        line, signal, hist = ta_kernels.macd_last(c, 12, 26, 9)
+        _assert_matches(row, [
+            *ta_kernels.bollinger_last(c, 20, 2.0), rsi_value,
+            *ta_kernels.stochastic_last(h, l, c, 14, 3), line, signal, hist,
+            ta_kernels.condition_code(rsi_value, line, signal)
+        ])
@@ -4,26 +4,36 @@ Tests for technical analysis service.
 import pytest
 import pandas as pd
 import numpy as np
+from app import create_app
 from app.services.technical_analysis import TechnicalAnalysisService
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def sample_price_data():
-    """Generate sample OHLCV data for testing."""
+    """Generate sample OHLCV data for testing (shared; do not mutate)."""
     dates = pd.date_range('2024-01-01', periods=100, freq='D')
-    np.random.seed(42)
+    rng = np.random.default_rng(42)
+    walks = rng.standard_normal((4, 100)).cumsum(axis=1)
 
     data = {
-        'open': 100 + np.random.randn(100).cumsum(),
-        'high': 102 + np.random.randn(100).cumsum(),
-        'low': 98 + np.random.randn(100).cumsum(),
-        'close': 100 + np.random.randn(100).cumsum(),
-        'volume': np.random.randint(1000000, 5000000, 100)
+        'open': 100 + walks[0],
+        'high': 102 + walks[1],
+        'low': 98 + walks[2],
+        'close': 100 + walks[3],
+        'volume': rng.integers(1000000, 5000000, 100)
     }
 
     return pd.DataFrame(data, index=dates)
 
 
+@pytest.fixture(scope='module')
+def ta_service():
+    """Service shared by the pure interpretation tests; built from one app per module."""
+    app = create_app('testing')
+    with app.app_context():
+        return TechnicalAnalysisService()
+
+
 def test_technical_analysis_service_initialization(app):
     """Test service initialization."""
     with app.app_context():
@@ -67,37 +77,166 @@ def test_analyze_asset(app, sample_price_data):
         assert result['symbol'] == 'AAPL'
 
 
-def test_bollinger_interpretation(app):
+@pytest.mark.parametrize('price,upper,lower,expected', [
+    (85, 110, 90, 'oversold'),  # Price below lower band - oversold
+    (110, 110, 90, 'overbought'),  # Price at upper band - overbought
+    (100, 110, 90, 'neutral')  # Price in middle - neutral
+])
+def test_bollinger_interpretation(ta_service, price, upper, lower, expected):
     """Test Bollinger Bands interpretation."""
+    assert ta_service._interpret_bollinger(price, upper, lower) == expected
+
+
+@pytest.mark.parametrize('rsi,expected', [(25, 'oversold'), (75, 'overbought'), (50, 'neutral')])
+def test_rsi_interpretation(ta_service, rsi, expected):
+    """Test RSI interpretation."""
+    assert ta_service._interpret_rsi(rsi) == expected
+
+
+@pytest.mark.parametrize('k,d,expected', [
+    (15, 18, 'oversold'),
+    (85, 82, 'overbought'),
+    (60, 55, 'bullish_crossover'),
+    (40, 45, 'bearish_crossover')
+])
+def test_stochastic_interpretation(ta_service, k, d, expected):
+    """Test Stochastic Oscillator interpretation."""
+    assert ta_service._interpret_stochastic(k, d) == expected
+
+
+def test_interpreters_neutral_on_missing_values(app):
+    """Test NaN values are mapped to None once and interpreted as neutral."""
     with app.app_context():
         service = TechnicalAnalysisService()
+        nan = float('nan')
 
-        # Price at lower band - oversold
-        assert service._interpret_bollinger(95, 110, 90) == 'oversold'
+        indicators = service._format_indicators(100.0, nan, nan, nan, nan, nan, 50.0, nan, nan, nan)
 
-        # Price at upper band - overbought
-        assert service._interpret_bollinger(110, 110, 90) == 'overbought'
+        assert indicators['rsi'] == {'value': None, 'signal': 'neutral'}
+        assert indicators['stochastic'] == {'k': None, 'd': 50.0, 'signal': 'neutral'}
+        assert indicators['bollinger_bands']['signal'] == 'neutral'
+        assert indicators['macd']['trend'] == 'neutral'
 
-        # Price in middle - neutral
-        assert service._interpret_bollinger(100, 110, 90) == 'neutral'
 
+def test_simple_pattern_detection_hammer(app):
+    """Test a long lower shadow with a small top body is a hammer."""
+    with app.app_context():
+        service = TechnicalAnalysisService()
+        candle = {
+            'open': np.array([99.0]), 'high': np.array([100.0]),
+            'low': np.array([90.0]), 'close': np.array([99.5])
+        }
 
-def test_rsi_interpretation(app):
-    """Test RSI interpretation."""
+        names = [p['name'] for p in service._simple_pattern_detection(candle)]
+
+        assert names == ['Doji', 'Hammer']
+        assert service._simple_pattern_detection({**candle, 'low': np.array([100.0])}) == []
+        assert service._simple_pattern_detection({**candle, 'open': np.array([95.0])}) == []
+
+
+def test_scan_multiple_assets_matches_single(app, sample_price_data):
+    """Test concurrent scanning reports the same signals as per-asset analysis."""
     with app.app_context():
         service = TechnicalAnalysisService()
+        arrays = {col: sample_price_data[col].to_numpy(dtype=np.float64) for col in sample_price_data}
+        price_data_dict = {symbol: arrays for symbol in ['AAPL', 'MSFT', 'GOOGL']}
 
-        assert service._interpret_rsi(25) == 'oversold'
-        assert service._interpret_rsi(75) == 'overbought'
-        assert service._interpret_rsi(50) == 'neutral'
+        opportunities = service.scan_multiple_assets(['AAPL', 'MSFT', 'GOOGL', 'TSLA'], price_data_dict)
+        expected = service.analyze_asset('AAPL', arrays)['signals']
 
+        assert len(opportunities) == 3 * len(expected)
+        assert 'TSLA' not in {o['symbol'] for o in opportunities}
 
-def test_stochastic_interpretation(app):
-    """Test Stochastic Oscillator interpretation."""
+
+def test_scan_uses_batched_cache(app, sample_price_data, monkeypatch):
+    """Test scanning reads cache once and only analyzes the misses."""
+    from app.services import technical_analysis
+
+    cached = {'symbol': 'AAPL', 'indicators': {}, 'patterns': {},
+              'signals': [{'type': 'BUY', 'confidence': 0.99, 'strength': 'strong'}]}
+    stored = {}
+    monkeypatch.setattr(technical_analysis, 'cache_mget', lambda keys: [cached, None])
+    monkeypatch.setattr(technical_analysis, 'cache_set_many',
+                        lambda items, ttl=None: stored.update(items))
+
+    with app.app_context():
+        service = TechnicalAnalysisService()
+        arrays = {col: sample_price_data[col].to_numpy(dtype=np.float64) for col in sample_price_data}
+
+        opportunities = service.scan_multiple_assets(['AAPL', 'MSFT'], {'AAPL': arrays, 'MSFT': arrays})
+
+        assert opportunities[0]['symbol'] == 'AAPL'
+        assert opportunities[0]['confidence'] == 0.99
+        assert list(stored) == ['analysis:technical:MSFT']
+
+
+def test_analyze_batch_matches_single(app, sample_price_data):
+    """Test batched analysis matches per-asset analysis, including short series."""
     with app.app_context():
         service = TechnicalAnalysisService()
+        arrays = {col: sample_price_data[col].to_numpy(dtype=np.float64) for col in sample_price_data}
+        short = {col: values[:10] for col, values in arrays.items()}
+
+        analyses = service._analyze_batch({'AAPL': arrays, 'TSLA': short})
+
+        assert analyses['AAPL'] == service._analyze_uncached('AAPL', arrays)
+        assert analyses['TSLA']['indicators'] == service._analyze_uncached('TSLA', short)['indicators']
+
+
+def test_indicators_insufficient_data(app):
+    """Test series shorter than the warmup yield no indicators instead of raising."""
+    with app.app_context():
+        service = TechnicalAnalysisService()
+        arrays = {col: np.linspace(100, 101, 5) for col in ('open', 'high', 'low', 'close', 'volume')}
+
+        indicators = service._calculate_indicators(arrays)
+
+        assert indicators == {'bollinger_bands': None, 'rsi': None, 'stochastic': None, 'macd': None}
+
+        arrays = {col: np.linspace(100, 110, service.min_bars) for col in arrays}
+        indicators = service._calculate_indicators(arrays)
+
+        assert indicators['macd']['histogram'] is not None
+        assert indicators['stochastic']['d'] is not None
+
+
+def test_generate_signals_votes(app):
+    """Test indicator labels and confident patterns vote into buy/sell scores."""
+    with app.app_context():
+        service = TechnicalAnalysisService()
+        indicators = {
+            'rsi': {'signal': 'oversold'},
+            'bollinger_bands': {'signal': 'neutral'},
+            'stochastic': {'signal': 'bullish_crossover'},
+            'macd': {'trend': 'bullish'}
+        }
+        patterns = [{'type': 'bullish', 'confidence': 1.0}, {'type': 'bearish', 'confidence': 0.0}]
+
+        signals = service._generate_signals(indicators, patterns)
+
+        assert [s['type'] for s in signals] == ['BUY']
+        assert signals[0]['supporting_factors'] == 5
+        assert signals[0]['strength'] == 'strong'
+        assert service._generate_signals({'rsi': None, 'macd': {'trend': 'bearish'}}, []) == []
+
+
+def test_analyze_asset_in_process_cache(app, sample_price_data, monkeypatch):
+    """Test repeat analyses of the same bars are served without Redis."""
+    from app.services import technical_analysis
+
+    TechnicalAnalysisService._l1.clear()
+    lookups = []
+    monkeypatch.setattr(technical_analysis, 'cache_get', lambda key: lookups.append(key))
+    monkeypatch.setattr(technical_analysis, 'cache_set', lambda key, value, ttl=None: True)
+
+    with app.app_context():
+        service = TechnicalAnalysisService()
+        arrays = {col: sample_price_data[col].to_numpy(dtype=np.float64) for col in sample_price_data}
+
+        first = service.analyze_asset('AAPL', arrays)
+        second = TechnicalAnalysisService().analyze_asset('AAPL', arrays)
+        shifted = service.analyze_asset('AAPL', {col: values[:-1] for col, values in arrays.items()})
 
-        assert service._interpret_stochastic(15, 18) == 'oversold'
-        assert service._interpret_stochastic(85, 82) == 'overbought'
-        assert service._interpret_stochastic(60, 55) == 'bullish_crossover'
-        assert service._interpret_stochastic(40, 45) == 'bearish_crossover'
+        assert second is first
+        assert shifted is not first
+        assert lookups == ['analysis:technical:AAPL'] * 2